@@ -1,5 +1,6 @@
 from typing import Optional
 
+from pydantic import Field, ValidationInfo, field_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -18,6 +19,60 @@ class Settings(BaseSettings):
     jwt_algorithm: str
     access_token_expire_minutes: int
 
+    # Database engine (app/database.py). Pool settings apply to file-backed SQLite and Postgres.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds; replaces stale connections without a pre-ping
+    db_pool_pre_ping: bool = True  # one extra round trip per checkout; disable behind a stable network
+    db_echo: bool = False  # log every SQL statement
+    db_statement_cache_size: int = 100  # asyncpg prepared statements per connection; 0 behind PgBouncer
+    sqlite_mmap_size: int = 268435456  # bytes (256 MiB)
+    sqlite_cache_size: int = -65536  # negative = KiB (64 MiB)
+    # Optional read replica for endpoints using get_read_session; after a write, that
+    # client's reads stay on the primary for replica_pin_seconds (covers replica lag).
+    # The pin is held in process memory, so it only covers reads served by the worker
+    # that took the write; multi-worker deployments need sticky sessions for it.
+    database_replica_url: Optional[str] = None
+    replica_pin_seconds: float = 5.0
+
+    # Per-request query profiling (app/utils/query_profiler.py): Server-Timing header, metrics,
+    # slow-request log; repeated identical statements are flagged as N+1 in development.
+    # Unset means on in development only; production opts in with QUERY_PROFILE=true
+    query_profile: bool = Field(default=None, validate_default=True)
+    query_profile_slow_ms: float = 500.0
+    query_n_plus_one_threshold: int = 5
+
+    # Threads for bcrypt hashing/verification in request handlers (app/utils/auth.py)
+    bcrypt_pool_size: int = 4
+
+    # Startup runs app/migrations.py only when the stored schema version is stale; set false
+    # in production and run `python -m app.migrations` as a deploy step instead
+    auto_migrate: bool = True
+
+    # Timeline writer (app/services/timeline.py): batch flush cadence, buffer cap and optional
+    # write-ahead file (a base name: each worker journals to its own <path>.<pid>.<n> files)
+    timeline_flush_interval: float = 0.5
+    timeline_batch_size: int = 200
+    timeline_max_pending: int = 10000
+    timeline_wal_path: Optional[str] = None
+
+    # Lead intake queue (app/services/lead_intake.py): when enabled, POST /leads answers 202
+    # and a background writer batches submissions into the leads table. The queue path is a
+    # base name: each worker journals to its own <path>.<pid>.<n> files (see app/utils/journal.py)
+    lead_intake_async: bool = False
+    lead_intake_queue_path: str = "lead_intake.log"
+    lead_intake_flush_interval: float = 0.5
+    lead_intake_batch_size: int = 500
+    lead_intake_max_pending: int = 10000
+
+    @field_validator("query_profile", mode="before")
+    @classmethod
+    def _default_query_profile(cls, value, info: ValidationInfo):
+        if value is None or value == "":
+            return info.data.get("environment") == "development"
+        return value
+
     class Config:
         env_file = ".env"
         case_sensitive = False
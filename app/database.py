@@ -1,46 +1,196 @@
 """Database connection and session management."""
+import asyncio
+import time
+
+from fastapi import Depends, Request
 from sqlmodel import SQLModel
-from sqlalchemy import text
+from sqlalchemy import event, make_url, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, TimeoutError as PoolTimeout
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.utils.metrics import Gauge, Histogram
+from app.utils.query_profiler import profile_engine
+
+def normalize_database_url(raw_url: str) -> str:
+    """Map postgres:// / postgresql:// URLs to the asyncpg driver; others pass through."""
+    # Support both Postgres (asyncpg) and SQLite (aiosqlite) for local dev
+    if raw_url.startswith("postgresql://"):
+        return raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if raw_url.startswith("postgres://"):
+        return raw_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    # Assume URL is already a fully-qualified async SQLAlchemy URL (e.g. sqlite+aiosqlite:///./allabroad.db)
+    return raw_url
+
 
 raw_url = settings.database_url
+database_url = normalize_database_url(raw_url)
 
-# Support both Postgres (asyncpg) and SQLite (aiosqlite) for local dev
-if raw_url.startswith("postgresql://"):
-    database_url = raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-elif raw_url.startswith("postgresql+asyncpg://"):
-    database_url = raw_url
-elif raw_url.startswith("postgres://"):
-    database_url = raw_url.replace("postgres://", "postgresql+asyncpg://", 1)
-else:
-    # Assume URL is already a fully-qualified async SQLAlchemy URL (e.g. sqlite+aiosqlite:///./allabroad.db)
-    database_url = raw_url
-
-# Create async database engine
-connect_args = {}
-if database_url.startswith("sqlite"):
-    connect_args = {"check_same_thread": False, "timeout": 10}
-
-engine = create_async_engine(
-    database_url,
-    echo=settings.environment == "development",
-    pool_pre_ping=True,
-    connect_args=connect_args,
+pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    labelnames=("engine",),
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe(
+                time.perf_counter() - start, engine=self._orig_logging_name or "primary"
+            )
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the writer; NORMAL is safe with WAL."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    cursor.close()
+
+
+def create_engine_for(database_url: str, name: str = "primary"):
+    """Async engine with the configured pool, driver options and SQLite pragmas."""
+    connect_args = {}
+    engine_options = {}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        connect_args = {"check_same_thread": False, "timeout": 10}
+    elif url.get_backend_name() == "postgresql":
+        connect_args = {"statement_cache_size": settings.db_statement_cache_size}
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_statement_cache_size)}
+        )
+
+    is_memory_sqlite = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+    if not is_memory_sqlite:
+        # In-memory SQLite uses a single shared connection (StaticPool); no pool to size
+        engine_options = {
+            "poolclass": TimedQueuePool,
+            "pool_logging_name": name,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+        }
+
+    new_engine = create_async_engine(
+        url,
+        echo=settings.db_echo,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args,
+        **engine_options,
+    )
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _sqlite_pragmas)
+    return new_engine
+
+
+# Create async database engines: the primary takes every write; an optional
+# replica (DATABASE_REPLICA_URL) serves endpoints that use get_read_session.
+engine = create_engine_for(database_url)
+read_engine = (
+    create_engine_for(normalize_database_url(settings.database_replica_url), name="replica")
+    if settings.database_replica_url
+    else engine
 )
+if settings.query_profile:
+    profile_engine(engine)
+    if read_engine is not engine:
+        profile_engine(read_engine)
 
-# Create async session factory
+
+def _pool_stats(name: str) -> dict[tuple[str, ...], float]:
+    stats = {}
+    for label, pool_engine in (("primary", engine), ("replica", read_engine)):
+        pool = pool_engine.sync_engine.pool
+        if label == "replica" and pool_engine is engine:
+            continue
+        if not isinstance(pool, AsyncAdaptedQueuePool):
+            continue
+        value = getattr(pool, name)()
+        # QueuePool.overflow() counts up from -pool_size
+        stats[(label,)] = max(0, value) if name == "overflow" else value
+    return stats
+
+
+Gauge("db_pool_size", "Configured pool size", lambda: _pool_stats("size"), labelnames=("engine",))
+Gauge("db_pool_checked_out", "Connections currently checked out", lambda: _pool_stats("checkedout"), labelnames=("engine",))
+Gauge("db_pool_overflow", "Connections open beyond pool_size", lambda: _pool_stats("overflow"), labelnames=("engine",))
+
+# Create async session factories
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+# Read-your-writes: after a client writes through get_session, its reads stay on
+# the primary for replica_pin_seconds so replica lag cannot hide the write.
+# The pin table is per process: with several workers, a read served by another
+# worker than the write is not pinned, so run one worker per replica-backed
+# instance (or sticky sessions) when read-your-writes matters.
+_pinned_until: dict[str, float] = {}
+_PIN_TABLE_LIMIT = 10000
+
+
+def _client_key(request: Request) -> str:
+    auth = request.headers.get("authorization")
+    if auth:
+        return auth
+    return request.client.host if request.client else ""
+
+
+def _pin_to_primary(key: str) -> None:
+    now = time.monotonic()
+    if len(_pinned_until) >= _PIN_TABLE_LIMIT:
+        for stale in [k for k, until in _pinned_until.items() if until <= now]:
+            del _pinned_until[stale]
+    _pinned_until[key] = now + settings.replica_pin_seconds
+
+
+def _is_pinned(key: str) -> bool:
+    until = _pinned_until.get(key)
+    return until is not None and until > time.monotonic()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    """create_all skips indexes on tables that already exist; add any that are missing."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
 
 
 async def init_db():
-    """Initialize database tables."""
+    """Initialize database tables and any indexes added since the tables were created."""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
 
 
 async def ensure_testimonials_image_column():
@@ -56,8 +206,42 @@ async def ensure_testimonials_image_column():
         pass
 
 
-async def get_session():
-    """Dependency for getting async database session."""
+def dialect_insert(session: AsyncSession, table):
+    """Return an INSERT for the session's dialect that supports on_conflict_do_* (Postgres or SQLite)."""
+    if session.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """True for failures worth retrying later as-is (database down, locked, pool exhausted)."""
+    if isinstance(exc, (OperationalError, InterfaceError, PoolTimeout, OSError, asyncio.TimeoutError)):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+async def get_session(request: Request):
+    """Dependency for getting async database session (always the primary)."""
     async with async_session_maker() as session:
         yield session
+        if read_engine is not engine and session.info.get("wrote"):
+            _pin_to_primary(_client_key(request))
+
 
+async def get_read_session(request: Request, primary: AsyncSession = Depends(get_session)):
+    """
+    Dependency for read-only endpoints: a replica session when DATABASE_REPLICA_URL
+    is set, unless this client wrote recently (then the primary).
+
+    Without a replica (or when pinned) this is the request's get_session session, so
+    an endpoint whose auth dependency already holds a primary connection does not
+    check out a second one; two per request deadlocks the pool under concurrency.
+    Sessions connect lazily, so the unused primary session costs nothing.
+    """
+    if read_engine is engine or _is_pinned(_client_key(request)):
+        yield primary
+        return
+    async with read_session_maker() as session:
+        yield session
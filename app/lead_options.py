@@ -32,3 +32,8 @@ CURRENCIES = (
     "GBP",
     "AED",
 )
+
+# O(1) membership checks for validation (the tuples above keep display order)
+DEGREE_SET = frozenset(DEGREES)
+SUBJECT_SET = frozenset(SUBJECTS)
+CURRENCY_SET = frozenset(CURRENCIES)
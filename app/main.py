@@ -5,9 +5,9 @@ from datetime import datetime
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.config import settings
-from app.database import init_db, ensure_testimonials_image_column
 from app.routes import api_router
 from app.models import (
     Lead,
@@ -18,6 +18,7 @@ from app.models import (
     Visa,
     Payment,
     Message,
+    Conversation,
     TimelineEvent,
     Destination,
     Testimonial,
@@ -26,8 +27,12 @@ from app.models import (
     HeroStat,
     SiteContent,
 )  # noqa: F401 - imported for metadata registration
-from app.seed_admin import seed_admin
-from app.seed_content import seed_content
+from app.migrations import SCHEMA_VERSION, schema_is_current
+from app.services.lead_intake import lead_intake_queue
+from app.services.timeline import timeline_writer
+from app.utils.http_metrics import HTTPMetricsMiddleware
+from app.utils.metrics import render as render_metrics
+from app.utils.query_profiler import QueryProfilerMiddleware
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +40,8 @@ logger = logging.getLogger(__name__)
 import os
 LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cursor", "debug.log")
 def _debug_log(location, message, data, hypothesis_id):
+    if settings.environment != "development":
+        return
     try:
         os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
         with open(LOG_PATH, "a", encoding="utf-8") as f:
@@ -151,6 +158,11 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 app.add_middleware(RequestLoggingMiddleware)
 # #endregion
 
+# Outermost, so Server-Timing and latency cover the whole request
+if settings.query_profile:
+    app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(HTTPMetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 # #region agent log
@@ -160,30 +172,39 @@ _debug_log("app/main.py:32", "API router registered", {"prefix": "/api", "app_ti
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Check the schema version (migrating only when it is stale) and start background writers."""
     # #region agent log
     _debug_log("app/main.py:35", "App startup event triggered", {"app_title": app.title, "env": settings.environment}, "D")
     # #endregion
     try:
-        await init_db()
+        if await schema_is_current():
+            logger.info("Database schema at version %d; skipping migrations", SCHEMA_VERSION)
+        elif settings.auto_migrate:
+            from app.migrations import migrate  # only a stale schema pays for the seeders
+
+            await migrate()
+        else:
+            logger.error("Database schema is not current; run `python -m app.migrations`")
         # #region agent log
         _debug_log("app/main.py:40", "Database initialization succeeded", {}, "D")
         # #endregion
-        await ensure_testimonials_image_column()
-        try:
-            await seed_admin()
-        except Exception as seed_err:
-            logger.warning("Admin seeding failed: %s", seed_err)
-        try:
-            await seed_content()
-        except Exception as seed_err:
-            logger.warning("Content seeding failed: %s", seed_err)
     except Exception as exc:
         # Log the error but allow the app to start so non-DB routes still work
         logger.error("Database initialization failed: %s", exc)
         # #region agent log
         _debug_log("app/main.py:44", "Database initialization failed", {"error": str(exc)}, "D")
         # #endregion
+    await timeline_writer.start()
+    if settings.lead_intake_async:
+        await lead_intake_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered timeline events and queued lead submissions before the worker exits."""
+    await timeline_writer.stop()
+    if settings.lead_intake_async:
+        await lead_intake_queue.stop()
 
 
 @app.get("/")
@@ -198,6 +219,12 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (process-local metrics, see app/utils/metrics.py)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 # Catch-all OPTIONS handler for CORS preflight (must be after all other routes)
 @app.options("/{full_path:path}")
 async def options_handler(full_path: str, request: Request):
@@ -0,0 +1,130 @@
+"""Schema setup, one-off backfills and seeding, stamped with a schema version.
+
+Worker startup only reads the single schema_version row (schema_is_current()).
+When it matches SCHEMA_VERSION and the fingerprint of the current models, DDL,
+backfills and seeding are all skipped. Otherwise startup runs migrate() when
+AUTO_MIGRATE is true (the default, convenient in development); with
+AUTO_MIGRATE=false run it explicitly on deploy instead:
+
+    python -m app.migrations
+
+Bump SCHEMA_VERSION for changes the fingerprint cannot see (new backfills or
+seed data); table, column and index changes are picked up automatically.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Table, delete, insert, select
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (registers every table before fingerprinting)
+from app.database import async_session_maker, engine, ensure_testimonials_image_column, init_db
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+schema_version = Table(
+    "schema_version",
+    SQLModel.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def schema_fingerprint() -> str:
+    """Hash of every table's columns and indexes, so model changes invalidate the stamp."""
+    parts = []
+    for table in sorted(SQLModel.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"table {table.name}")
+        for column in table.columns:
+            parts.append(
+                f"  column {column.name} {type(column.type).__name__} "
+                f"nullable={column.nullable} pk={column.primary_key}"
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = ",".join(column.name for column in index.columns)
+            parts.append(f"  index {index.name} ({columns}) unique={index.unique}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+async def schema_is_current() -> bool:
+    """Startup fast path: one single-row read, no DDL."""
+    try:
+        async with engine.connect() as conn:
+            row = (await conn.execute(
+                select(schema_version.c.version, schema_version.c.fingerprint).where(schema_version.c.id == 1)
+            )).first()
+    except Exception:
+        # Fresh database, or one created before schema versioning
+        return False
+    return row is not None and tuple(row) == (SCHEMA_VERSION, schema_fingerprint())
+
+
+async def _stamp() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(delete(schema_version))
+        await conn.execute(insert(schema_version).values(
+            id=1, version=SCHEMA_VERSION, fingerprint=schema_fingerprint(), applied_at=datetime.utcnow()
+        ))
+
+
+async def migrate() -> bool:
+    """
+    Bring the database up to date: tables and indexes, search index, backfills, seed data.
+
+    Every step is idempotent. The schema version is only stamped when all of them
+    succeed, so a failed step is retried on the next run.
+
+    Returns:
+        True if the schema version was stamped
+    """
+    # Imported here so schema_is_current() (every worker start) does not load
+    # the seeders and backfill services
+    from app.seed_admin import seed_admin
+    from app.seed_content import seed_content
+    from app.services.lead_scoring import score_unscored_leads
+    from app.services.lead_search import ensure_lead_search_index
+    from app.services.messages import backfill_conversations_if_empty
+
+    await init_db()
+    if engine.dialect.name == "sqlite":
+        await ensure_testimonials_image_column()
+
+    ok = True
+    steps = (
+        ("Lead search index setup", ensure_lead_search_index),
+        ("Conversation summary backfill", _with_session(backfill_conversations_if_empty)),
+        ("Lead score backfill", _with_session(score_unscored_leads)),
+        ("Admin seeding", seed_admin),
+        ("Content seeding", seed_content),
+    )
+    for label, step in steps:
+        try:
+            await step()
+        except Exception as exc:
+            logger.warning("%s failed: %s", label, exc)
+            ok = False
+
+    if ok:
+        await _stamp()
+        logger.info("Database schema at version %d", SCHEMA_VERSION)
+    return ok
+
+
+def _with_session(fn):
+    async def run() -> None:
+        async with async_session_maker() as session:
+            await fn(session)
+    return run
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(0 if asyncio.run(migrate()) else 1)
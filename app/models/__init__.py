@@ -7,6 +7,7 @@ from app.models.student import (
     Visa,
     Payment,
     Message,
+    Conversation,
     TimelineEvent
 )
 from app.models.content import (
@@ -27,6 +28,7 @@ __all__ = [
     "Visa",
     "Payment",
     "Message",
+    "Conversation",
     "TimelineEvent",
     "Destination",
     "Testimonial",
@@ -0,0 +1,45 @@
+"""Dialect-specific DDL options that are resolved when the DDL runs, not at import."""
+from typing import Any
+
+from sqlalchemy import Index, event, text
+
+
+def partial_index(name: str, *columns: str, where: dict[str, str]) -> Index:
+    """
+    Index with a per-dialect WHERE clause, e.g. where={"postgresql": ..., "sqlite": ...}.
+
+    Passing postgresql_where= / sqlite_where= to Index() makes SQLAlchemy import
+    both dialect packages while the models load, on every worker start. Here the
+    clause is attached just before CREATE INDEX, for the dialect running it; a
+    dialect without an entry gets a plain index.
+    """
+    return _deferred_index(name, columns, {"where": {dialect: text(clause) for dialect, clause in where.items()}})
+
+
+def ordered_index(name: str, *columns: str, ops: dict[str, dict[str, str]]) -> Index:
+    """
+    Index with per-dialect column options, e.g. ops={"postgresql": {"score": "DESC NULLS LAST"}},
+    deferred like partial_index(). SQLite rejects NULLS FIRST/LAST in an index (and
+    reads a plain one backwards for DESC), so it usually needs no entry.
+    """
+    return _deferred_index(name, columns, {"ops": ops})
+
+
+def apply_dialect_options(index: Index, dialect: str) -> None:
+    """
+    Attach the deferred options of `index` for `dialect`. Runs automatically before
+    index.create(); call it before compiling CreateIndex(index) by hand.
+    """
+    for option, per_dialect in index.info.get("dialect_options", {}).items():
+        if dialect in per_dialect:
+            index.dialect_kwargs[f"{dialect}_{option}"] = per_dialect[dialect]
+
+
+def _deferred_index(name: str, columns: tuple[str, ...], options: dict[str, dict[str, Any]]) -> Index:
+    index = Index(name, *columns, info={"dialect_options": options})
+
+    @event.listens_for(index, "before_create")
+    def _apply(target, connection, **kw):
+        apply_dialect_options(target, connection.dialect.name)
+
+    return index
@@ -2,13 +2,38 @@
 from datetime import datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field, Column, DateTime
-from sqlalchemy import func
+from sqlalchemy import func, Index
+
+from app.models.ddl import ordered_index, partial_index
 
 
 class Lead(SQLModel, table=True):
     """Lead model for storing study-abroad inquiries."""
     
     __tablename__ = "leads"
+    __table_args__ = (
+        # Managed index set for the dashboard's filter combinations, each ending in
+        # created_at so filtered pages come back already sorted. Apply to existing
+        # databases with: python add_lead_indexes.py
+        Index("ix_leads_created_at", "created_at"),
+        Index("ix_leads_status_created_at", "status", "created_at"),
+        Index("ix_leads_user_id_status_created_at", "user_id", "status", "created_at"),
+        Index("ix_leads_degree_created_at", "degree", "created_at"),
+        Index("ix_leads_subject_created_at", "subject", "created_at"),
+        # Unassigned leads (the user_id IS NULL branch of the non-admin filter)
+        partial_index(
+            "ix_leads_unassigned_created_at",
+            "created_at",
+            where={"postgresql": "user_id IS NULL", "sqlite": "user_id IS NULL"},
+        ),
+        # sort=score: highest first, unscored leads last
+        ordered_index(
+            "ix_leads_score_id",
+            "score",
+            "id",
+            ops={"postgresql": {"score": "DESC NULLS LAST", "id": "DESC"}},
+        ),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=255, index=False)
@@ -26,7 +51,7 @@ class Lead(SQLModel, table=True):
     source: str = Field(max_length=100, index=False)  # e.g., "website", "facebook", "referral"
     
     # Row-level security: each lead belongs to a user
-    user_id: Optional[int] = Field(default=None, foreign_key="users.id", index=True)
+    user_id: Optional[int] = Field(default=None, foreign_key="users.id", index=False)  # covered by ix_leads_user_id_status_created_at
     
     # Optimistic locking: prevent race conditions on concurrent updates
     version: int = Field(default=0, index=False)
@@ -42,6 +67,6 @@ class Lead(SQLModel, table=True):
     )
     
     # Future extensibility for lead scoring
-    score: Optional[float] = Field(default=None, index=True)
-    status: str = Field(default="new", max_length=50, index=True)  # new, contacted, qualified, etc.
+    score: Optional[float] = Field(default=None, index=False)  # indexed via ix_leads_score_id
+    status: str = Field(default="new", max_length=50, index=False)  # new, contacted, qualified, etc. Indexed via ix_leads_status_created_at
 
@@ -4,6 +4,8 @@ from typing import Optional
 from sqlmodel import SQLModel, Field, Column, DateTime, Relationship
 from sqlalchemy import func, Text, LargeBinary
 
+from app.models.ddl import partial_index
+
 
 class Student(SQLModel, table=True):
     """Student model - links to Lead for student portal access."""
@@ -181,6 +183,18 @@ class Message(SQLModel, table=True):
     """Message model for student-counselor and student-AI communication."""
     
     __tablename__ = "messages"
+    __table_args__ = (
+        # Partial index backing the admin unread badge: only unread student messages are indexed.
+        # Queries must use literal predicates (see UNREAD_FROM_STUDENT in app/services/messages.py).
+        partial_index(
+            "ix_messages_unread_from_student",
+            "student_id",
+            where={
+                "postgresql": "sender_type = 'student' AND is_read = false",
+                "sqlite": "sender_type = 'student' AND is_read = 0",
+            },
+        ),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     student_id: int = Field(foreign_key="students.id", index=True)
@@ -197,6 +211,19 @@ class Message(SQLModel, table=True):
     )
 
 
+class Conversation(SQLModel, table=True):
+    """Per-student message summary for the admin inbox, maintained on message insert and read."""
+    
+    __tablename__ = "conversations"
+    
+    student_id: int = Field(foreign_key="students.id", primary_key=True)
+    last_message_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+    total_messages: int = Field(default=0)
+    unread_from_student: int = Field(default=0)
+
+
 class TimelineEvent(SQLModel, table=True):
     """Timeline event model for chronological activity tracking."""
     
@@ -1,18 +1,27 @@
 """Admin-only routes for user approval and management."""
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import Response
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from sqlmodel import select
-from app.database import get_session
+from app.database import get_read_session, get_session
 from app.models.user import Admin, User, PendingApprovalUser
 from app.models.student import Student, Message, Document
 from app.schemas.student import DocumentResponse, StudentResponse
 from app.schemas.pending_user import PendingUserResponse, UserResponse, UserStatusUpdate
 from app.schemas.student import MessageCreate, MessageResponse
+from app.services.messages import (
+    count_unread_from_students,
+    list_conversations,
+    mark_message_read as mark_single_message_read,
+    mark_messages_read,
+    record_message,
+)
 from app.services.approvals import (
+    USER_SORTS,
     list_pending_users,
     count_pending_users,
     approve_pending_user,
@@ -23,32 +32,48 @@ from app.services.approvals import (
 )
 from app.utils.auth import require_role
 from app.utils.count_cache import get_cached, invalidate
+from app.utils.http_metrics import document_bytes_served
+from app.utils.pagination import (
+    PageParams,
+    apply_keyset,
+    finish_page,
+    like_pattern,
+    page_params,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/pending-users", response_model=list[PendingUserResponse])
 async def get_pending_users(
+    response: Response,
+    sort: str = Query("created_at", pattern=f"^({'|'.join(USER_SORTS)})$"),
+    paging: PageParams = Depends(page_params),
     session: AsyncSession = Depends(get_session),
     current_user: Admin = Depends(require_role("admin"))
 ):
     """
-    List all pending approval users (admin only).
+    List pending approval users, one page at a time (admin only).
     
     Args:
+        response: Used to send the X-Next-Cursor header
+        sort: created_at, email or full_name
+        paging: limit, cursor, order and q (search on email/name)
         session: Database session
         current_user: Authenticated admin user
     
     Returns:
         List of PendingUserResponse objects
     """
-    pending_users = await list_pending_users(session)
+    pending_users, next_cursor = await list_pending_users(session, paging, sort)
+    set_next_cursor(response, next_cursor)
     return pending_users
 
 
 @router.get("/pending-users/count")
 async def get_pending_users_count(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user: Admin = Depends(require_role("admin"))
 ):
     """
@@ -117,20 +142,27 @@ async def reject_user(
 
 @router.get("/users", response_model=list[UserResponse])
 async def get_users(
+    response: Response,
+    sort: str = Query("created_at", pattern=f"^({'|'.join(USER_SORTS)})$"),
+    paging: PageParams = Depends(page_params),
     session: AsyncSession = Depends(get_session),
     current_user: Admin = Depends(require_role("admin"))
 ):
     """
-    List all approved users (admin only).
+    List approved users, one page at a time (admin only).
     
     Args:
+        response: Used to send the X-Next-Cursor header
+        sort: created_at, email or full_name
+        paging: limit, cursor, order and q (search on email/name)
         session: Database session
         current_user: Authenticated admin user
     
     Returns:
         List of UserResponse objects
     """
-    users = await list_users(session)
+    users, next_cursor = await list_users(session, paging, sort)
+    set_next_cursor(response, next_cursor)
     return users
 
 
@@ -163,54 +195,52 @@ async def delete_approved_user(
 # Messaging routes
 @router.get("/messages/conversations")
 async def get_conversations(
+    response: Response,
+    paging: PageParams = Depends(page_params),
     session: AsyncSession = Depends(get_session),
     current_user: Admin = Depends(require_role("admin"))
 ):
-    """Get all student conversations with unread message counts (admin only)."""
-    # Get all students who have messages
-    from sqlalchemy import case
-    
-    statement = select(
-        Student.id,
-        Student.email,
-        Student.full_name,
-        func.count(Message.id).label("total_messages"),
-        func.sum(case((Message.is_read == False, 1), else_=0)).label("unread_count"),
-        func.max(Message.created_at).label("last_message_at")
-    ).join(
-        Message, Student.id == Message.student_id
-    ).group_by(
-        Student.id, Student.email, Student.full_name
-    ).order_by(
-        func.max(Message.created_at).desc()
-    )
-    
-    result = await session.execute(statement)
-    conversations = []
-    for row in result.all():
-        conversations.append({
-            "student_id": row.id,
-            "student_email": row.email,
-            "student_name": row.full_name or row.email,
-            "total_messages": row.total_messages or 0,
-            "unread_count": int(row.unread_count or 0)
-        })
-    
-    return {"conversations": conversations}
+    """
+    Get one page of student conversations with unread message counts (admin only).
+
+    Reads the maintained `conversations` summary table keyset-paged on
+    (last_message_at, student_id), so each poll is an indexed top-N read rather
+    than a GROUP BY over messages. q searches student email and name.
+
+    The response keeps the `{"conversations": [...]}` envelope; `next_cursor`
+    (also sent as X-Next-Cursor) is null on the last page.
+    """
+    rows, next_cursor = await list_conversations(session, paging)
+    set_next_cursor(response, next_cursor)
+    return {
+        "conversations": [
+            {
+                "student_id": row.student_id,
+                "student_email": row.email,
+                "student_name": row.full_name or row.email,
+                "total_messages": row.total_messages or 0,
+                "unread_count": int(row.unread_from_student or 0),
+                "last_message_at": row.last_message_at,
+            }
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/messages/unread-count")
 async def get_unread_messages_count(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user: Admin = Depends(require_role("admin"))
 ):
-    """Get total count of unread messages from students (admin only)."""
-    statement = select(func.count(Message.id)).where(
-        Message.sender_type == "student",
-        Message.is_read == False
-    )
-    result = await session.execute(statement)
-    count = result.scalar() or 0
+    """
+    Get total count of unread messages from students (admin only).
+
+    COUNT over the partial index of unread student messages, behind a short TTL cache
+    so concurrent admin tabs polling every 15s share one query. Cache is invalidated
+    when a student sends a message and when messages are marked read.
+    """
+    count = await get_cached("unread_messages", count_unread_from_students(session), ttl=5)
     return {"count": count}
 
 
@@ -263,6 +293,7 @@ async def reply_to_student(
         attachments=None  # Admin replies don't support attachments for now
     )
     session.add(message)
+    await record_message(session, message)
     await session.commit()
     await session.refresh(message)
     
@@ -282,9 +313,8 @@ async def mark_message_read(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
-    message.is_read = True
-    await session.commit()
-    await session.refresh(message)
+    await mark_single_message_read(session, message)
+    invalidate("unread_messages")
     
     return MessageResponse.model_validate(message)
 
@@ -303,31 +333,29 @@ async def mark_all_student_messages_read(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    # Update all unread messages from this student
-    statement = select(Message).where(
-        Message.student_id == student_id,
-        Message.sender_type == "student",
-        Message.is_read == False
-    )
-    result = await session.execute(statement)
-    messages = result.scalars().all()
+    # Single set-based UPDATE instead of loading every unread row
+    marked = await mark_messages_read(session, student_id, from_student=True)
+    invalidate("unread_messages")
     
-    for msg in messages:
-        msg.is_read = True
-    
-    await session.commit()
-    
-    return {"marked_read": len(messages)}
+    return {"marked_read": marked}
 
 
 # Document access routes
 @router.get("/students/{student_id}/documents", response_model=List[DocumentResponse])
 async def get_student_documents(
     student_id: int,
+    response: Response,
+    sort: str = Query("uploaded_at", pattern="^(uploaded_at|document_type|status)$"),
+    paging: PageParams = Depends(page_params),
     session: AsyncSession = Depends(get_session),
     current_user: Admin = Depends(require_role("admin"))
 ):
-    """Get all documents for a specific student (admin only)."""
+    """
+    Get one page of a student's documents (admin only).
+
+    file_content is deferred, so listing never loads the stored PDFs.
+    q searches document_type and file_name.
+    """
     # Verify student exists
     student_stmt = select(Student).where(Student.id == student_id)
     student_result = await session.execute(student_stmt)
@@ -335,15 +363,24 @@ async def get_student_documents(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    # Get all documents for this student
-    statement = select(Document).where(
+    statement = select(Document).options(defer(Document.file_content)).where(
         Document.student_id == student_id
-    ).order_by(Document.uploaded_at.desc())
+    )
+    if paging.q:
+        pattern = like_pattern(paging.q)
+        statement = statement.where(or_(
+            Document.document_type.ilike(pattern, escape="\\"),
+            Document.file_name.ilike(pattern, escape="\\"),
+        ))
+    statement = apply_keyset(statement, getattr(Document, sort), Document.id, paging)
     
     result = await session.execute(statement)
-    documents = [DocumentResponse.model_validate(d) for d in result.scalars()]
+    documents, next_cursor = finish_page(
+        result.scalars().all(), paging, lambda d: getattr(d, sort), lambda d: d.id
+    )
+    set_next_cursor(response, next_cursor)
     
-    return documents
+    return [DocumentResponse.model_validate(d) for d in documents]
 
 
 @router.get("/students/{student_id}/documents/{document_id}/download")
@@ -378,6 +415,7 @@ async def download_student_document(
         raise HTTPException(status_code=404, detail="File content not found")
     
     file_content = document.file_content
+    document_bytes_served.inc(len(file_content), audience="admin")
     
     return Response(
         content=file_content,
@@ -390,11 +428,32 @@ async def download_student_document(
 
 @router.get("/students", response_model=List[StudentResponse])
 async def get_all_students(
+    response: Response,
+    sort: str = Query("created_at", pattern="^(created_at|email|full_name)$"),
+    paging: PageParams = Depends(page_params),
     session: AsyncSession = Depends(get_session),
     current_user: Admin = Depends(require_role("admin"))
 ):
-    """Get all students (admin only)."""
-    statement = select(Student).order_by(Student.created_at.desc())
+    """
+    Get one page of students (admin only).
+
+    Selects only the StudentResponse columns (no password hash, no ORM identity
+    tracking). q searches email and full name.
+    """
+    # full_name is nullable; sort on '' for NULLs so the keyset comparison stays total
+    sort_expr = func.coalesce(Student.full_name, "") if sort == "full_name" else getattr(Student, sort)
+    columns = [getattr(Student, name) for name in StudentResponse.model_fields]
+    statement = select(*columns, sort_expr.label("sort_value"))
+    if paging.q:
+        pattern = like_pattern(paging.q)
+        statement = statement.where(or_(
+            Student.email.ilike(pattern, escape="\\"),
+            Student.full_name.ilike(pattern, escape="\\"),
+        ))
+    statement = apply_keyset(statement, sort_expr, Student.id, paging)
     result = await session.execute(statement)
-    students = [StudentResponse.model_validate(s) for s in result.scalars()]
-    return students
+    rows, next_cursor = finish_page(
+        result.all(), paging, lambda r: r.sort_value, lambda r: r.id
+    )
+    set_next_cursor(response, next_cursor)
+    return [StudentResponse.model_validate(dict(r._mapping)) for r in rows]
@@ -23,8 +23,8 @@ from app.utils.count_cache import invalidate
 from app.utils.auth import (
     create_access_token,
     get_current_user,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -47,7 +47,7 @@ async def login(request: LoginRequest, session: AsyncSession = Depends(get_sessi
     admin_stmt = select(Admin).where(Admin.email == email)
     admin_res = await session.execute(admin_stmt)
     admin = admin_res.scalar_one_or_none()
-    if admin and verify_password(request.password, admin.password_hash):
+    if admin and await verify_password_async(request.password, admin.password_hash):
         token = create_access_token(
             data={"sub": str(admin.id), "email": admin.email, "role": "admin"},
             expires_delta=timedelta(minutes=60),
@@ -60,7 +60,7 @@ async def login(request: LoginRequest, session: AsyncSession = Depends(get_sessi
     user = user_res.scalar_one_or_none()
 
     if user:
-        if not verify_password(request.password, user.password_hash):
+        if not await verify_password_async(request.password, user.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
         if not user.is_active:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Your account has been deactivated.")
@@ -84,7 +84,7 @@ async def login(request: LoginRequest, session: AsyncSession = Depends(get_sessi
     if not student:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
 
-    if not verify_password(request.password, student.password_hash):
+    if not await verify_password_async(request.password, student.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
     if not student.is_active:
@@ -116,9 +116,9 @@ async def change_password(
     current_user=Depends(get_current_user),
 ):
     """Change the authenticated user's password."""
-    if not verify_password(payload.current_password, current_user.password_hash):
+    if not await verify_password_async(payload.current_password, current_user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Current password is incorrect")
-    current_user.password_hash = hash_password(payload.new_password)
+    current_user.password_hash = await hash_password_async(payload.new_password)
     session.add(current_user)
     await session.commit()
     return {"message": "Password updated"}
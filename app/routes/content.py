@@ -7,7 +7,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_session
+from app.config import settings
+from app.database import get_read_session
 from app.models.content import (
     Destination,
     Testimonial,
@@ -22,6 +23,8 @@ router = APIRouter(tags=["content"])
 # #region agent log
 LOG_PATH = r"c:\Users\anony\Desktop\Others\Studies\Confidential\Software Engineer\AllAbroad\.cursor\debug.log"
 def _log(loc, msg, data, hid):
+    if settings.environment != "development":
+        return
     try:
         os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
         with open(LOG_PATH, "a", encoding="utf-8") as f:
@@ -38,7 +41,7 @@ def _split(s: str) -> List[str]:
 
 
 @router.get("/content")
-async def get_content(session: AsyncSession = Depends(get_session)) -> dict:
+async def get_content(session: AsyncSession = Depends(get_read_session)) -> dict:
     """
     Return all public site content: destinations, testimonials, why-us cards,
     CTA trust items, hero stats, and copy key-values.
@@ -1,16 +1,29 @@
 """Lead submission and management endpoints."""
 import json
+import tempfile
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Request, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy import func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from app.database import get_session
-from app.lead_options import SUBJECTS
+from app.config import settings
+from app.database import async_session_maker, get_read_session, get_session
 from app.models.lead import Lead
 from app.models.user import User
-from app.schemas.lead import LeadCreate, LeadResponse
-from app.utils.validation import validate_lead_data
+from app.schemas.lead import LeadCreate, LeadResponse, LeadStatusBatch
+from app.services.lead_intake import IdempotencyKeyReused, IntakeQueueFull, lead_intake_queue
+from app.services.lead_import import IMPORT_FORMATS, detect_format, import_leads, parse_rows
+from app.services.lead_export import EXPORT_MEDIA_TYPES, export_leads, parquet_available
+from app.services.leads import (
+    apply_lead_search,
+    count_leads,
+    filtered_leads_query,
+    insert_lead,
+    lead_order,
+    lead_values,
+    update_lead_statuses,
+)
 from app.utils.auth import get_current_user, require_role
 from app.utils.count_cache import get_cached, invalidate
 
@@ -20,6 +33,8 @@ router = APIRouter(tags=["leads"])
 import os
 LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cursor", "debug.log")
 def _debug_log(location, message, data, hypothesis_id):
+    if settings.environment != "development":
+        return
     try:
         os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
         with open(LOG_PATH, "a", encoding="utf-8") as f:
@@ -34,69 +49,68 @@ def _debug_log(location, message, data, hypothesis_id):
     response_model=LeadResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Submit a new lead",
-    description="Capture and store a new study-abroad lead with validation and duplicate prevention. PUBLIC endpoint - no authentication required."
+    description="Capture and store a new study-abroad lead with validation and duplicate prevention. PUBLIC endpoint - no authentication required.",
+    responses={
+        202: {"description": "Queued for writing (LEAD_INTAKE_ASYNC mode)"},
+        422: {"description": "Idempotency-Key reused for a different submission (LEAD_INTAKE_ASYNC mode)"},
+    },
 )
 async def create_lead(
     lead_data: LeadCreate,
     request: Request,
+    idempotency_key: str | None = Header(None, max_length=200),
     session: AsyncSession = Depends(get_session)
 ) -> LeadResponse:
     """
     Create a new lead.
     
-    Validates input, validates email format, checks for duplicates,
-    and stores the lead in the database.
+    Validates input and email format, then stores the lead with a single
+    INSERT ... ON CONFLICT (email) DO NOTHING RETURNING; an existing email is a 409.
+
+    With LEAD_INTAKE_ASYNC enabled, the lead is queued durably and acknowledged
+    with 202 instead (see app.services.lead_intake); the Idempotency-Key header
+    (default: the normalized email) makes retries safe. Reusing a key for a
+    different submission is a 422 (a 409 when the key defaults to the email).
     """
     # #region agent log
     _debug_log("app/routes/leads.py:20", "POST /api/leads endpoint called", {"path": str(request.url), "method": request.method, "client": str(request.client)}, "C")
     _debug_log("app/routes/leads.py:20", "Lead data received", {"name": lead_data.name, "email": lead_data.email, "country": lead_data.country}, "C")
     # #endregion
     try:
-        # Validate and normalize email (format only; no Resend/automated verification)
-        normalized_name, normalized_email = validate_lead_data(
-            lead_data.name,
-            lead_data.email
-        )
-        
-        # Check for duplicate email
-        statement = select(Lead).where(Lead.email == normalized_email)
-        result = await session.execute(statement)
-        existing_lead = result.scalar_one_or_none()
-        
-        if existing_lead:
+        # lead_data is already validated and normalized by LeadCreate (single pass)
+        if settings.lead_intake_async:
+            key = idempotency_key or lead_data.email
+            try:
+                queued = await lead_intake_queue.enqueue(lead_values(lead_data), key)
+            except IdempotencyKeyReused:
+                if idempotency_key is None:
+                    # The default key is the email: same email, different details
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A lead with this email address already exists",
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="This Idempotency-Key was already used for a different submission",
+                )
+            except IntakeQueueFull:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="We are receiving a lot of submissions right now. Please try again shortly.",
+                    headers={"Retry-After": "5"},
+                )
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"status": "queued" if queued else "already_received", "idempotency_key": key},
+            )
+
+        # Insert, or detect the duplicate email, in one statement
+        new_lead = await insert_lead(session, lead_values(lead_data))
+        if new_lead is None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="A lead with this email address already exists"
             )
-        
-        # Resolve subject: use subject_other when subject is "Other"
-        resolved_subject = (
-            (lead_data.subject_other or "").strip()
-            if (lead_data.subject and lead_data.subject.strip() == "Other")
-            else (lead_data.subject or "").strip()
-        )
-
-        # Create new lead
-        new_lead = Lead(
-            name=normalized_name,
-            email=normalized_email,
-            country=lead_data.country.strip(),
-            target_country=lead_data.target_country.strip(),
-            intake=lead_data.intake.strip(),
-            degree=lead_data.degree.strip(),
-            subject=resolved_subject,
-            budget=None,
-            budget_amount=None,
-            budget_min=lead_data.budget_min,
-            budget_max=lead_data.budget_max,
-            budget_currency=lead_data.budget_currency.strip().upper(),
-            source=lead_data.source.strip().lower(),
-            status="new"
-        )
-        
-        session.add(new_lead)
-        await session.commit()
-        await session.refresh(new_lead)
         invalidate("new_leads")
         # #region agent log
         _debug_log("app/routes/leads.py:64", "Lead created successfully", {"lead_id": new_lead.id if hasattr(new_lead, 'id') else None}, "C")
@@ -127,6 +141,77 @@ async def create_lead(
         )
 
 
+# Uploads larger than this are spooled to a temporary file instead of memory
+BULK_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+@router.post(
+    "/v1/leads/bulk",
+    summary="Bulk import leads",
+    description=(
+        "Import a CSV, JSON array or NDJSON batch of leads (request body; format from Content-Type or ?format=). "
+        "Returns per-row results; with stream=true, streams NDJSON progress per chunk. PROTECTED - requires staff authentication."
+    ),
+)
+async def bulk_create_leads(
+    request: Request,
+    format: str | None = Query(None, pattern="^(csv|json|ndjson)$", description="Override the Content-Type"),
+    stream: bool = Query(False, description="Stream NDJSON progress lines instead of one JSON response"),
+    session: AsyncSession = Depends(get_session),
+    current_user = Depends(require_role("admin", "user")),
+):
+    """
+    Bulk-create leads for partner and campaign imports.
+
+    Rows are validated, deduplicated (within the file and against existing
+    emails) and inserted in chunks; see app.services.lead_import.
+    """
+    fmt = format or detect_format(request.headers.get("content-type"))
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv, application/json or application/x-ndjson (or pass ?format=)",
+        )
+
+    upload = tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_MAX_BYTES)
+    async for data in request.stream():
+        upload.write(data)
+    upload.seek(0)
+
+    if stream:
+        async def progress():
+            # Own session: the request-scoped one is closed before the body streams
+            try:
+                async with async_session_maker() as stream_session:
+                    created = 0
+                    try:
+                        async for step in import_leads(stream_session, parse_rows(upload, fmt)):
+                            created = step["created"]
+                            yield json.dumps(step) + "\n"
+                    except ValueError as e:
+                        yield json.dumps({"error": str(e)}) + "\n"
+                    if created:
+                        invalidate("new_leads")
+            finally:
+                upload.close()
+
+        return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+    results: list[dict] = []
+    summary: dict = {"processed": 0, "created": 0, "duplicates": 0, "invalid": 0}
+    try:
+        async for step in import_leads(session, parse_rows(upload, fmt)):
+            results.extend(step.pop("results"))
+            summary = step
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    finally:
+        upload.close()
+    if summary["created"]:
+        invalidate("new_leads")
+    return {**summary, "results": results}
+
+
 @router.get(
     "/v1/leads",
     summary="Get paginated leads",
@@ -139,13 +224,17 @@ async def get_leads(
     degree: str | None = Query(None, description="Filter by degree"),
     subject: str | None = Query(None, description="Filter by subject"),
     subject_other: str | None = Query(None, description="When subject=Other, filter by custom subject (partial, case-insensitive)"),
-    session: AsyncSession = Depends(get_session),
+    q: str | None = Query(None, max_length=200, description="Search name, email, country, target country and subject (full-text, fuzzy fallback)"),
+    sort: str = Query("created_at", pattern="^(created_at|score)$", description="Newest first, or highest lead score first"),
+    session: AsyncSession = Depends(get_read_session),
     current_user = Depends(require_role("admin", "user")),
 ):
     """
     Get leads with pagination (protected - requires authentication).
 
     Admins see all leads; users see only their leads.
+    q runs an indexed full-text search; if it matches nothing, a trigram search is
+    tried instead (substring match on SQLite, typo-tolerant on Postgres). sort=score orders by the precomputed Lead.score.
     """
     # Set defaults if not provided
     page = page or 1
@@ -162,42 +251,29 @@ async def get_leads(
     try:
         # Admins see all leads; approved users see unassigned leads (user_id IS NULL) or leads assigned to them
         is_admin = type(current_user).__name__ == "Admin"
-        base_query = select(Lead)
-        
-        if not is_admin:
-            base_query = base_query.where(
-                or_(Lead.user_id.is_(None), Lead.user_id == current_user.id)
-            )
-        
-        if status_filter:
-            base_query = base_query.where(Lead.status == status_filter)
-        if degree:
-            base_query = base_query.where(Lead.degree == degree)
-        if subject:
-            if subject.strip() == "Other":
-                # "Other" leads are stored with the custom subject_other value (e.g. Psychology), not "Other".
-                # Match leads whose subject is not one of the predefined non-Other options.
-                predefined_non_other = [s for s in SUBJECTS if s != "Other"]
-                # #region agent log
-                _debug_log("app/routes/leads.py:subject=Other", "Subject filter Other: matching custom subjects", {"predefined_count": len(predefined_non_other)}, "F")
-                # #endregion
-                base_query = base_query.where(
-                    or_(Lead.subject.is_(None), Lead.subject.notin_(predefined_non_other))
-                )
-                # When subject_other is provided, narrow by partial match on Lead.subject (e.g. "psychology").
-                if subject_other and str(subject_other).strip():
-                    base_query = base_query.where(Lead.subject.ilike(f"%{subject_other.strip()}%"))
-            else:
-                base_query = base_query.where(Lead.subject == subject)
-
-        # Total count
-        count_result = await session.execute(base_query)
-        all_leads = count_result.scalars().all()
-        total = len(all_leads)
-
-        # Pagination
+        base_query = filtered_leads_query(
+            visible_to_user_id=None if is_admin else current_user.id,
+            status_filter=status_filter,
+            degree=degree,
+            subject=subject,
+            subject_other=subject_other,
+        )
+
+        # Total count (COUNT in the database, not len() of every row)
+        if q:
+            base_query, total = await apply_lead_search(session, base_query, q)
+        else:
+            total = await count_leads(session, base_query)
+
+        # Pagination: newest first, served by the (filter..., created_at) indexes,
+        # or by score (written at insert time, so the ix_leads_score_id order is ready)
         offset = (page - 1) * page_size
-        paginated_items = all_leads[offset : offset + page_size]
+        page_query = (
+            base_query.order_by(*lead_order(sort))
+            .offset(offset)
+            .limit(page_size)
+        )
+        paginated_items = (await session.execute(page_query)).scalars().all()
 
         # #region agent log
         _debug_log(
@@ -231,13 +307,57 @@ async def get_leads(
         )
 
 
+@router.get(
+    "/v1/leads/export",
+    summary="Export leads",
+    description="Stream every lead matching the same filters as GET /v1/leads as CSV, NDJSON or Parquet. PROTECTED - requires staff authentication."
+)
+async def export_leads_file(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$", description="csv, ndjson or parquet (needs pyarrow)"),
+    status_filter: str | None = Query(None, description="Optional status filter"),
+    degree: str | None = Query(None, description="Filter by degree"),
+    subject: str | None = Query(None, description="Filter by subject"),
+    subject_other: str | None = Query(None, description="When subject=Other, filter by custom subject (partial, case-insensitive)"),
+    q: str | None = Query(None, max_length=200, description="Search, as on GET /v1/leads"),
+    sort: str = Query("created_at", pattern="^(created_at|score)$", description="Newest first, or highest lead score first"),
+    current_user = Depends(require_role("admin", "user")),
+):
+    """
+    Export leads without paging (protected).
+
+    Rows are read through a server-side cursor and written out in batches, so
+    memory use does not grow with the number of leads exported.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires the pyarrow package on the server",
+        )
+
+    is_admin = type(current_user).__name__ == "Admin"
+    query = filtered_leads_query(
+        visible_to_user_id=None if is_admin else current_user.id,
+        status_filter=status_filter,
+        degree=degree,
+        subject=subject,
+        subject_other=subject_other,
+    ).order_by(*lead_order(sort))
+
+    filename = f"leads-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        export_leads(query, format, q),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get(
     "/v1/leads/new-count",
     summary="Count of new leads",
     description="Return the number of leads with status=new for UI badges. PROTECTED - requires authentication.",
 )
 async def get_new_leads_count(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user=Depends(require_role("admin", "user")),
 ):
     """Lightweight endpoint for the Leads Table nav badge. Uses COUNT and a short TTL cache for admins to cut DB load from polling. Cache invalidated on create_lead and status change."""
@@ -271,7 +391,7 @@ async def get_new_leads_count(
     description="Comprehensive statistics with conversion rates, trends, source performance. PROTECTED - requires authentication."
 )
 async def get_lead_stats(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user = Depends(require_role("admin", "user")),
 ):
     """
@@ -447,6 +567,46 @@ async def get_lead_stats(
         )
 
 
+@router.patch(
+    "/v1/leads/status",
+    summary="Batch update lead statuses",
+    description="Update the status of many leads in one transaction, with optimistic locking per row. PROTECTED - requires staff authentication."
+)
+async def update_lead_statuses_batch(
+    batch: LeadStatusBatch,
+    session: AsyncSession = Depends(get_session),
+    current_user = Depends(require_role("admin", "user")),
+):
+    """
+    Apply a list of (id, version, status) updates.
+
+    Rows whose version is stale come back as conflicts (with the current
+    version and status) instead of failing the whole batch.
+    """
+    try:
+        is_admin = type(current_user).__name__ == "Admin"
+        results = await update_lead_statuses(
+            session,
+            batch.updates,
+            visible_to_user_id=None if is_admin else current_user.id,
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update lead statuses",
+        )
+
+    updated = sum(1 for result in results if result["result"] == "updated")
+    if updated:
+        invalidate("new_leads")
+    return {
+        "updated": updated,
+        "conflicts": sum(1 for result in results if result["result"] == "conflict"),
+        "not_found": sum(1 for result in results if result["result"] == "not_found"),
+        "results": results,
+    }
+
+
 @router.get(
     "/v1/leads/{lead_id}",
     response_model=LeadResponse,
@@ -22,7 +22,15 @@ from app.schemas.student import (
     TimelineEventResponse,
     DashboardStats, UniversityComparison
 )
+from app.services.messages import (
+    mark_message_read as mark_single_message_read,
+    mark_messages_read,
+    record_message,
+)
+from app.services.timeline import timeline_writer
 from app.utils.auth import get_current_user
+from app.utils.count_cache import invalidate
+from app.utils.http_metrics import document_bytes_served
 from app.models.user import User
 
 router = APIRouter(prefix="/student", tags=["student"])
@@ -215,25 +223,18 @@ async def upload_document(
         status="pending"
     )
     session.add(document)
+    await session.commit()
+    await session.refresh(document)
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    # Timeline event is written in the background batch, with the document ID already known
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="document_upload",
         category="documents",
         title=f"{'Replaced' if existing_doc else 'Uploaded'} {document_type}",
         description=f"File: {file.filename}",
-        related_document_id=None  # Will be set after commit
+        related_document_id=document.id
     )
-    session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(document)
-    
-    # Update timeline event with document ID
-    timeline_event.related_document_id = document.id
-    await session.commit()
-    await session.refresh(document)
     
     return DocumentResponse.model_validate(document)
 
@@ -294,8 +295,10 @@ async def update_document(
     document.mime_type = file.content_type or "application/pdf"
     document.status = "pending"  # Reset to pending for review
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    await session.commit()
+    await session.refresh(document)
+    
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="document_upload",
         category="documents",
@@ -303,10 +306,6 @@ async def update_document(
         description=f"Replaced with: {file.filename}",
         related_document_id=document.id
     )
-    session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(document)
     
     return DocumentResponse.model_validate(document)
 
@@ -334,6 +333,7 @@ async def download_document(
         raise HTTPException(status_code=404, detail="File content not found")
     
     file_content = document.file_content
+    document_bytes_served.inc(len(file_content), audience="student")
     
     return Response(
         content=file_content,
@@ -361,20 +361,16 @@ async def delete_document(
         raise HTTPException(status_code=404, detail="Document not found")
     
     # File content is stored in DB, no file system operations needed
+    await session.delete(document)
+    await session.commit()
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="document_deleted",
         category="documents",
         title=f"Deleted {document.document_type}",
-        description=f"File: {document.file_name}",
-        related_document_id=None
+        description=f"File: {document.file_name}"
     )
-    session.add(timeline_event)
-    
-    await session.delete(document)
-    await session.commit()
     
     return None
 
@@ -446,24 +442,17 @@ async def create_application(
         **application_data.model_dump()
     )
     session.add(application)
+    await session.commit()
+    await session.refresh(application)
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="application_created",
         category="applications",
         title=f"Created application: {application.university_name}",
         description=f"Program: {application.program_name}",
-        related_application_id=None
+        related_application_id=application.id
     )
-    session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(application)
-    
-    timeline_event.related_application_id = application.id
-    await session.commit()
-    await session.refresh(application)
     
     return ApplicationResponse.model_validate(application)
 
@@ -508,8 +497,10 @@ async def submit_application(
     application.status = "submitted"
     application.submitted_at = datetime.utcnow()
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    await session.commit()
+    await session.refresh(application)
+    
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="application_submit",
         category="applications",
@@ -517,10 +508,6 @@ async def submit_application(
         description=f"Program: {application.program_name}",
         related_application_id=application.id
     )
-    session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(application)
     
     return ApplicationResponse.model_validate(application)
 
@@ -547,9 +534,12 @@ async def update_application(
     for field, value in update_data.items():
         setattr(application, field, value)
     
+    await session.commit()
+    await session.refresh(application)
+    
     # Create timeline event if status changed
     if 'status' in update_data:
-        timeline_event = TimelineEvent(
+        await timeline_writer.enqueue(
             student_id=student.id,
             event_type="application_updated",
             category="applications",
@@ -557,10 +547,6 @@ async def update_application(
             description=f"Status changed to: {update_data['status']}",
             related_application_id=application.id
         )
-        session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(application)
     
     return ApplicationResponse.model_validate(application)
 
@@ -581,19 +567,16 @@ async def delete_application(
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    await session.delete(application)
+    await session.commit()
+    
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="application_deleted",
         category="applications",
         title=f"Deleted application: {application.university_name}",
-        description=f"Program: {application.program_name}",
-        related_application_id=None
+        description=f"Program: {application.program_name}"
     )
-    session.add(timeline_event)
-    
-    await session.delete(application)
-    await session.commit()
     
     return None
 
@@ -625,24 +608,17 @@ async def create_visa(
         **visa_data.model_dump()
     )
     session.add(visa)
+    await session.commit()
+    await session.refresh(visa)
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="visa_created",
         category="visa",
         title=f"Started visa application: {visa.country}",
         description=f"Visa type: {visa.visa_type}",
-        related_visa_id=None
+        related_visa_id=visa.id
     )
-    session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(visa)
-    
-    timeline_event.related_visa_id = visa.id
-    await session.commit()
-    await session.refresh(visa)
     
     return VisaResponse.model_validate(visa)
 
@@ -667,9 +643,12 @@ async def update_visa(
     for key, value in visa_update.model_dump(exclude_unset=True).items():
         setattr(visa, key, value)
     
+    await session.commit()
+    await session.refresh(visa)
+    
     # Create timeline event if status changed
     if visa_update.status:
-        timeline_event = TimelineEvent(
+        await timeline_writer.enqueue(
             student_id=student.id,
             event_type="visa_update",
             category="visa",
@@ -677,10 +656,6 @@ async def update_visa(
             description=f"Stage: {visa_update.current_stage or visa.current_stage}",
             related_visa_id=visa.id
         )
-        session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(visa)
     
     return VisaResponse.model_validate(visa)
 
@@ -749,24 +724,19 @@ async def create_message(
         attachments=json.dumps(message_data.attachments) if message_data.attachments else None
     )
     session.add(message)
+    await record_message(session, message)
+    await session.commit()
+    await session.refresh(message)
+    invalidate("unread_messages")
     
-    # Create timeline event
-    timeline_event = TimelineEvent(
+    await timeline_writer.enqueue(
         student_id=student.id,
         event_type="message",
         category="communication",
         title="Sent message",
         description=message_data.content[:100],
-        related_message_id=None
+        related_message_id=message.id
     )
-    session.add(timeline_event)
-    
-    await session.commit()
-    await session.refresh(message)
-    
-    timeline_event.related_message_id = message.id
-    await session.commit()
-    await session.refresh(message)
     
     return MessageResponse.model_validate(message)
 
@@ -787,13 +757,24 @@ async def mark_message_read(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
-    message.is_read = True
-    await session.commit()
-    await session.refresh(message)
+    await mark_single_message_read(session, message)
+    if message.sender_type == "student":
+        invalidate("unread_messages")
     
     return MessageResponse.model_validate(message)
 
 
+@router.patch("/messages/read-up-to/{message_id}", status_code=status.HTTP_200_OK)
+async def mark_messages_read_up_to(
+    message_id: int,
+    session: AsyncSession = Depends(get_session),
+    student: Student = Depends(get_current_student)
+):
+    """Mark every unread counselor/AI message with id <= message_id as read."""
+    marked = await mark_messages_read(session, student.id, from_student=False, up_to_id=message_id)
+    return {"marked_read": marked}
+
+
 # Timeline
 @router.get("/timeline", response_model=List[TimelineEventResponse])
 async def get_timeline(
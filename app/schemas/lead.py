@@ -1,10 +1,17 @@
-"""Pydantic schemas for lead validation."""
+"""Pydantic schemas for lead validation.
+
+LeadCreate is the single validation and normalization pass for a lead: its
+validators use the shared helpers from app.utils (precompiled email regex,
+whitespace collapsing) and frozenset lookups, so callers can use the
+validated fields directly.
+"""
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator, model_validator
-import re
 
-from app.lead_options import CURRENCIES, DEGREES
+from app.lead_options import CURRENCIES, CURRENCY_SET, DEGREE_SET, SUBJECTS, SUBJECT_SET
+from app.utils.email import validate_email_format
+from app.utils.validation import normalize_name
 
 
 class LeadCreate(BaseModel):
@@ -42,44 +49,45 @@ class LeadCreate(BaseModel):
     @classmethod
     def validate_degree(cls, v: str) -> str:
         d = v.strip()
-        if d not in DEGREES:
+        if d not in DEGREE_SET:
             raise ValueError(
                 "We currently only support Bachelor's and Master's programs. "
                 "PhD, Diploma, and other degrees are coming soon. Thank you for your patience."
             )
         return d
 
+    @field_validator("subject")
+    @classmethod
+    def validate_subject(cls, v: str) -> str:
+        """Subjects come from the form's list; anything else goes through Other + subject_other."""
+        s = v.strip()
+        if s not in SUBJECT_SET:
+            raise ValueError(f"Subject must be one of: {', '.join(SUBJECTS)} (choose Other to specify your own)")
+        return s
+
     @field_validator("budget_currency")
     @classmethod
     def validate_budget_currency(cls, v: str) -> str:
         c = v.strip().upper()
-        if c not in CURRENCIES:
+        if c not in CURRENCY_SET:
             raise ValueError(f"Currency must be one of: {', '.join(CURRENCIES)}")
         return c
 
     @field_validator("name")
     @classmethod
     def validate_name(cls, v: str) -> str:
-        """Validate and clean name."""
-        name = v.strip()
-        if not name or len(name) < 2:
+        """Validate and clean name (collapses excessive whitespace)."""
+        name = normalize_name(v)
+        if len(name) < 2:
             raise ValueError("Name must be at least 2 characters long")
-        # Remove excessive whitespace
-        name = re.sub(r"\s+", " ", name)
         return name
     
     @field_validator("email")
     @classmethod
     def validate_email(cls, v: str) -> str:
-        """Validate email format (format only; no Resend/automated verification)."""
-        email = v.strip().lower()
-        if not email:
-            raise ValueError("Email cannot be empty")
-        if len(email) < 5 or len(email) > 255:
-            raise ValueError("Please enter a valid email address")
-        if "@" not in email or "." not in email.split("@")[-1]:
-            raise ValueError("Please enter a valid email address")
-        if re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", email) is None:
+        """Validate and normalize email (format only; no Resend/automated verification)."""
+        email = validate_email_format(v)
+        if email is None or len(email) < 5:
             raise ValueError("Please enter a valid email address")
         return email
     
@@ -102,6 +110,25 @@ class LeadCreate(BaseModel):
         return source
 
 
+class LeadStatusUpdate(BaseModel):
+    """One row of a batch status update."""
+
+    id: int
+    version: int = Field(..., ge=0, description="Current version for optimistic locking")
+    status: str = Field(..., min_length=2, max_length=50)
+
+    @field_validator("status")
+    @classmethod
+    def normalize_status(cls, v: str) -> str:
+        return v.strip().lower()
+
+
+class LeadStatusBatch(BaseModel):
+    """Schema for PATCH /v1/leads/status."""
+
+    updates: list[LeadStatusUpdate] = Field(..., min_length=1, max_length=500)
+
+
 class LeadResponse(BaseModel):
     """Schema for lead response."""
     
@@ -122,6 +149,7 @@ class LeadResponse(BaseModel):
     created_at: datetime
     status: str
     version: int = 0  # Optimistic locking version
+    score: Optional[float] = None  # 0-100 priority, see app/services/lead_scoring.py
 
     class Config:
         from_attributes = True
@@ -1,6 +1,7 @@
 """Seed a default admin user if missing.
 
-Runs automatically on backend startup when ADMIN_EMAIL and ADMIN_PASSWORD are set in .env.
+Runs with the schema migrations (python -m app.migrations) when ADMIN_EMAIL and
+ADMIN_PASSWORD are set in .env.
 Also runnable standalone: python -m app.seed_admin
 """
 import asyncio
@@ -34,8 +35,6 @@ async def seed_admin() -> None:
     except EmailNotValidError as e:
         raise ValueError(f"Invalid ADMIN_EMAIL: {e}") from e
 
-    await init_db()
-
     async with async_session_maker() as session:
         result = await session.execute(select(Admin).where(Admin.email == admin_email.lower()))
         existing = result.scalar_one_or_none()
@@ -59,4 +58,9 @@ if __name__ == "__main__":
     if not (settings.admin_email or "").strip() or not (settings.admin_password or "").strip():
         print("ADMIN_EMAIL and ADMIN_PASSWORD are required. Set them in .env or as env vars.", file=sys.stderr)
         sys.exit(1)
-    asyncio.run(seed_admin())
+
+    async def main() -> None:
+        await init_db()
+        await seed_admin()
+
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 """Seed default content for the public site (destinations, testimonials, why-us, etc.).
 
-Runs automatically on backend startup if content tables are empty.
+Runs with the schema migrations (python -m app.migrations, or on startup when the
+schema is not current) if content tables are empty.
 Also runnable: python -m app.seed_content
 """
 import asyncio
@@ -63,8 +64,6 @@ SITE_COPY = {
 
 async def seed_content() -> None:
     """Seed destinations, testimonials, why-us, CTA trust, hero stats, and copy if tables are empty."""
-    await init_db()
-
     async with async_session_maker() as session:
         r = await session.execute(select(Destination).limit(1))
         if r.scalar_one_or_none() is not None:
@@ -107,4 +106,8 @@ async def seed_content() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_content())
+    async def main() -> None:
+        await init_db()
+        await seed_content()
+
+    asyncio.run(main())
@@ -1,12 +1,36 @@
 """Service helpers for the approval workflow."""
+from typing import Optional
+
 from fastapi import HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.models.user import Admin, PendingApprovalUser, User
 from app.schemas.auth import SignupRequest
-from app.utils.auth import hash_password
+from app.utils.auth import hash_password_async
+from app.utils.pagination import PageParams, apply_keyset, finish_page, like_pattern
+
+# Sort keys accepted by the paged user listings (?sort=)
+USER_SORTS = ("created_at", "email", "full_name")
+
+
+async def _list_people(
+    session: AsyncSession, model, params: PageParams, sort: str
+) -> tuple[list, Optional[str]]:
+    """Keyset-paged listing shared by pending users and approved users."""
+    sort_expr = getattr(model, sort)
+    statement = select(model)
+    if params.q:
+        pattern = like_pattern(params.q)
+        statement = statement.where(
+            or_(model.email.ilike(pattern, escape="\\"), model.full_name.ilike(pattern, escape="\\"))
+        )
+    statement = apply_keyset(statement, sort_expr, model.id, params)
+    result = await session.execute(statement)
+    return finish_page(
+        result.scalars().all(), params, lambda u: getattr(u, sort), lambda u: u.id
+    )
 
 
 async def _email_in_use(session: AsyncSession, email: str) -> bool:
@@ -32,7 +56,7 @@ async def create_pending_user(
     pending = PendingApprovalUser(
         email=email,
         full_name=payload.full_name,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
     )
     session.add(pending)
     await session.commit()
@@ -40,11 +64,11 @@ async def create_pending_user(
     return pending
 
 
-async def list_pending_users(session: AsyncSession) -> list[PendingApprovalUser]:
-    result = await session.execute(
-        select(PendingApprovalUser).order_by(PendingApprovalUser.created_at.desc())
-    )
-    return result.scalars().all()
+async def list_pending_users(
+    session: AsyncSession, params: PageParams, sort: str = "created_at"
+) -> tuple[list[PendingApprovalUser], Optional[str]]:
+    """One page of pending users and the cursor for the next page."""
+    return await _list_people(session, PendingApprovalUser, params, sort)
 
 
 async def count_pending_users(session: AsyncSession) -> int:
@@ -106,9 +130,11 @@ async def reject_pending_user(session: AsyncSession, pending_user_id: int) -> No
     await session.commit()
 
 
-async def list_users(session: AsyncSession) -> list[User]:
-    result = await session.execute(select(User).order_by(User.created_at.desc()))
-    return result.scalars().all()
+async def list_users(
+    session: AsyncSession, params: PageParams, sort: str = "created_at"
+) -> tuple[list[User], Optional[str]]:
+    """One page of approved users and the cursor for the next page."""
+    return await _list_people(session, User, params, sort)
 
 
 async def update_user_status(
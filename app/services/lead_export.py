@@ -0,0 +1,169 @@
+"""Streaming lead export (CSV, NDJSON and, when pyarrow is installed, Parquet).
+
+export_leads() runs the dashboard query through a server-side cursor
+(`session.stream` with yield_per) and encodes one partition of
+EXPORT_BATCH_SIZE rows at a time, so memory stays flat regardless of how
+many leads match. It opens its own session because the response body is
+streamed after the request-scoped session has been closed.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from app.models.lead import Lead
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_COLUMNS = (
+    Lead.id,
+    Lead.name,
+    Lead.email,
+    Lead.country,
+    Lead.target_country,
+    Lead.intake,
+    Lead.degree,
+    Lead.subject,
+    Lead.budget_min,
+    Lead.budget_max,
+    Lead.budget_currency,
+    Lead.source,
+    Lead.status,
+    Lead.score,
+    Lead.user_id,
+    Lead.created_at,
+)
+_FIELD_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+
+def parquet_available() -> bool:
+    """Parquet export needs the optional pyarrow package."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _iso(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _encode_csv(rows: list, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(_FIELD_NAMES)
+    writer.writerows([_iso(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows: list) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(_FIELD_NAMES, row)), default=_iso) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file for pyarrow that hands back bytes as they are written."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("email", pa.string()),
+        ("country", pa.string()),
+        ("target_country", pa.string()),
+        ("intake", pa.string()),
+        ("degree", pa.string()),
+        ("subject", pa.string()),
+        ("budget_min", pa.int64()),
+        ("budget_max", pa.int64()),
+        ("budget_currency", pa.string()),
+        ("source", pa.string()),
+        ("status", pa.string()),
+        ("score", pa.float64()),
+        ("user_id", pa.int64()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+async def export_leads(query, fmt: str, q: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Stream the leads matched by a filtered select(Lead) as encoded chunks.
+
+    Args:
+        query: Query from filtered_leads_query, with ORDER BY applied
+        fmt: csv, ndjson or parquet (check parquet_available() first)
+        q: Optional search string, applied as in GET /v1/leads
+
+    Yields:
+        Encoded bytes, one chunk per EXPORT_BATCH_SIZE rows
+    """
+    # Imported lazily so the exporter does not pin the engine at import time.
+    from app.database import async_session_maker
+    from app.services.leads import apply_lead_search
+
+    async with async_session_maker() as session:
+        if q:
+            query, _ = await apply_lead_search(session, query, q)
+        statement = query.with_only_columns(*EXPORT_COLUMNS).execution_options(
+            yield_per=EXPORT_BATCH_SIZE
+        )
+        result = await session.stream(statement)
+
+        if fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = _parquet_schema()
+            sink = _ChunkSink()
+            with pq.ParquetWriter(sink, schema) as writer:
+                async for partition in result.partitions():
+                    columns = list(zip(*partition))
+                    writer.write_batch(pa.RecordBatch.from_arrays(
+                        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                        schema=schema,
+                    ))
+                    yield sink.drain()
+            yield sink.drain()
+            return
+
+        header = True
+        async for partition in result.partitions():
+            if fmt == "csv":
+                yield _encode_csv(partition, header)
+                header = False
+            else:
+                yield _encode_ndjson(partition)
+        if fmt == "csv" and header:
+            yield _encode_csv([], header)
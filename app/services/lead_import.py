@@ -0,0 +1,209 @@
+"""Bulk lead ingestion for partner and campaign imports (CSV, JSON array or NDJSON).
+
+Rows are processed in chunks of IMPORT_CHUNK_SIZE:
+
+- Validation: the whole chunk is validated with one TypeAdapter(list[LeadCreate])
+  call; only if that fails are rows re-validated one by one to collect
+  per-row errors.
+- Dedup: emails repeated inside the file are caught with a set; existing
+  emails are found with one `SELECT email ... WHERE email IN (...)` per chunk.
+- Insert: rows are scored (services.lead_scoring), then one executemany
+  INSERT ... ON CONFLICT (email) DO NOTHING RETURNING per chunk and a commit.
+  A row that loses a race with a concurrent insert is missing from RETURNING
+  and is reported as a duplicate.
+
+import_leads() yields a progress dict after every chunk, so callers can stream
+progress for large files (POST /v1/leads/bulk?stream=true, import_leads.py).
+"""
+import csv
+import io
+import json
+from typing import IO, Any, AsyncIterator, Iterable, Iterator, Optional
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models.lead import Lead
+from app.schemas.lead import LeadCreate
+from app.services.lead_scoring import score_rows
+from app.services.leads import lead_values
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_FORMATS = ("csv", "json", "ndjson")
+
+_chunk_adapter = TypeAdapter(list[LeadCreate])
+
+
+def detect_format(content_type: Optional[str], filename: Optional[str] = None) -> Optional[str]:
+    """Map a Content-Type header (or file extension) to csv / json / ndjson."""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    if content_type == "application/json":
+        return "json"
+    if filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension in ("jsonl", "ndjson"):
+            return "ndjson"
+        if extension in IMPORT_FORMATS:
+            return extension
+    return None
+
+
+def parse_rows(stream: IO[bytes], fmt: str) -> Iterator[dict[str, Any]]:
+    """
+    Yield raw lead rows from a binary stream.
+
+    CSV and NDJSON are read incrementally; a JSON array is loaded in one go.
+    Empty CSV cells become None so optional fields validate as missing.
+
+    Raises:
+        ValueError: If the file cannot be parsed in the given format
+    """
+    if fmt == "csv":
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        for row in csv.DictReader(text_stream):
+            yield {
+                (key or "").strip(): (value.strip() or None) if isinstance(value, str) else value
+                for key, value in row.items()
+                if key
+            }
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}")
+            yield row if isinstance(row, dict) else {}
+    elif fmt == "json":
+        try:
+            data = json.load(stream)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg}")
+        if isinstance(data, dict):
+            data = data.get("leads")
+        if not isinstance(data, list):
+            raise ValueError('Expected a JSON array of leads (or {"leads": [...]})')
+        for row in data:
+            yield row if isinstance(row, dict) else {}
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def _error_message(error: ValidationError) -> str:
+    parts = []
+    for item in error.errors():
+        field = ".".join(str(part) for part in item.get("loc", ()))
+        message = item.get("msg", "Invalid value").removeprefix("Value error, ")
+        parts.append(f"{field}: {message}" if field else message)
+    return "; ".join(parts)
+
+
+def _validate_chunk(rows: list[dict[str, Any]]) -> list[LeadCreate | str]:
+    """Validate a chunk; returns a LeadCreate or an error message per row."""
+    try:
+        return list(_chunk_adapter.validate_python(rows))
+    except ValidationError:
+        pass
+    validated: list[LeadCreate | str] = []
+    for row in rows:
+        try:
+            validated.append(LeadCreate.model_validate(row))
+        except ValidationError as e:
+            validated.append(_error_message(e))
+    return validated
+
+
+def _chunks(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    chunk: list[dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def import_leads(
+    session: AsyncSession,
+    rows: Iterable[dict[str, Any]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Validate, dedup and insert lead rows chunk by chunk.
+
+    Args:
+        session: Database session (committed after every chunk)
+        rows: Raw row dicts, e.g. from parse_rows()
+        chunk_size: Rows per validation/insert round trip
+
+    Yields:
+        Progress after each chunk: running totals (processed, created,
+        duplicates, invalid) and that chunk's per-row results
+        ({"row", "email", "status": created|duplicate|invalid, "id" | "error"}).
+    """
+    totals = {"processed": 0, "created": 0, "duplicates": 0, "invalid": 0}
+    seen_emails: set[str] = set()
+
+    for chunk in _chunks(rows, chunk_size):
+        first_row = totals["processed"] + 1
+        results: list[dict[str, Any]] = []
+        pending: dict[str, dict[str, Any]] = {}
+        pending_values: list[dict[str, Any]] = []
+
+        for offset, item in enumerate(_validate_chunk(chunk)):
+            row_number = first_row + offset
+            raw_email = chunk[offset].get("email")
+            if isinstance(item, str):
+                results.append({"row": row_number, "email": raw_email, "status": "invalid", "error": item})
+                continue
+            email = item.email
+            if email in seen_emails:
+                results.append({"row": row_number, "email": email, "status": "duplicate"})
+                continue
+            seen_emails.add(email)
+            result = {"row": row_number, "email": email, "status": "created"}
+            results.append(result)
+            pending[email] = result
+            pending_values.append(lead_values(item))
+
+        if pending:
+            existing = await session.execute(
+                select(Lead.email).where(Lead.email.in_(list(pending)))
+            )
+            for (email,) in existing:
+                pending.pop(email)["status"] = "duplicate"
+            pending_values = [values for values in pending_values if values["email"] in pending]
+
+        if pending_values:
+            await score_rows(session, pending_values)
+            statement = (
+                dialect_insert(session, Lead.__table__)
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(Lead.__table__.c.id, Lead.__table__.c.email)
+            )
+            inserted = await session.execute(statement, pending_values)
+            for lead_id, email in inserted:
+                pending.pop(email)["id"] = lead_id
+            # Anything left was inserted concurrently by another request.
+            for result in pending.values():
+                result["status"] = "duplicate"
+            await session.commit()
+
+        totals["processed"] += len(chunk)
+        for result in results:
+            if result["status"] == "created":
+                totals["created"] += 1
+            elif result["status"] == "duplicate":
+                totals["duplicates"] += 1
+            else:
+                totals["invalid"] += 1
+        yield {**totals, "results": results}
@@ -0,0 +1,266 @@
+"""Write-behind intake queue for public lead submissions (LEAD_INTAKE_ASYNC=true).
+
+POST /leads validates the payload, appends it to a durable journal
+(app.utils.journal: per-process JSON-lines segments, group-committed by a writer
+thread) and answers 202 without touching the database. A background task
+drains the queue every `lead_intake_flush_interval` seconds (or as soon as
+`lead_intake_batch_size` submissions are waiting): rows are scored, then
+written with one executemany INSERT ... ON CONFLICT (email) DO NOTHING per batch.
+
+- Durability: drained submissions are acknowledged in the journal and
+  unacknowledged ones are replayed on start(), so accepted submissions survive
+  a restart or crash. If the database is unavailable the batch stays queued and
+  is retried on the next tick; any other batch failure is retried row by row and
+  rows that still fail go to `<LEAD_INTAKE_QUEUE_PATH>.dead`, so one bad row
+  cannot block the queue.
+- Idempotency: each submission carries a key (the Idempotency-Key header, or
+  the normalized email), remembered together with a fingerprint of the
+  submitted fields. Resending a key that is queued or was recently drained
+  with the same fields is acknowledged again without being queued twice;
+  reusing it for different fields raises IdempotencyKeyReused (422).
+- Backpressure: once `lead_intake_max_pending` submissions are waiting,
+  enqueue() raises IntakeQueueFull and the endpoint answers 503 + Retry-After.
+
+A duplicate email cannot be reported as 409 in this mode; it is skipped
+(and logged) when the batch is written.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from app.config import settings
+from app.models.lead import Lead
+from app.services.lead_scoring import score_rows
+from app.utils.count_cache import invalidate
+from app.utils.journal import Journal
+
+logger = logging.getLogger(__name__)
+
+
+class IntakeQueueFull(Exception):
+    """Raised when too many submissions are waiting to be written."""
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when an idempotency key is sent again with a different submission."""
+
+
+# Filled in by the server (created_at) or at flush time (score), so not part of a fingerprint
+_SERVER_FIELDS = ("created_at", "score")
+
+
+def submission_fingerprint(values: dict[str, Any]) -> str:
+    """Stable hash of the submitted fields of a lead row."""
+    submitted = {name: value for name, value in values.items() if name not in _SERVER_FIELDS}
+    return hashlib.sha256(json.dumps(submitted, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class LeadIntakeQueue:
+    """Durable in-process queue that bulk-inserts lead submissions in the background."""
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.5,
+        batch_size: int = 500,
+        max_pending: int = 10000,
+        remembered_keys: int = 10000,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.remembered_keys = remembered_keys
+        self._buffer: list[dict[str, Any]] = []
+        # idempotency key -> fingerprint of the submission it was accepted for
+        self._queued_keys: dict[str, str] = {}
+        self._drained_keys: OrderedDict[str, str] = OrderedDict()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._journal = Journal(path)
+        self._writing = 0
+
+    async def enqueue(self, values: dict[str, Any], idempotency_key: str) -> bool:
+        """
+        Durably queue a new lead row (as built by services.leads.lead_values);
+        returns once it is fsynced to the journal.
+
+        Returns:
+            True if queued, False if this idempotency key was already accepted
+            for the same submission
+
+        Raises:
+            IdempotencyKeyReused: If the key was accepted for a different submission
+            IntakeQueueFull: If max_pending submissions are already waiting
+            OSError: If the journal write failed (nothing was queued)
+        """
+        fingerprint = submission_fingerprint(values)
+        accepted = self._queued_keys.get(idempotency_key) or self._drained_keys.get(idempotency_key)
+        if accepted is not None:
+            if accepted != fingerprint:
+                raise IdempotencyKeyReused(idempotency_key)
+            return False
+        if len(self._buffer) + self._writing >= self.max_pending:
+            raise IntakeQueueFull(f"{len(self._buffer) + self._writing} lead submissions waiting")
+
+        entry = {"key": idempotency_key, "values": values}
+        self._queued_keys[idempotency_key] = fingerprint
+        self._writing += 1
+        try:
+            await self._journal.append([entry], self._accept)
+        except Exception:
+            self._queued_keys.pop(idempotency_key, None)
+            raise
+        finally:
+            self._writing -= 1
+        return True
+
+    async def start(self) -> None:
+        """Replay undrained submissions from the journal and start the background writer."""
+        replayed = await asyncio.to_thread(self._journal.replay)
+        if replayed:
+            logger.info("Replaying %d queued lead submissions from %s", len(replayed), self.path)
+            for entry in replayed:
+                entry["values"]["created_at"] = datetime.fromisoformat(entry["values"]["created_at"])
+            self._buffer[:0] = replayed
+            self._queued_keys.update(
+                (entry["key"], submission_fingerprint(entry["values"])) for entry in replayed
+            )
+        self._ensure_started()
+
+    async def stop(self) -> None:
+        """Stop the background writer and drain everything still queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        while self._buffer and await self.flush():
+            pass
+        await self._journal.close()
+
+    async def flush(self) -> int:
+        """Insert up to batch_size queued submissions. Returns the number drained."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            batch = self._buffer[: self.batch_size]
+            # Imported lazily so the queue does not pin the engine at import time.
+            from app.database import is_transient_error
+
+            try:
+                created = await self._insert([entry["values"] for entry in batch])
+                done = len(batch)
+            except Exception as exc:
+                if is_transient_error(exc):
+                    # Leave the batch queued (and in the journal) so the next tick retries it.
+                    logger.error("Lead intake flush of %d submissions failed: %s", len(batch), exc)
+                    return 0
+                logger.warning("Lead intake batch of %d failed (%s); retrying rows one by one", len(batch), exc)
+                created, done = await self._insert_one_by_one(batch)
+
+            del self._buffer[:done]
+            for entry in batch[:done]:
+                self._remember_drained(entry["key"], entry["values"])
+                if entry["values"]["email"] not in created:
+                    logger.info("Skipped queued lead for existing email %s", entry["values"]["email"])
+            self._journal.ack(done)
+            if created:
+                invalidate("new_leads")
+            return done
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> set[str]:
+        """Score and insert rows in one transaction. Returns the emails actually inserted."""
+        from app.database import async_session_maker, dialect_insert
+
+        async with async_session_maker() as session:
+            await score_rows(session, rows)
+            statement = (
+                dialect_insert(session, Lead.__table__)
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(Lead.__table__.c.email)
+            )
+            inserted = await session.execute(statement, rows)
+            created = {email for (email,) in inserted}
+            await session.commit()
+        return created
+
+    async def _insert_one_by_one(self, batch: list[dict[str, Any]]) -> tuple[set[str], int]:
+        """
+        Insert each entry alone after a batch failure; entries that still fail are
+        dead-lettered. Stops at the first transient failure.
+
+        Returns:
+            (emails inserted, number of leading entries handled)
+        """
+        from app.database import is_transient_error
+
+        created: set[str] = set()
+        done = 0
+        for entry in batch:
+            try:
+                created |= await self._insert([entry["values"]])
+            except Exception as exc:
+                if is_transient_error(exc):
+                    logger.error("Lead intake retry stopped: %s", exc)
+                    break
+                logger.error("Dead-lettering queued lead %s: %s", entry["key"], exc)
+                self._journal.dead_letter([entry], str(exc))
+            done += 1
+        return created, done
+
+    def pending(self) -> int:
+        """Number of submissions waiting to be written."""
+        return len(self._buffer)
+
+    def _remember_drained(self, key: str, values: dict[str, Any]) -> None:
+        fingerprint = self._queued_keys.pop(key, None) or submission_fingerprint(values)
+        self._drained_keys[key] = fingerprint
+        self._drained_keys.move_to_end(key)
+        while len(self._drained_keys) > self.remembered_keys:
+            self._drained_keys.popitem(last=False)
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            # Keep draining while full batches are waiting.
+            while await self.flush() >= self.batch_size:
+                pass
+
+    def _accept(self, entries: list[dict[str, Any]]) -> None:
+        """Journal callback: the entries are durable, so hand them to the writer."""
+        self._buffer.extend(entries)
+        self._ensure_started()
+        if len(self._buffer) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+
+lead_intake_queue = LeadIntakeQueue(
+    path=settings.lead_intake_queue_path,
+    flush_interval=settings.lead_intake_flush_interval,
+    batch_size=settings.lead_intake_batch_size,
+    max_pending=settings.lead_intake_max_pending,
+)
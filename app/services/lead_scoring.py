@@ -0,0 +1,190 @@
+"""Lead scoring: a 0-100 priority score stored in Lead.score.
+
+Scores are computed at write time, so GET /v1/leads?sort=score is a plain
+ORDER BY on the indexed column:
+
+- insert_lead, bulk import and the intake queue call score_rows() on the rows
+  they are about to insert (incremental).
+- recompute_scores() rescores every lead in id-ordered batches: one columnar
+  SELECT and one executemany UPDATE per batch. Run it periodically
+  (python rescore_leads.py) since intake proximity and source history drift;
+  on startup only unscored leads are filled in.
+
+Components (max points):
+    degree 20, budget 35 (USD-normalized midpoint + range given),
+    target country 15, intake proximity 15, source conversion history 15.
+"""
+import logging
+import re
+from datetime import datetime
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lead import Lead
+from app.utils.count_cache import get_cached
+
+logger = logging.getLogger(__name__)
+
+RECOMPUTE_BATCH_SIZE = 1000
+SOURCE_RATES_TTL = 300  # seconds; source history changes slowly
+
+DEGREE_POINTS = {"Master's": 20.0, "Bachelor's": 15.0}
+DEFAULT_DEGREE_POINTS = 5.0
+
+# Approximate USD value of one unit of each form currency (lead_options.CURRENCIES)
+USD_PER_UNIT = {"USD": 1.0, "EUR": 1.08, "GBP": 1.27, "INR": 0.012, "AED": 0.27}
+# (minimum USD midpoint, points), checked in order
+BUDGET_TIERS = ((40000, 30.0), (20000, 22.0), (10000, 14.0), (1, 6.0))
+BUDGET_RANGE_POINTS = 5.0
+
+TARGET_COUNTRY_POINTS = {
+    "uk": 15.0, "united kingdom": 15.0, "usa": 15.0, "us": 15.0, "united states": 15.0,
+    "canada": 14.0, "australia": 14.0, "ireland": 12.0, "germany": 12.0,
+    "new zealand": 11.0, "netherlands": 11.0, "france": 10.0,
+}
+DEFAULT_TARGET_COUNTRY_POINTS = 8.0
+
+SOURCE_POINTS = 15.0
+# Pseudo-leads at the global rate mixed into each source, so small sources are not extreme
+SOURCE_PRIOR_WEIGHT = 20
+
+_INTAKE_MONTHS = {
+    "winter": 1, "jan": 1, "january": 1, "feb": 2, "february": 2,
+    "spring": 3, "mar": 3, "march": 3, "apr": 4, "april": 4, "may": 5,
+    "summer": 6, "jun": 6, "june": 6, "jul": 7, "july": 7, "aug": 8, "august": 8,
+    "fall": 9, "autumn": 9, "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+_INTAKE_RE = re.compile(r"([a-z]+)\W*(\d{4})")
+
+# Columns score_lead reads; recompute_scores selects only these.
+_SCORE_COLUMNS = (
+    Lead.id, Lead.degree, Lead.budget_min, Lead.budget_max, Lead.budget_currency,
+    Lead.target_country, Lead.intake, Lead.source,
+)
+
+
+def _budget_points(values: Mapping[str, Any]) -> float:
+    low, high = values.get("budget_min"), values.get("budget_max")
+    amounts = [a for a in (low, high) if a is not None]
+    if not amounts:
+        return 0.0
+    rate = USD_PER_UNIT.get((values.get("budget_currency") or "USD").upper(), 1.0)
+    midpoint = sum(amounts) / len(amounts) * rate
+    points = next((p for floor, p in BUDGET_TIERS if midpoint >= floor), 0.0)
+    if low is not None and high is not None:
+        points += BUDGET_RANGE_POINTS
+    return points
+
+
+def _intake_points(intake: Optional[str], now: datetime) -> float:
+    match = _INTAKE_RE.search((intake or "").lower())
+    month = _INTAKE_MONTHS.get(match.group(1)) if match else None
+    if month is None:
+        return 5.0
+    months_away = (int(match.group(2)) - now.year) * 12 + (month - now.month)
+    if months_away < 0:
+        return 2.0
+    if months_away <= 3:
+        return 10.0
+    if months_away <= 12:
+        return 15.0
+    if months_away <= 24:
+        return 8.0
+    return 4.0
+
+
+def score_lead(values: Mapping[str, Any], source_rates: Mapping[str, float], now: datetime) -> float:
+    """
+    Score one lead from its column values.
+
+    Args:
+        values: Lead columns (a lead_values dict or a selected row mapping)
+        source_rates: Points per source from source_points()
+        now: Reference time for intake proximity
+    """
+    score = DEGREE_POINTS.get(values.get("degree") or "", DEFAULT_DEGREE_POINTS)
+    score += _budget_points(values)
+    target = (values.get("target_country") or "").strip().lower()
+    score += TARGET_COUNTRY_POINTS.get(target, DEFAULT_TARGET_COUNTRY_POINTS)
+    score += _intake_points(values.get("intake"), now)
+    source = (values.get("source") or "").lower()
+    score += source_rates.get(source, source_rates.get("", SOURCE_POINTS / 2))
+    return round(score, 1)
+
+
+async def _load_source_points(session: AsyncSession) -> dict[str, float]:
+    won = func.sum(case((Lead.status == "won", 1), else_=0))
+    qualified = func.sum(case((Lead.status == "qualified", 1), else_=0))
+    rows = (await session.execute(
+        select(func.lower(Lead.source), func.count(Lead.id), won, qualified).group_by(func.lower(Lead.source))
+    )).all()
+    total = sum(row[1] for row in rows)
+    # Same outcomes as /v1/leads/stats source_performance; a qualified lead counts half a win
+    converted = {row[0]: (row[2] or 0) + 0.5 * (row[3] or 0) for row in rows}
+    global_rate = sum(converted.values()) / total if total else 0.0
+    if global_rate == 0:
+        return {"": SOURCE_POINTS / 2}
+    points = {"": SOURCE_POINTS / 2}
+    for source, count, _, _ in rows:
+        smoothed = (converted[source] + SOURCE_PRIOR_WEIGHT * global_rate) / (count + SOURCE_PRIOR_WEIGHT)
+        # Twice the global conversion rate (or better) earns full points
+        points[source] = SOURCE_POINTS * min(1.0, smoothed / (2 * global_rate))
+    return points
+
+
+async def source_points(session: AsyncSession) -> dict[str, float]:
+    """Per-source points from conversion history, cached for SOURCE_RATES_TTL seconds."""
+    return await get_cached("lead_source_points", lambda: _load_source_points(session), ttl=SOURCE_RATES_TTL)
+
+
+async def score_rows(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Set "score" on new lead rows (lead_values dicts) before they are inserted."""
+    if not rows:
+        return
+    rates = await source_points(session)
+    now = datetime.utcnow()
+    for row in rows:
+        row["score"] = score_lead(row, rates, now)
+
+
+async def recompute_scores(session: AsyncSession, only_unscored: bool = False) -> int:
+    """
+    Rescore leads in batches of RECOMPUTE_BATCH_SIZE (keyset over id).
+
+    Args:
+        session: Database session (committed after every batch)
+        only_unscored: Only fill in leads whose score is NULL
+
+    Returns:
+        Number of leads scored
+    """
+    rates = await _load_source_points(session)
+    now = datetime.utcnow()
+    statement = (
+        update(Lead.__table__)
+        .where(Lead.__table__.c.id == bindparam("lead_id"))
+        .values(score=bindparam("new_score"))
+    )
+    last_id, scored = 0, 0
+    while True:
+        query = select(*_SCORE_COLUMNS).where(Lead.id > last_id)
+        if only_unscored:
+            query = query.where(Lead.score.is_(None))
+        batch = (await session.execute(query.order_by(Lead.id).limit(RECOMPUTE_BATCH_SIZE))).mappings().all()
+        if not batch:
+            return scored
+        params = [{"lead_id": row["id"], "new_score": score_lead(row, rates, now)} for row in batch]
+        await session.execute(statement, params)
+        await session.commit()
+        last_id = batch[-1]["id"]
+        scored += len(batch)
+
+
+async def score_unscored_leads(session: AsyncSession) -> None:
+    """Startup backfill: score leads created before scoring existed."""
+    scored = await recompute_scores(session, only_unscored=True)
+    if scored:
+        logger.info("Scored %d previously unscored leads", scored)
@@ -0,0 +1,202 @@
+"""Full-text and fuzzy search over leads (name, email, country, target_country, subject).
+
+SQLite:
+    - leads_fts: FTS5 external-content table (unicode61 tokenizer), queried with
+      per-token prefix matches ("tok"*), ANDed.
+    - leads_trgm: FTS5 trigram table used as the fallback. This is an indexed
+      substring match (q must appear verbatim, at least 3 characters), so it
+      finds "arma" in "Sharma" but is not typo-tolerant.
+    Both are kept in sync with `leads` by AFTER INSERT/UPDATE/DELETE triggers, so
+    every write path (API, bulk import, scripts) is covered.
+
+Postgres:
+    - GIN expression index on to_tsvector('simple', <document>), queried with a
+      prefix tsquery (tok:* & tok2:*).
+    - pg_trgm GIN index on lower(<document>) for the fuzzy fallback: word
+      similarity (q <% document), which tolerates typos in q against any part
+      of the document. Plain similarity (%) compares q with the whole
+      concatenated document and almost never reaches the threshold.
+    Expression indexes need no sync code: Postgres maintains them on insert/update.
+
+ensure_lead_search_index() creates all of this idempotently and runs on startup.
+deferred_search_sync() suspends the SQLite triggers around a bulk load and
+rebuilds the FTS tables once afterwards.
+search_clause() returns a WHERE clause for get_leads; fuzzy=True is used only when
+the full-text pass finds nothing.
+"""
+import logging
+import re
+from contextlib import asynccontextmanager
+
+from sqlalchemy import func, literal, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.models.lead import Lead
+from app.utils.pagination import like_pattern
+
+logger = logging.getLogger(__name__)
+
+_FIELDS = ("name", "email", "country", "target_country", "subject")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Postgres search document; must match the index expressions exactly.
+_PG_DOCUMENT = " || ' ' || ".join(f"coalesce({f}, '')" for f in _FIELDS)
+_PG_TSVECTOR = f"to_tsvector('simple', {_PG_DOCUMENT})"
+_PG_TRGM_DOCUMENT = f"lower({_PG_DOCUMENT})"
+
+# Detected once per process: which search structures exist in this database.
+_capabilities: dict[str, bool] = {}
+
+
+def _sqlite_fts_triggers(table: str) -> list[str]:
+    cols = ", ".join(_FIELDS)
+    new_vals = ", ".join(f"new.{f}" for f in _FIELDS)
+    old_vals = ", ".join(f"old.{f}" for f in _FIELDS)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON leads BEGIN "
+        f"INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON leads BEGIN "
+        f"INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {cols} ON leads BEGIN "
+        f"INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+    ]
+
+
+def _sqlite_fts_ddl(table: str, tokenize: str) -> list[str]:
+    cols = ", ".join(_FIELDS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+        f"{cols}, content='leads', content_rowid='id', tokenize=\"{tokenize}\")",
+        *_sqlite_fts_triggers(table),
+    ]
+
+
+async def _ensure_sqlite_table(table: str, tokenize: str) -> None:
+    async with engine.begin() as conn:
+        exists = (await conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table},
+        )).first() is not None
+        for statement in _sqlite_fts_ddl(table, tokenize):
+            await conn.execute(text(statement))
+        if not exists:
+            # Index rows that were inserted before the FTS table existed.
+            await conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+
+
+async def ensure_lead_search_index() -> None:
+    """Create the search tables/indexes for the current dialect if missing."""
+    _capabilities.clear()
+    if engine.dialect.name == "sqlite":
+        try:
+            await _ensure_sqlite_table("leads_fts", "unicode61 remove_diacritics 2")
+        except Exception as exc:
+            logger.warning("Lead full-text index unavailable (FTS5 missing?): %s", exc)
+        try:
+            await _ensure_sqlite_table("leads_trgm", "trigram")
+        except Exception as exc:
+            logger.warning("Lead trigram index unavailable (SQLite < 3.34?): %s", exc)
+    elif engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_leads_search_tsv ON leads USING GIN ({_PG_TSVECTOR})"
+            ))
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_leads_search_trgm ON leads "
+                    f"USING GIN ({_PG_TRGM_DOCUMENT} gin_trgm_ops)"
+                ))
+        except Exception as exc:
+            logger.warning("Lead fuzzy search unavailable (pg_trgm not installable): %s", exc)
+
+
+@asynccontextmanager
+async def deferred_search_sync():
+    """
+    Bulk-load helper: on SQLite, drop the FTS sync triggers for the duration and
+    rebuild both FTS tables once at the end (far cheaper than per-row trigger
+    work for large loads). Postgres expression indexes need nothing; no-op there.
+    """
+    if engine.dialect.name != "sqlite":
+        yield
+        return
+    async with engine.begin() as conn:
+        tables = [row[0] for row in await conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('leads_fts', 'leads_trgm')"
+        ))]
+        for table in tables:
+            for suffix in ("ai", "ad", "au"):
+                await conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_{suffix}"))
+    try:
+        yield
+    finally:
+        async with engine.begin() as conn:
+            for table in tables:
+                await conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+                for statement in _sqlite_fts_triggers(table):
+                    await conn.execute(text(statement))
+
+
+async def _detect(session: AsyncSession) -> dict[str, bool]:
+    if _capabilities:
+        return _capabilities
+    dialect = session.bind.dialect.name
+    if dialect == "sqlite":
+        result = await session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('leads_fts', 'leads_trgm')"
+        ))
+        names = {row[0] for row in result}
+        _capabilities.update(fts="leads_fts" in names, fuzzy="leads_trgm" in names)
+    elif dialect == "postgresql":
+        result = await session.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+        _capabilities.update(fts=True, fuzzy=result.first() is not None)
+    else:
+        _capabilities.update(fts=False, fuzzy=False)
+    return _capabilities
+
+
+def _fallback_clause(q: str):
+    """Plain substring match when no index is available for this dialect."""
+    pattern = like_pattern(q)
+    return or_(*[getattr(Lead, f).ilike(pattern, escape="\\") for f in _FIELDS])
+
+
+async def search_clause(session: AsyncSession, q: str, fuzzy: bool = False):
+    """
+    WHERE clause matching leads for the search string q.
+
+    Returns None when q has nothing searchable (or fuzzy search is unavailable / q
+    too short for trigrams), so callers can skip the filter or the fallback pass.
+    """
+    q = (q or "").strip()
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+    caps = await _detect(session)
+    dialect = session.bind.dialect.name
+
+    if not fuzzy:
+        if not caps.get("fts"):
+            return _fallback_clause(q)
+        if dialect == "sqlite":
+            match = " ".join(f'"{t}"*' for t in tokens)
+            return Lead.id.in_(
+                select(literal_column("rowid")).select_from(text("leads_fts"))
+                .where(text("leads_fts MATCH :fts_query").bindparams(fts_query=match))
+            )
+        tsquery = " & ".join(f"{t.lower()}:*" for t in tokens)
+        return literal_column(_PG_TSVECTOR).op("@@")(func.to_tsquery("simple", tsquery))
+
+    if not caps.get("fuzzy") or len(q) < 3:
+        return None
+    if dialect == "sqlite":
+        phrase = '"' + q.replace('"', '""') + '"'
+        return Lead.id.in_(
+            select(literal_column("rowid")).select_from(text("leads_trgm"))
+            .where(text("leads_trgm MATCH :trgm_query").bindparams(trgm_query=phrase))
+        )
+    return literal(q.lower()).op("<%", is_comparison=True)(literal_column(_PG_TRGM_DOCUMENT))
@@ -0,0 +1,210 @@
+"""Service helpers for lead creation and the queries shared by the dashboard list and index checks."""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Row, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.database import dialect_insert
+from app.lead_options import SUBJECTS
+from app.models.lead import Lead
+from app.schemas.lead import LeadCreate, LeadStatusUpdate
+from app.services.lead_scoring import score_rows
+from app.services.lead_search import search_clause
+
+# "Other" leads are stored with the custom subject_other value (e.g. Psychology), not "Other".
+_PREDEFINED_NON_OTHER = [s for s in SUBJECTS if s != "Other"]
+
+
+def lead_values(lead_data: LeadCreate) -> dict[str, Any]:
+    """
+    Column values for a new lead row from a validated LeadCreate.
+
+    LeadCreate has already normalized name, email, country, degree, subject,
+    currency and source; only intake and subject_other still need trimming here.
+    """
+    # Resolve subject: use subject_other when subject is "Other"
+    resolved_subject = (
+        (lead_data.subject_other or "").strip()
+        if lead_data.subject == "Other"
+        else lead_data.subject
+    )
+    return {
+        "name": lead_data.name,
+        "email": lead_data.email,
+        "country": lead_data.country,
+        "target_country": lead_data.target_country,
+        "intake": lead_data.intake.strip(),
+        "degree": lead_data.degree,
+        "subject": resolved_subject,
+        "budget": None,
+        "budget_amount": None,
+        "budget_min": lead_data.budget_min,
+        "budget_max": lead_data.budget_max,
+        "budget_currency": lead_data.budget_currency,
+        "source": lead_data.source,
+        "status": "new",
+        "created_at": datetime.utcnow(),
+    }
+
+
+async def insert_lead(session: AsyncSession, values: dict[str, Any]) -> Optional[Row]:
+    """
+    Insert a lead in one round trip: INSERT ... ON CONFLICT (email) DO NOTHING RETURNING.
+
+    Scores the lead (Lead.score) and commits on success. Concurrent submissions
+    of the same email cannot race into the unique constraint; the loser simply
+    gets no row back.
+
+    Returns:
+        The inserted row (all lead columns), or None if the email already exists
+    """
+    await score_rows(session, [values])
+    statement = (
+        dialect_insert(session, Lead.__table__)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(*Lead.__table__.c)
+    )
+    row = (await session.execute(statement)).first()
+    await session.commit()
+    return row
+
+
+async def update_lead_statuses(
+    session: AsyncSession,
+    updates: list[LeadStatusUpdate],
+    visible_to_user_id: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """
+    Apply many status changes in one transaction with per-row optimistic locking.
+
+    Each row is one UPDATE ... WHERE id = ? AND version = ? RETURNING; a row that
+    matches nothing is reported as a conflict (stale version) or not_found.
+
+    Args:
+        session: Database session (committed once at the end)
+        updates: (id, version, status) rows
+        visible_to_user_id: None for admins; otherwise only unassigned leads or
+            leads assigned to this user can be updated
+
+    Returns:
+        Per-row results in input order: {"id", "result": updated|conflict|not_found,
+        "version", "status"} (current version/status for conflicts)
+    """
+    results: list[dict[str, Any]] = []
+    missed: list[dict[str, Any]] = []
+    for item in updates:
+        statement = (
+            update(Lead)
+            .where(Lead.id == item.id, Lead.version == item.version)
+            .values(status=item.status, version=Lead.version + 1)
+            .returning(Lead.version, Lead.status)
+            .execution_options(synchronize_session=False)
+        )
+        if visible_to_user_id is not None:
+            statement = statement.where(
+                or_(Lead.user_id.is_(None), Lead.user_id == visible_to_user_id)
+            )
+        row = (await session.execute(statement)).first()
+        result = {"id": item.id, "result": "updated"}
+        if row is None:
+            missed.append(result)
+        else:
+            result.update(version=row.version, status=row.status)
+        results.append(result)
+
+    if missed:
+        # One lookup to tell stale versions from missing (or invisible) leads
+        current_query = filtered_leads_query(visible_to_user_id=visible_to_user_id).where(
+            Lead.id.in_({result["id"] for result in missed})
+        )
+        current = {
+            row.id: row
+            for row in (await session.execute(
+                current_query.with_only_columns(Lead.id, Lead.version, Lead.status)
+            )).all()
+        }
+        for result in missed:
+            row = current.get(result["id"])
+            if row is None:
+                result["result"] = "not_found"
+            else:
+                result.update(result="conflict", version=row.version, status=row.status)
+
+    await session.commit()
+    return results
+
+
+def filtered_leads_query(
+    visible_to_user_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    degree: Optional[str] = None,
+    subject: Optional[str] = None,
+    subject_other: Optional[str] = None,
+):
+    """
+    select(Lead) with the dashboard filters applied.
+
+    Args:
+        visible_to_user_id: None for admins (all leads); otherwise restrict to
+            unassigned leads (user_id IS NULL) or leads assigned to this user
+        status_filter, degree, subject, subject_other: as on GET /v1/leads
+    """
+    query = select(Lead)
+    if visible_to_user_id is not None:
+        query = query.where(
+            or_(Lead.user_id.is_(None), Lead.user_id == visible_to_user_id)
+        )
+    if status_filter:
+        query = query.where(Lead.status == status_filter)
+    if degree:
+        query = query.where(Lead.degree == degree)
+    if subject:
+        if subject.strip() == "Other":
+            # Match leads whose subject is not one of the predefined non-Other options.
+            query = query.where(
+                or_(Lead.subject.is_(None), Lead.subject.notin_(_PREDEFINED_NON_OTHER))
+            )
+            # When subject_other is provided, narrow by partial match on Lead.subject (e.g. "psychology").
+            if subject_other and str(subject_other).strip():
+                query = query.where(Lead.subject.ilike(f"%{subject_other.strip()}%"))
+        else:
+            query = query.where(Lead.subject == subject)
+    return query
+
+
+def lead_order(sort: str) -> tuple:
+    """
+    ORDER BY for the lead list and export: newest first, or highest score first
+    with unscored leads last (served by ix_leads_created_at / ix_leads_score_id).
+    """
+    if sort == "score":
+        return Lead.score.desc().nulls_last(), Lead.id.desc()
+    return Lead.created_at.desc(), Lead.id.desc()
+
+
+async def count_leads(session: AsyncSession, query) -> int:
+    """COUNT(*) over a filtered select(Lead) without fetching the rows."""
+    result = await session.execute(query.with_only_columns(func.count(Lead.id)).order_by(None))
+    return int(result.scalar() or 0)
+
+
+async def apply_lead_search(session: AsyncSession, query, q: str) -> tuple[Any, int]:
+    """
+    Narrow a filtered select(Lead) by the search string q.
+
+    Uses the indexed full-text match; if that finds nothing, retries with the
+    trigram match (substring on SQLite, word similarity on Postgres). Returns the
+    narrowed query and its row count.
+    """
+    match = await search_clause(session, q)
+    searched = query.where(match) if match is not None else query
+    total = await count_leads(session, searched)
+    if total == 0:
+        fuzzy = await search_clause(session, q, fuzzy=True)
+        if fuzzy is not None:
+            searched = query.where(fuzzy)
+            total = await count_leads(session, searched)
+    return searched, total
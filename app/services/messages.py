@@ -0,0 +1,182 @@
+"""Service helpers for student/counselor messaging.
+
+Message writes also maintain the `conversations` summary row for the
+student (last_message_at, total_messages, unread_from_student), so the
+admin inbox is an indexed top-N read instead of a GROUP BY over messages.
+"""
+from typing import Optional
+
+from sqlalchemy import case, false, func, literal_column, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models.student import Conversation, Message, Student
+from app.utils.pagination import PageParams, apply_keyset, finish_page, like_pattern
+
+
+# Rendered as literals (not bind parameters) so the planner can match the
+# partial index ix_messages_unread_from_student.
+UNREAD_FROM_STUDENT = (
+    (Message.sender_type == literal_column("'student'")) & (Message.is_read == false())
+)
+
+
+async def count_unread_from_students(session: AsyncSession) -> int:
+    """COUNT of unread student messages, served from the partial index."""
+    result = await session.execute(
+        select(func.count()).select_from(Message).where(UNREAD_FROM_STUDENT)
+    )
+    return int(result.scalar() or 0)
+
+
+async def record_message(session: AsyncSession, message: Message) -> None:
+    """
+    Upsert the conversation summary for a newly added message.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    unread = 1 if message.sender_type == "student" else 0
+    statement = dialect_insert(session, Conversation.__table__).values(
+        student_id=message.student_id,
+        last_message_at=message.created_at,
+        total_messages=1,
+        unread_from_student=unread,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[Conversation.__table__.c.student_id],
+        set_={
+            "last_message_at": statement.excluded.last_message_at,
+            "total_messages": Conversation.__table__.c.total_messages + 1,
+            "unread_from_student": Conversation.__table__.c.unread_from_student + unread,
+        },
+    )
+    await session.execute(statement)
+
+
+async def mark_message_read(session: AsyncSession, message: Message) -> None:
+    """Mark a single message read, keeping the conversation unread counter in step."""
+    if message.is_read:
+        return
+    message.is_read = True
+    if message.sender_type == "student":
+        await _decrement_unread(session, message.student_id, 1)
+    await session.commit()
+    await session.refresh(message)
+
+
+async def mark_messages_read(
+    session: AsyncSession,
+    student_id: int,
+    *,
+    from_student: bool,
+    up_to_id: Optional[int] = None,
+) -> int:
+    """
+    Mark a student's unread messages as read with one set-based UPDATE.
+
+    Args:
+        session: Database session
+        student_id: Conversation owner
+        from_student: True marks messages the student sent (admin reading),
+            False marks counselor/AI messages (student reading)
+        up_to_id: Only mark messages with id <= up_to_id
+
+    Returns:
+        Number of rows updated
+    """
+    statement = update(Message).where(
+        Message.student_id == student_id,
+        Message.is_read == False,
+    )
+    if from_student:
+        statement = statement.where(Message.sender_type == "student")
+    else:
+        statement = statement.where(Message.sender_type != "student")
+    if up_to_id is not None:
+        statement = statement.where(Message.id <= up_to_id)
+
+    result = await session.execute(
+        statement.values(is_read=True).execution_options(synchronize_session=False)
+    )
+    marked = result.rowcount or 0
+    if marked and from_student:
+        await _decrement_unread(session, student_id, marked)
+    await session.commit()
+    return marked
+
+
+async def list_conversations(
+    session: AsyncSession, params: PageParams
+) -> tuple[list, Optional[str]]:
+    """
+    Return one keyset page of conversation summaries and the next cursor.
+
+    Ordered by (last_message_at, student_id), newest first by default; q searches
+    the student's email and full name.
+    """
+    statement = (
+        select(
+            Conversation.student_id,
+            Student.email,
+            Student.full_name,
+            Conversation.total_messages,
+            Conversation.unread_from_student,
+            Conversation.last_message_at,
+        )
+        .join(Student, Student.id == Conversation.student_id)
+    )
+    if params.q:
+        pattern = like_pattern(params.q)
+        statement = statement.where(
+            or_(Student.email.ilike(pattern, escape="\\"), Student.full_name.ilike(pattern, escape="\\"))
+        )
+    statement = apply_keyset(statement, Conversation.last_message_at, Conversation.student_id, params)
+    rows = (await session.execute(statement)).all()
+    return finish_page(rows, params, lambda r: r.last_message_at, lambda r: r.student_id)
+
+
+async def rebuild_conversations(session: AsyncSession) -> int:
+    """
+    Recompute every conversation summary from the messages table.
+
+    Used to backfill databases created before the summary table existed.
+    Returns the number of conversations written.
+    """
+    summary = select(
+        Message.student_id,
+        func.max(Message.created_at),
+        func.count(Message.id),
+        func.sum(case(((Message.sender_type == "student") & (Message.is_read == False), 1), else_=0)),
+    ).group_by(Message.student_id)
+
+    table = Conversation.__table__
+    await session.execute(table.delete())
+    await session.execute(
+        table.insert().from_select(
+            ["student_id", "last_message_at", "total_messages", "unread_from_student"],
+            summary,
+        )
+    )
+    await session.commit()
+    total = (await session.execute(select(func.count()).select_from(Conversation))).scalar()
+    return int(total or 0)
+
+
+async def backfill_conversations_if_empty(session: AsyncSession) -> None:
+    """Rebuild the summary table only when it is empty but messages exist."""
+    has_summary = (await session.execute(select(Conversation.student_id).limit(1))).first()
+    if has_summary is not None:
+        return
+    has_messages = (await session.execute(select(Message.id).limit(1))).first()
+    if has_messages is not None:
+        await rebuild_conversations(session)
+
+
+async def _decrement_unread(session: AsyncSession, student_id: int, count: int) -> None:
+    column = Conversation.__table__.c.unread_from_student
+    await session.execute(
+        update(Conversation)
+        .where(Conversation.student_id == student_id)
+        .values(unread_from_student=case((column > count, column - count), else_=0))
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,283 @@
+"""Batched, write-behind writer for student timeline events.
+
+Route handlers `await timeline_writer.enqueue(...)` instead of adding a
+TimelineEvent to their own session. Events are buffered in-process and
+bulk-inserted (one executemany per batch) every `timeline_flush_interval`
+seconds, or sooner when the buffer reaches `timeline_batch_size`.
+
+- Durability: when TIMELINE_WAL_PATH is set, every event is written to a
+  per-process journal (app.utils.journal, off the event loop) before enqueue()
+  returns. Flushed events are acknowledged there and the rest are replayed on
+  start(), so events survive a process crash between enqueue and flush. If the
+  journal write fails, the event is inserted directly instead.
+- Backpressure: once `timeline_max_pending` events are buffered, enqueue()
+  waits for a flush; if the buffer is still full (the database is not keeping
+  up), the event is inserted directly. Events are never dropped silently.
+- Failures: if the database is unavailable the batch stays buffered for the
+  next flush; any other batch failure is retried event by event. An event whose
+  related document/application/... was deleted before the flush is written
+  with that reference cleared. Events that still fail are dead-lettered
+  (`<TIMELINE_WAL_PATH>.dead`, or logged without a WAL).
+- Shutdown: stop() cancels the background task and flushes whatever is left.
+
+Timeline reads are eventually consistent (by at most one flush interval).
+created_at is stamped at enqueue time, so ordering is preserved.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import insert, select
+
+from app.config import settings
+from app.models.student import TimelineEvent
+from app.utils.journal import Journal
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "student_id",
+    "event_type",
+    "category",
+    "title",
+    "description",
+    "related_document_id",
+    "related_application_id",
+    "related_visa_id",
+    "related_payment_id",
+    "related_message_id",
+    "created_at",
+)
+
+# related_*_id column -> the primary key column it references
+_RELATED = {
+    column.name: next(iter(column.foreign_keys)).column
+    for column in TimelineEvent.__table__.columns
+    if column.name.startswith("related_")
+}
+
+
+class TimelineWriter:
+    """In-process buffer that bulk-inserts timeline events in the background."""
+
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        batch_size: int = 200,
+        wal_path: Optional[str] = None,
+        max_pending: int = 10000,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.wal_path = wal_path
+        self.max_pending = max_pending
+        self._journal = Journal(wal_path) if wal_path else None
+        self._writing = 0
+        self._buffer: list[dict[str, Any]] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    async def enqueue(
+        self,
+        student_id: int,
+        event_type: str,
+        category: str,
+        title: str,
+        description: Optional[str] = None,
+        **related: Optional[int],
+    ) -> None:
+        """
+        Buffer a timeline event. Accepts the related_*_id columns as keyword arguments.
+
+        Returns once the event is journaled (with a WAL) or buffered; waits for a
+        flush, or inserts the event itself, when the buffer is full.
+        """
+        row = {col: None for col in _COLUMNS}
+        row.update(
+            student_id=student_id,
+            event_type=event_type,
+            category=category,
+            title=title[:255],
+            description=description,
+            created_at=datetime.utcnow(),
+        )
+        for key, value in related.items():
+            if key not in row or not key.startswith("related_"):
+                raise TypeError(f"Unknown timeline column: {key}")
+            row[key] = value
+
+        if len(self._buffer) + self._writing >= self.max_pending:
+            await self.flush()
+            if len(self._buffer) + self._writing >= self.max_pending:
+                logger.warning("Timeline buffer still full (%d events); inserting %s event for student %s directly",
+                               self.max_pending, event_type, student_id)
+                await self._write_through(row)
+                return
+        if self._journal is None:
+            self._accept([row])
+            return
+        self._writing += 1
+        try:
+            await self._journal.append([row], self._accept)
+        except Exception as exc:
+            logger.error("Timeline WAL write failed (%s); inserting %s event for student %s directly",
+                         exc, event_type, student_id)
+            await self._write_through(row)
+        finally:
+            self._writing -= 1
+
+    async def start(self) -> None:
+        """Replay the write-ahead file (if any) and start the background flusher."""
+        replayed = await asyncio.to_thread(self._journal.replay) if self._journal else []
+        if replayed:
+            logger.info("Replaying %d timeline events from %s", len(replayed), self.wal_path)
+            for row in replayed:
+                row["created_at"] = datetime.fromisoformat(row["created_at"])
+            self._buffer[:0] = replayed
+        self._ensure_started()
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write out everything still buffered."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        if self._journal is not None:
+            await self._journal.close()
+
+    async def flush(self) -> int:
+        """Insert all buffered events in one executemany. Returns the number written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, []
+            # Imported lazily so the writer does not pin the engine at import time.
+            from app.database import is_transient_error
+
+            try:
+                await self._insert(batch)
+                done = len(batch)
+            except Exception as exc:
+                if is_transient_error(exc):
+                    # Keep the events (and the WAL) so the next flush retries them.
+                    logger.error("Timeline flush of %d events failed: %s", len(batch), exc)
+                    done = 0
+                else:
+                    logger.warning("Timeline batch of %d events failed (%s); retrying one by one", len(batch), exc)
+                    done = await self._insert_one_by_one(batch)
+            self._buffer[:0] = batch[done:]
+            if self._journal is not None:
+                self._journal.ack(done)
+            return done
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        from app.database import async_session_maker
+
+        async with async_session_maker() as session:
+            await session.execute(insert(TimelineEvent.__table__), rows)
+            await session.commit()
+
+    async def _insert_one_by_one(self, batch: list[dict[str, Any]]) -> int:
+        """
+        Insert each event alone after a batch failure; events that still fail are
+        dead-lettered. Stops at the first transient failure.
+
+        Returns:
+            Number of leading events handled (written or dead-lettered)
+        """
+        from app.database import is_transient_error
+
+        done = 0
+        for row in batch:
+            try:
+                await self._insert_clearing_missing(row)
+            except Exception as exc:
+                if is_transient_error(exc):
+                    logger.error("Timeline retry stopped: %s", exc)
+                    break
+                logger.error("Dropping timeline event %s for student %s: %s", row["event_type"], row["student_id"], exc)
+                if self._journal is not None:
+                    self._journal.dead_letter([row], str(exc))
+            done += 1
+        return done
+
+    async def _insert_clearing_missing(self, row: dict[str, Any]) -> None:
+        """
+        Insert one event. If that fails and some related row no longer exists
+        (e.g. the document was deleted before the flush), clear those references
+        and insert again.
+        """
+        from app.database import async_session_maker, is_transient_error
+
+        try:
+            await self._insert([row])
+            return
+        except Exception as exc:
+            if is_transient_error(exc):
+                raise
+            failure = exc
+        missing = []
+        async with async_session_maker() as session:
+            for name, target in _RELATED.items():
+                if row[name] is not None and await session.scalar(select(target).where(target == row[name])) is None:
+                    missing.append(name)
+        if not missing:
+            raise failure
+        logger.info("Timeline event %s for student %s: cleared deleted %s",
+                    row["event_type"], row["student_id"], ", ".join(missing))
+        for name in missing:
+            row[name] = None
+        await self._insert([row])
+
+    async def _write_through(self, row: dict[str, Any]) -> None:
+        """Insert an event that could not be buffered; dead-letter it if even that fails."""
+        if await self._insert_one_by_one([row]) == 0:
+            logger.error("Dropping timeline event %s for student %s: database unavailable",
+                         row["event_type"], row["student_id"])
+            if self._journal is not None:
+                self._journal.dead_letter([row], "database unavailable")
+
+    def pending(self) -> int:
+        """Number of events waiting to be flushed."""
+        return len(self._buffer)
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def _accept(self, rows: list[dict[str, Any]]) -> None:
+        self._buffer.extend(rows)
+        self._ensure_started()
+        if len(self._buffer) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+
+timeline_writer = TimelineWriter(
+    flush_interval=settings.timeline_flush_interval,
+    batch_size=settings.timeline_batch_size,
+    wal_path=settings.timeline_wal_path,
+    max_pending=settings.timeline_max_pending,
+)
@@ -1,4 +1,4 @@
-from app.utils.validation import validate_lead_data
+from app.utils.validation import normalize_name, validate_lead_data
 
-__all__ = ["validate_lead_data"]
+__all__ = ["normalize_name", "validate_lead_data"]
 
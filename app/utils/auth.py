@@ -1,7 +1,8 @@
+import asyncio
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from email_validator import EmailNotValidError, validate_email
-from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +11,7 @@ from app.config import settings
 from app.models.user import User, Admin, PendingApprovalUser
 from app.models.student import Student
 from app.database import get_session
+from app.utils.metrics import Gauge
 
 security = HTTPBearer()
 
@@ -23,8 +25,43 @@ def verify_password(password: str, hash: str) -> bool:
     """Verify a password against its hash."""
     return bcrypt.checkpw(password.encode(), hash.encode())
 
+# bcrypt is deliberately slow; request handlers run it on this small pool (it releases
+# the GIL) so a burst of logins queues here instead of blocking the event loop.
+_bcrypt_pool = ThreadPoolExecutor(max_workers=settings.bcrypt_pool_size, thread_name_prefix="bcrypt")
+_bcrypt_jobs = 0  # submitted and not yet finished
+
+
+async def _run_bcrypt(fn, *args):
+    global _bcrypt_jobs
+    _bcrypt_jobs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, fn, *args)
+    finally:
+        _bcrypt_jobs -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt pool, for async request handlers."""
+    return await _run_bcrypt(hash_password, password)
+
+
+async def verify_password_async(password: str, hash: str) -> bool:
+    """verify_password on the bcrypt pool, for async request handlers."""
+    return await _run_bcrypt(verify_password, password, hash)
+
+
+Gauge("bcrypt_pool_in_flight", "Password hash/verify jobs running or queued", lambda: _bcrypt_jobs)
+Gauge(
+    "bcrypt_pool_queue_depth",
+    "Password hash/verify jobs waiting for a bcrypt worker",
+    lambda: max(0, _bcrypt_jobs - settings.bcrypt_pool_size),
+)
+
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """Create a JWT access token."""
+    # python-jose pulls in cryptography (~60 ms); import it on first use, not at worker start
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -37,6 +74,8 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
 
 def decode_access_token(token: str) -> dict | None:
     """Decode and verify JWT token."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
         return payload
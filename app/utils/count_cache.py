@@ -1,32 +1,53 @@
 """
 TTL in-memory cache for count endpoints to reduce repeated DB queries from polling.
 
-- get_cached(key, fetcher, ttl): return cached value if fresh, else await fetcher(), store, return.
+- get_cached(key, fetcher, ttl): return cached value if fresh, else await fetcher, store, return.
+  fetcher is a coroutine or a zero-argument callable returning one; a callable is
+  only called on a miss.
 - invalidate(key): clear cache so the next request hits the DB.
 
-Cache is process-local. For multi-worker deployments, consider Redis or similar.
+Hits, misses and evictions (expired or invalidated entries) are counted per key
+in /metrics. Cache is process-local. For multi-worker deployments, consider Redis or similar.
 Mutations (approve, reject, signup, create_lead, status change) must call invalidate()
 so clients see updates without waiting for TTL.
 """
+import inspect
 import time
-from typing import Any, Awaitable, TypeVar
+from typing import Any, Awaitable, Callable, TypeVar, Union
+
+from app.utils.metrics import Counter
 
 T = TypeVar("T")
 
+cache_requests = Counter("count_cache_requests_total", "count_cache lookups", labelnames=("key", "result"))
+cache_evictions = Counter("count_cache_evictions_total", "count_cache entries dropped", labelnames=("key", "reason"))
+
 _cache: dict[str, tuple[float, Any]] = {}
 _DEFAULT_TTL = 5
 
 
-async def get_cached(key: str, fetcher: Awaitable[T], ttl: float = _DEFAULT_TTL) -> T:
+async def get_cached(
+    key: str,
+    fetcher: Union[Awaitable[T], Callable[[], Awaitable[T]]],
+    ttl: float = _DEFAULT_TTL,
+) -> T:
     now = time.monotonic()
     if key in _cache:
         ts, val = _cache[key]
         if now - ts < ttl:
+            cache_requests.inc(key=key, result="hit")
+            if inspect.iscoroutine(fetcher):
+                fetcher.close()  # never awaited on a hit; avoid the RuntimeWarning
             return val
+        cache_evictions.inc(key=key, reason="expired")
+    cache_requests.inc(key=key, result="miss")
+    if callable(fetcher):
+        fetcher = fetcher()
     val = await fetcher
     _cache[key] = (now, val)
     return val
 
 
 def invalidate(key: str) -> None:
-    _cache.pop(key, None)
+    if _cache.pop(key, None) is not None:
+        cache_evictions.inc(key=key, reason="invalidated")
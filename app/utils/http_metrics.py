@@ -0,0 +1,61 @@
+"""
+Request-level metrics for GET /metrics.
+
+HTTPMetricsMiddleware is a plain ASGI middleware (no per-request task or
+Request object) that records:
+- http_request_duration_seconds{method, route, status}: until the last body
+  chunk is sent, so streamed exports are timed in full
+- http_requests_in_flight: requests currently being served
+
+route is the matched route template (/api/v1/leads/{lead_id}), so label
+cardinality stays bounded; unmatched paths share "unmatched".
+"""
+import time
+
+from app.utils.metrics import Counter, Gauge, Histogram
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    labelnames=("method", "route", "status"),
+)
+document_bytes_served = Counter(
+    "document_bytes_served_total",
+    "Stored document bytes returned by download endpoints",
+    labelnames=("audience",),
+)
+
+_in_flight = 0
+Gauge("http_requests_in_flight", "HTTP requests currently being served", lambda: _in_flight)
+
+
+class HTTPMetricsMiddleware:
+    """ASGI middleware: per-route latency histogram and in-flight gauge."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _in_flight
+        _in_flight += 1
+        start = time.perf_counter()
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _in_flight -= 1
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            http_request_duration.observe(
+                time.perf_counter() - start, method=scope.get("method", ""), route=route, status=status
+            )
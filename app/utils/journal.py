@@ -0,0 +1,303 @@
+"""
+Per-process, segmented append-only journal (JSON lines) for write-behind queues.
+
+Used by the lead intake queue and the timeline writer to make buffered rows
+survive a restart:
+
+- Files: entries go to `<path>.<pid>.<seq>` segments, so workers sharing one
+  configured path never write, truncate or replay each other's files. A segment
+  is deleted once every entry in it is acknowledged; `<path>.<pid>.ack` records
+  how far into the remaining segments consumers have got, so a restart does not
+  replay rows that were already written. No file is ever rewritten.
+- I/O: a single writer thread does all file work. Appends that arrive while it
+  is busy are written together and share one fsync (group commit), and the
+  event loop never blocks on disk.
+- Recovery: replay() adopts the segments of this pid and of processes that are
+  no longer running (claimed by atomic rename, so concurrent workers cannot
+  both take them), plus a legacy single-file `<path>`.
+- Dead letters: rows a consumer gives up on are appended to `<path>.dead`.
+
+Usage:
+    journal = Journal("lead_intake.log")
+    entries = await asyncio.to_thread(journal.replay)   # once, before appending
+    await journal.append([entry], on_durable=buffer.extend)
+    journal.ack(len(written))                           # oldest entries first
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_running(pid: int) -> bool:
+    if os.name != "posix":
+        # No cheap liveness probe; leave other processes' files alone.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _dumps(entry: dict[str, Any]) -> str:
+    return json.dumps(entry, default=datetime.isoformat) + "\n"
+
+
+class Journal:
+    """Append-only journal with acknowledgement, written by one background thread."""
+
+    def __init__(self, path: str, segment_entries: int = 10000):
+        self.path = path
+        self.segment_entries = segment_entries
+        self._dir, self._name = os.path.split(os.path.abspath(path))
+        self._pid: Optional[int] = None
+        self._seq = 0
+        # [file name, entries written, entries acknowledged], oldest first; the last is active
+        self._segments: deque[list] = deque()
+        self._file = None
+        self._ops: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    # Event-loop side
+
+    def replay(self) -> list[dict[str, Any]]:
+        """
+        Adopt leftover segments and return their unacknowledged entries, oldest first.
+
+        Blocking; call once (e.g. via asyncio.to_thread) before the first append.
+        """
+        self._pid = os.getpid()
+        pattern = re.compile(rf"^{re.escape(self._name)}\.(\d+)\.(\d+|ack)$")
+        owned: dict[int, list[tuple[int, str]]] = {}
+        for name in os.listdir(self._dir or "."):
+            match = pattern.match(name)
+            if match and match.group(2) != "ack":
+                owned.setdefault(int(match.group(1)), []).append((int(match.group(2)), name))
+
+        mine = sorted(owned.pop(self._pid, []))
+        self._seq = mine[-1][0] + 1 if mine else 0
+        names = [name for _, name in mine]
+        acked = self._load_checkpoint(self._pid)
+        for pid, segments in sorted(owned.items()):
+            if _pid_running(pid):
+                continue
+            their_acked = self._load_checkpoint(pid)
+            for _, name in sorted(segments):
+                claimed = self._claim(name)
+                if claimed:
+                    names.append(claimed)
+                    acked[claimed] = their_acked.get(name, 0)
+            self._remove(f"{self._name}.{pid}.ack")
+        if os.path.exists(os.path.join(self._dir, self._name)):
+            claimed = self._claim(self._name)
+            if claimed:
+                names.append(claimed)
+
+        entries: list[dict[str, Any]] = []
+        for name in names:
+            rows = self._read(name)
+            skip = min(acked.get(name, 0), len(rows))
+            if skip == len(rows):
+                self._remove(name)
+                continue
+            self._segments.append([name, len(rows), skip])
+            entries.extend(rows[skip:])
+        self._write_checkpoint()
+        return entries
+
+    def append(self, entries: list[dict[str, Any]], on_durable: Callable[[list], None]) -> asyncio.Future:
+        """
+        Queue entries for writing; must be called from the event loop.
+
+        on_durable(entries) runs on the loop once they are fsynced, in append order
+        and before the returned future resolves. If the write fails, on_durable is
+        not called and the future raises the OSError.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._submit("append", (entries, loop, future, on_durable))
+        return future
+
+    def ack(self, count: int) -> None:
+        """Mark the oldest `count` durable entries as consumed."""
+        if count:
+            self._submit("ack", count)
+
+    def dead_letter(self, entries: list[dict[str, Any]], reason: str) -> None:
+        """Append entries a consumer gave up on to `<path>.dead`."""
+        self._submit("dead", (entries, reason, datetime.utcnow()))
+
+    async def close(self) -> None:
+        """Finish queued work and stop the writer thread."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._ops.put(("stop", None))
+            await asyncio.to_thread(thread.join)
+
+    def _submit(self, op: str, arg: Any) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            if self._pid is None:
+                self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=f"journal:{self._name}", daemon=True)
+            self._thread.start()
+        self._ops.put((op, arg))
+
+    # Writer thread
+
+    def _run(self) -> None:
+        while True:
+            ops = [self._ops.get()]
+            while True:
+                try:
+                    ops.append(self._ops.get_nowait())
+                except queue.Empty:
+                    break
+            written = []
+            stop = False
+            for op, arg in ops:
+                try:
+                    if op == "append":
+                        self._write(arg[0])
+                        written.append((arg, None))
+                    elif op == "ack":
+                        self._ack(arg)
+                    elif op == "dead":
+                        self._write_dead(*arg)
+                    elif op == "stop":
+                        stop = True
+                except Exception as exc:
+                    logger.error("Journal %s: %s failed: %s", self.path, op, exc)
+                    if op == "append":
+                        written.append((arg, exc))
+                        self._close_active()
+            if self._file is not None and any(exc is None for _, exc in written):
+                try:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except OSError as exc:
+                    logger.error("Journal %s: fsync failed: %s", self.path, exc)
+                    written = [(arg, exc) for arg, _ in written]
+                    self._close_active()
+            for (entries, loop, future, on_durable), exc in written:
+                try:
+                    loop.call_soon_threadsafe(self._settle, entries, future, on_durable, exc)
+                except RuntimeError:
+                    pass  # the loop has closed; nobody is waiting
+            if stop:
+                self._close_active()
+                return
+
+    @staticmethod
+    def _settle(entries, future, on_durable, exc) -> None:
+        if exc is None:
+            on_durable(entries)
+        if future.done():
+            return
+        if exc is None:
+            future.set_result(None)
+        else:
+            future.set_exception(exc)
+
+    def _write(self, entries: list[dict[str, Any]]) -> None:
+        if self._file is None or self._segments[-1][1] >= self.segment_entries:
+            self._close_active()
+            name = self._segment_name(self._seq)
+            self._seq += 1
+            self._file = open(os.path.join(self._dir, name), "a", encoding="utf-8")
+            self._segments.append([name, 0, 0])
+        self._file.write("".join(_dumps(entry) for entry in entries))
+        self._segments[-1][1] += len(entries)
+
+    def _ack(self, count: int) -> None:
+        while self._segments:
+            segment = self._segments[0]
+            take = min(count, segment[1] - segment[2])
+            segment[2] += take
+            count -= take
+            if segment[2] < segment[1]:
+                break
+            if len(self._segments) == 1 and self._file is not None:
+                self._close_active()
+            self._segments.popleft()
+            self._remove(segment[0])
+        self._write_checkpoint()
+
+    def _write_dead(self, entries: list[dict[str, Any]], reason: str, at: datetime) -> None:
+        with open(f"{self.path}.dead", "a", encoding="utf-8") as f:
+            f.write("".join(_dumps({"at": at, "reason": reason, "entry": entry}) for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _close_active(self) -> None:
+        file, self._file = self._file, None
+        if file is None:
+            return
+        try:
+            file.flush()
+            os.fsync(file.fileno())
+            file.close()
+        except OSError as exc:
+            logger.error("Journal %s: closing segment failed: %s", self.path, exc)
+
+    # Files
+
+    def _segment_name(self, seq: int) -> str:
+        return f"{self._name}.{self._pid}.{seq:06d}"
+
+    def _claim(self, name: str) -> Optional[str]:
+        """Rename another owner's segment to this process's next segment name."""
+        claimed = self._segment_name(self._seq)
+        try:
+            os.rename(os.path.join(self._dir, name), os.path.join(self._dir, claimed))
+        except FileNotFoundError:
+            return None  # another worker claimed it first
+        self._seq += 1
+        return claimed
+
+    def _read(self, name: str) -> list[dict[str, Any]]:
+        rows = []
+        with open(os.path.join(self._dir, name), encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write; drop it.
+                    continue
+        return rows
+
+    def _load_checkpoint(self, pid: int) -> dict[str, int]:
+        try:
+            with open(os.path.join(self._dir, f"{self._name}.{pid}.ack"), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_checkpoint(self) -> None:
+        path = os.path.join(self._dir, f"{self._name}.{self._pid}.ack")
+        acked = {name: done for name, _, done in self._segments if done}
+        if not acked:
+            self._remove(os.path.basename(path))
+            return
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(acked, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _remove(self, name: str) -> None:
+        try:
+            os.remove(os.path.join(self._dir, name))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,114 @@
+"""
+Keyset (cursor) pagination shared by the admin listing endpoints.
+
+- page_params: FastAPI dependency for limit / cursor / order / q query params.
+- apply_keyset(statement, sort_expr, id_column, params): adds the cursor filter,
+  a stable ORDER BY (sort_expr, id) and LIMIT limit+1.
+- finish_page(rows, params, sort_value, row_id): trims the extra row and returns the
+  cursor for the next page (None on the last page).
+
+Endpoints return a JSON list holding one page (DEFAULT_PAGE_SIZE items unless
+?limit= says otherwise) and send the next cursor in the X-Next-Cursor response
+header; a client that ignores the header sees only the first page. Pass it back
+as ?cursor= to continue (the admin dashboard asks for the next page only when the
+user scrolls or clicks "Load more"). Cursors are opaque base64 JSON of (sort
+value, id), so each page is an index range scan regardless of how deep the
+client pages.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams(BaseModel):
+    """Normalized paging, sort direction and search parameters."""
+
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+    order: str = "desc"
+    q: Optional[str] = None
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    q: Optional[str] = Query(None, max_length=100, description="Case-insensitive search"),
+) -> PageParams:
+    search = q.strip() if q else None
+    return PageParams(limit=limit, cursor=cursor, order=order, q=search or None)
+
+
+def like_pattern(q: str) -> str:
+    """Escape LIKE wildcards in user input and wrap for a substring match."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        payload = {"t": "dt", "v": sort_value.isoformat(), "id": row_id}
+    else:
+        payload = {"t": "raw", "v": sort_value, "id": row_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload["v"]
+        if payload["t"] == "dt":
+            value = datetime.fromisoformat(value)
+        return value, int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def apply_keyset(statement, sort_expr, id_column, params: PageParams):
+    """Apply cursor filter, ORDER BY (sort_expr, id) and LIMIT limit+1."""
+    descending = params.order == "desc"
+    if params.cursor:
+        value, last_id = decode_cursor(params.cursor)
+        if descending:
+            after = or_(sort_expr < value, and_(sort_expr == value, id_column < last_id))
+        else:
+            after = or_(sort_expr > value, and_(sort_expr == value, id_column > last_id))
+        statement = statement.where(after)
+    if descending:
+        statement = statement.order_by(sort_expr.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(sort_expr.asc(), id_column.asc())
+    return statement.limit(params.limit + 1)
+
+
+def finish_page(
+    rows: list,
+    params: PageParams,
+    sort_value: Callable[[Any], Any],
+    row_id: Callable[[Any], int],
+) -> tuple[list, Optional[str]]:
+    """Drop the look-ahead row and build the next cursor from the last row kept."""
+    if len(rows) <= params.limit:
+        return rows, None
+    rows = rows[: params.limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_value(last), row_id(last))
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
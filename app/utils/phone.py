@@ -1,93 +1,203 @@
-"""Phone number normalization and spam detection."""
+"""Phone number normalization and spam detection.
+
+normalize_phone / is_spam_phone handle one number. normalize_phones handles a
+batch (e.g. a lead import): numbers are cleaned with precompiled patterns,
+deduplicated, looked up in an LRU cache of (number, region) results and, for
+large batches, the misses are fanned out to a process pool whose results are
+added to this process's cache.
+
+phonenumbers (and its per-region metadata) is imported on first use, so
+scripts that import this module only pay for it when they parse a number.
+"""
 import re
-from typing import Optional
-import phonenumbers
-from phonenumbers import NumberParseException
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional, Sequence, Union
+
+# Parsed (cleaned number, region) -> E.164 results kept per process
+PHONE_CACHE_SIZE = 65536
+# Below this many distinct numbers a process pool costs more than it saves
+PROCESS_POOL_THRESHOLD = 5000
+
+_NON_DIAL_RE = re.compile(r"[^\d+]")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+_REPEATED_DIGITS_RE = re.compile(r"(\d)\1{5,}")
+_TEST_NUMBER_RE = re.compile(r"555[-\s]?0\d{3}", re.IGNORECASE)
+
+# (cleaned number, region) -> E.164 or None, least recently used first
+_cache: OrderedDict[tuple[str, str], Optional[str]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class PhoneResult(NamedTuple):
+    """Batch result for one raw number."""
+
+    raw: str
+    e164: Optional[str]
+    is_spam: bool
+
+
+def _clean(phone: str) -> str:
+    # Remove all non-digit characters except +
+    cleaned = _NON_DIAL_RE.sub("", phone.strip())
+    # If no + and starts with 0, might be a local format
+    if not cleaned.startswith("+") and cleaned.startswith("0"):
+        cleaned = cleaned[1:]
+    return cleaned
+
+
+def _parse_e164(cleaned: str, region: str) -> Optional[str]:
+    import phonenumbers
+
+    try:
+        parsed = phonenumbers.parse(cleaned, region)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(parsed):
+        return None
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+
+def _cached(keys: Sequence[tuple[str, str]]) -> tuple[dict[tuple[str, str], Optional[str]], list[tuple[str, str]]]:
+    """Split keys into (cached results, misses), refreshing the hits."""
+    hits: dict[tuple[str, str], Optional[str]] = {}
+    misses: list[tuple[str, str]] = []
+    with _cache_lock:
+        for key in keys:
+            if key in _cache:
+                _cache.move_to_end(key)
+                hits[key] = _cache[key]
+            else:
+                misses.append(key)
+    return hits, misses
+
+
+def _remember(results: dict[tuple[str, str], Optional[str]]) -> None:
+    with _cache_lock:
+        _cache.update(results)
+        while len(_cache) > PHONE_CACHE_SIZE:
+            _cache.popitem(last=False)
 
 
 def normalize_phone(phone: str, default_region: str = "US") -> Optional[str]:
     """
     Normalize phone number to E.164 format.
-    
+
     Args:
         phone: Raw phone number string
         default_region: Default region code for parsing (ISO 3166-1 alpha-2)
-    
+
     Returns:
         Normalized phone number in E.164 format, or None if invalid
     """
     if not phone:
         return None
-    
-    # Remove all non-digit characters except +
-    cleaned = re.sub(r"[^\d+]", "", phone.strip())
-    
-    # If no + and starts with 0, might be a local format
-    if not cleaned.startswith("+") and cleaned.startswith("0"):
-        cleaned = cleaned[1:]
-    
-    try:
-        # Parse the phone number
-        parsed = phonenumbers.parse(cleaned, default_region)
-        
-        # Check if valid
-        if not phonenumbers.is_valid_number(parsed):
-            return None
-        
-        # Format as E.164
-        normalized = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        return normalized
-    
-    except NumberParseException:
-        return None
+    return _parse_chunk([(_clean(phone), default_region)])[0]
 
 
 def is_spam_phone(phone: str) -> bool:
     """
     Basic spam detection for phone numbers.
-    
+
     Detects:
     - Repeated digits (e.g., 1111111111)
     - Sequential digits (e.g., 1234567890)
     - Too short after normalization
-    
+
     Args:
         phone: Phone number string (can be raw or normalized)
-    
+
     Returns:
         True if phone appears to be spam
     """
     if not phone:
         return True
-    
+
     # Extract digits only for pattern checking
-    digits = re.sub(r"[^\d]", "", phone)
-    
+    digits = _NON_DIGIT_RE.sub("", phone)
+
     if len(digits) < 7:  # Too short
         return True
-    
+
     # Check for repeated digits (more than 6 consecutive same digits)
-    if re.search(r"(\d)\1{5,}", digits):
+    if _REPEATED_DIGITS_RE.search(digits):
         return True
-    
-    # Check for sequential digits (ascending or descending)
-    # Convert to list of integers
-    try:
-        digit_list = [int(d) for d in digits[-10:]]  # Check last 10 digits
-        if len(digit_list) >= 6:
-            # Check ascending sequence
-            is_ascending = all(digit_list[i] == digit_list[i-1] + 1 for i in range(1, len(digit_list)))
-            # Check descending sequence
-            is_descending = all(digit_list[i] == digit_list[i-1] - 1 for i in range(1, len(digit_list)))
-            
-            if is_ascending or is_descending:
-                return True
-    except (ValueError, IndexError):
-        pass
-    
+
+    # Check for sequential digits (ascending or descending) in the last 10 digits
+    digit_list = [ord(d) - 48 for d in digits[-10:]]
+    if len(digit_list) >= 6:
+        steps = {digit_list[i] - digit_list[i - 1] for i in range(1, len(digit_list))}
+        if steps == {1} or steps == {-1}:
+            return True
+
     # Check for obvious test numbers (e.g., 555-0100 pattern)
-    if re.search(r"555[-\s]?0\d{3}", phone, re.IGNORECASE):
+    if _TEST_NUMBER_RE.search(phone):
         return True
-    
+
     return False
 
+
+def _parse_chunk(pairs: list[tuple[str, str]]) -> list[Optional[str]]:
+    """Parse (cleaned number, region) pairs through the cache; also the process-pool worker."""
+    by_key, misses = _cached(pairs)
+    if misses:
+        parsed = {key: _parse_e164(*key) for key in misses}
+        _remember(parsed)
+        by_key.update(parsed)
+    return [by_key[key] for key in pairs]
+
+
+def normalize_phones(
+    phones: Sequence[Optional[str]],
+    regions: Union[str, Sequence[str]] = "US",
+    workers: Optional[int] = None,
+) -> list[PhoneResult]:
+    """
+    Normalize and spam-check a batch of phone numbers.
+
+    Args:
+        phones: Raw numbers (None/empty allowed)
+        regions: One default region for all numbers, or a region hint per number
+        workers: Process-pool size for batches with at least PROCESS_POOL_THRESHOLD
+            distinct uncached numbers; None or 1 parses in this process
+
+    Returns:
+        One PhoneResult per input, in order. e164 is None for invalid numbers;
+        is_spam is judged on the raw input, as is_spam_phone does.
+
+    CPU-bound: call from async code via run_in_threadpool.
+    """
+    if isinstance(regions, str):
+        region_list: Sequence[str] = [regions] * len(phones)
+    else:
+        if len(regions) != len(phones):
+            raise ValueError("regions must be a single region or one per phone number")
+        region_list = regions
+
+    keys: list[Optional[tuple[str, str]]] = [
+        (_clean(phone), region) if phone else None
+        for phone, region in zip(phones, region_list)
+    ]
+    unique = list(dict.fromkeys(key for key in keys if key is not None))
+    by_key, misses = _cached(unique)
+
+    if workers and workers > 1 and len(misses) >= PROCESS_POOL_THRESHOLD:
+        chunk_size = max(1, len(misses) // (workers * 4))
+        chunks = [misses[i:i + chunk_size] for i in range(0, len(misses), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = [e164 for chunk in pool.map(_parse_chunk, chunks) for e164 in chunk]
+        # The workers' caches die with the pool; keep their results here
+        _remember(dict(zip(misses, parsed)))
+        by_key.update(zip(misses, parsed))
+    else:
+        by_key.update(zip(misses, _parse_chunk(misses)))
+
+    return [
+        PhoneResult(
+            raw=phone or "",
+            e164=by_key[key] if key is not None else None,
+            is_spam=is_spam_phone(phone),
+        )
+        for phone, key in zip(phones, keys)
+    ]
@@ -0,0 +1,165 @@
+"""
+Per-request database query profiling.
+
+profile_engine() hooks an engine's cursor events to time every statement.
+QueryProfilerMiddleware gives each HTTP request its own tally (through a
+context variable, so background writers are not counted) and, per request:
+
+- adds a Server-Timing header: db;dur=<ms>;desc="<n> queries" (in development
+  also the slowest statement, readable in the browser's network panel)
+- records db_queries_per_request / db_seconds_per_request histograms by route,
+  served by GET /metrics
+- logs the slowest statements when the request spent more than
+  query_profile_slow_ms in the database
+- in development, warns when one statement ran query_n_plus_one_threshold or
+  more times (a likely N+1 loop)
+
+Statements are only counted once the request reaches them; for a streamed
+response the header reflects the queries run before the body started.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_KEPT = 3
+_STATEMENT_PREVIEW = 200
+
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "Database statements executed per HTTP request",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+    labelnames=("method", "route"),
+)
+db_seconds_per_request = Histogram(
+    "db_seconds_per_request",
+    "Time spent in database statements per HTTP request",
+    labelnames=("method", "route"),
+)
+
+
+class RequestQueries:
+    """Statement tally for one request."""
+
+    __slots__ = ("count", "seconds", "slowest", "repeats")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest: list[tuple[float, str]] = []
+        self.repeats: dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.repeats[statement] = self.repeats.get(statement, 0) + 1
+        if len(self.slowest) < SLOWEST_KEPT or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    """Tally of the request being served, or None outside a request."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    starts = conn.info.get("query_start")
+    if queries is None or not starts:
+        return
+    queries.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    connection = exception_context.connection
+    starts = connection.info.get("query_start") if connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def profile_engine(engine) -> None:
+    """Time every statement run on this (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def _preview(statement: str) -> str:
+    return " ".join(statement.split())[:_STATEMENT_PREVIEW]
+
+
+def _server_timing(queries: RequestQueries) -> str:
+    value = f'db;dur={queries.seconds * 1000:.1f};desc="{queries.count} queries"'
+    if settings.environment == "development" and queries.slowest:
+        seconds, statement = queries.slowest[0]
+        desc = _preview(statement)[:80].replace("\\", "").replace('"', "'")
+        value += f', db-slowest;dur={seconds * 1000:.1f};desc="{desc}"'
+    return value
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware: per-request query count, DB time, Server-Timing and N+1 warnings."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(queries).encode("latin-1", "replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._report(scope, queries)
+
+    def _report(self, scope, queries: RequestQueries) -> None:
+        route = scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        method = scope.get("method", "")
+        db_queries_per_request.observe(queries.count, method=method, route=route_path)
+        db_seconds_per_request.observe(queries.seconds, method=method, route=route_path)
+
+        if queries.count and queries.seconds * 1000 >= settings.query_profile_slow_ms:
+            logger.warning(
+                "%s %s spent %.1f ms in %d queries; slowest: %s",
+                method, route_path, queries.seconds * 1000, queries.count,
+                "; ".join(f"{seconds * 1000:.1f} ms {_preview(statement)}" for seconds, statement in queries.slowest),
+            )
+        if settings.environment == "development":
+            for statement, times in queries.repeats.items():
+                if times >= settings.query_n_plus_one_threshold:
+                    logger.warning(
+                        "Possible N+1 in %s %s: statement ran %d times: %s",
+                        method, route_path, times, _preview(statement),
+                    )
@@ -1,7 +1,17 @@
-"""Additional validation utilities."""
+"""Additional validation utilities.
+
+LeadCreate (app/schemas/lead.py) calls the same normalize_name and
+validate_email_format helpers, so a validated LeadCreate is already normalized
+and does not need validate_lead_data.
+"""
 from app.utils.email import validate_email_format
 
 
+def normalize_name(name: str) -> str:
+    """Strip and collapse internal whitespace to single spaces."""
+    return " ".join(name.split())
+
+
 def validate_lead_data(name: str, email: str) -> tuple[str, str]:
     """
     Validate and normalize lead data.
@@ -20,7 +30,7 @@ def validate_lead_data(name: str, email: str) -> tuple[str, str]:
     if not normalized_email:
         raise ValueError("Please enter a valid email address")
 
-    normalized_name = " ".join(name.strip().split())
+    normalized_name = normalize_name(name)
     if len(normalized_name) < 2:
         raise ValueError("Name must be at least 2 characters long")
 
@@ -0,0 +1,147 @@
+"""
+Startup profiler: what `import app.main` costs a new worker, and a budget check.
+
+- report (default): runs `python -X importtime -c "import app.main"` in a fresh
+  interpreter and prints the slowest modules by self and cumulative time, plus
+  the self time summed per top-level package (fastapi, sqlalchemy, app, ...)
+- --budget-ms: times `import app.main` over several fresh interpreters and exits
+  non-zero if the median exceeds the budget. Run it before merging a change
+  that adds imports, so a new eager import of a heavy dependency shows up
+  before it slows every scale-up. The framework (fastapi, sqlalchemy, sqlmodel,
+  pydantic-settings) is imported first and timed separately. It is a fixed
+  cost the app cannot defer, so only `import app.main` on top of it (models,
+  routes, services and what they pull in) is budgeted. Each run's app time is
+  scaled by REFERENCE_FRAMEWORK_MS / that run's framework time, which cancels
+  machine speed and load: on a shared 1-CPU container raw timings drift by
+  +-30% between minutes, enough to hide a 100-200 ms regression. The default
+  budget sits just above the median of the tree before the backlog of features
+  that added routes, services and the lazy imports.
+
+Uses DATABASE_URL etc. like the app (settings are read at import time).
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --top 40
+    python -m benchmarks.import_time --budget-ms --runs 9
+    python -m benchmarks.import_time --budget-ms 600
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Normalized app import, median over 42 runs on a 1-CPU container: ~470 ms for the
+# original tree, ~490 ms now (more routes); eager jose, seeders and both SQL dialects
+# measured ~600 ms
+IMPORT_BUDGET_MS = 530
+# Median framework import on that container; app times are scaled to it
+REFERENCE_FRAMEWORK_MS = 720
+
+# Imported and timed before app.main (see the module docstring)
+_FRAMEWORK = ("fastapi", "fastapi.routing", "sqlmodel", "sqlalchemy.ext.asyncio", "pydantic_settings")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_TIMED_IMPORT = f"""
+import importlib, time
+start = time.perf_counter()
+for name in {_FRAMEWORK!r}:
+    importlib.import_module(name)
+framework = time.perf_counter()
+import app.main
+done = time.perf_counter()
+print((framework - start) * 1000, (done - framework) * 1000)
+"""
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=_PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def profile_imports() -> list[tuple[str, int, int]]:
+    """
+    Per-module import times of a cold `import app.main`.
+
+    Returns:
+        (module, self µs, cumulative µs) in import order
+    """
+    stderr = _run(["-X", "importtime", "-c", "import app.main"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def cold_import_ms() -> tuple[float, float]:
+    """
+    Wall times in a fresh interpreter, in milliseconds.
+
+    Returns:
+        (framework import, `import app.main` on top of it)
+    """
+    framework_ms, app_ms = _run(["-c", _TIMED_IMPORT]).stdout.strip().splitlines()[-1].split()
+    return float(framework_ms), float(app_ms)
+
+
+def report(top: int) -> None:
+    rows = profile_imports()
+    total_us = max(cumulative for _, _, cumulative in rows)
+    print(f"import app.main: {total_us / 1000:.1f} ms, {len(rows)} modules\n")
+
+    print(f"Slowest {top} by self time (ms):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f}  {cumulative_us / 1000:8.1f} cum  {name}")
+
+    # Self time summed per top-level package, so nested imports are not counted twice
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print("\nBy top-level package (ms):")
+    for package, self_us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f}  {package}")
+
+
+def check_budget(budget_ms: float, runs: int) -> bool:
+    timings = [cold_import_ms() for _ in range(runs)]
+    samples = [app_ms * REFERENCE_FRAMEWORK_MS / framework_ms for framework_ms, app_ms in timings]
+    median = statistics.median(samples)
+    framework = statistics.median(framework_ms for framework_ms, _ in timings)
+    raw = statistics.median(app_ms for _, app_ms in timings)
+    print(f"Framework imports (not budgeted): median {framework:.1f} ms")
+    print(f"import app.main on top: median {raw:.1f} ms raw, {median:.1f} ms normalized over {runs} runs")
+    if median > budget_ms:
+        print(f"✗ Over budget ({budget_ms:.0f} ms); see `python -m benchmarks.import_time` for the culprits")
+        return False
+    print(f"✓ Within budget ({budget_ms:.0f} ms)")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup import profile and budget check")
+    parser.add_argument("--top", type=int, default=25, help="Rows per table in the report")
+    parser.add_argument(
+        "--budget-ms", type=float, nargs="?", const=IMPORT_BUDGET_MS,
+        help=f"Fail if the median normalized app import exceeds this (default {IMPORT_BUDGET_MS} ms)",
+    )
+    parser.add_argument("--runs", type=int, default=9, help="Fresh interpreters for the budget check")
+    args = parser.parse_args()
+
+    if args.budget_ms is None:
+        report(args.top)
+        return
+    sys.exit(0 if check_budget(args.budget_ms, args.runs) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: per-lead validation cost.
+
+Measures the validation pipeline used by POST /leads and bulk import:
+- single: LeadCreate.model_validate per payload (the public form)
+- chunk:  one TypeAdapter(list[LeadCreate]) call per chunk (bulk import)
+- values: LeadCreate validation plus building the insert row (lead_values)
+
+Each case reports the best of several repeats in microseconds per lead.
+
+Usage:
+    python -m benchmarks.lead_validation
+    python -m benchmarks.lead_validation --leads 50000 --repeat 5
+"""
+import argparse
+import time
+
+from app.schemas.lead import LeadCreate
+from app.services.lead_import import IMPORT_CHUNK_SIZE, _chunk_adapter
+from app.services.leads import lead_values
+
+
+def sample_payloads(count: int) -> list[dict]:
+    """Realistic raw payloads: untrimmed strings, mixed case, numeric strings from CSV."""
+    subjects = ["Computer Science", "Law", "Business", "Other"]
+    return [
+        {
+            "name": f"  Student   Number {i} ",
+            "email": f" Student.{i}@Example.COM ",
+            "country": " India ",
+            "target_country": "United Kingdom",
+            "intake": "Fall 2025 ",
+            "degree": "Master's" if i % 2 else "Bachelor's",
+            "subject": subjects[i % len(subjects)],
+            "subject_other": "Psychology",
+            "budget_min": str(10000 + i % 5000),
+            "budget_max": None,
+            "budget_currency": "gbp",
+            "source": " Partner ",
+        }
+        for i in range(count)
+    ]
+
+
+def _best_per_lead(fn, payloads: list[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payloads)
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads) * 1_000_000
+
+
+def run_single(payloads: list[dict]) -> None:
+    for payload in payloads:
+        LeadCreate.model_validate(payload)
+
+
+def run_chunk(payloads: list[dict]) -> None:
+    for start in range(0, len(payloads), IMPORT_CHUNK_SIZE):
+        _chunk_adapter.validate_python(payloads[start:start + IMPORT_CHUNK_SIZE])
+
+
+def run_values(payloads: list[dict]) -> None:
+    for payload in payloads:
+        lead_values(LeadCreate.model_validate(payload))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-lead validation cost")
+    parser.add_argument("--leads", type=int, default=20000, help="Payloads per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    payloads = sample_payloads(args.leads)
+    print(f"Validating {args.leads} leads, best of {args.repeat}:")
+    for label, fn in (("single", run_single), ("chunk", run_chunk), ("values", run_values)):
+        per_lead = _best_per_lead(fn, payloads, args.repeat)
+        print(f"  {label:<7} {per_lead:8.2f} µs/lead  ({1_000_000 / per_lead:,.0f} leads/s)")
+
+
+if __name__ == "__main__":
+    main()
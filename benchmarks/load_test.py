@@ -0,0 +1,337 @@
+"""
+Load test: concurrent requests against the main read and write endpoints.
+
+Seeds the database (DATABASE_URL, like the app) with synthetic data up to
+--seed-leads leads (see benchmarks/synthetic.py), then drives each scenario with
+--concurrency async clients:
+
+- post_lead:         POST /api/leads (unique emails per run)
+- list_leads:        GET /api/v1/leads, first page by score (admin)
+- lead_stats:        GET /api/v1/leads/stats (admin)
+- student_dashboard: GET /api/student/dashboard (a seeded student)
+- content:           GET /api/content
+- document_download: GET /api/student/documents/{id}/download
+
+By default the app runs in-process (httpx ASGI transport, startup and shutdown
+hooks included), so no server is needed; --base-url targets a running server
+that uses the same database and JWT secret instead.
+
+Leads posted by earlier runs are deleted first, so every run sees the same
+dataset. Reports p50/p95/p99 latency, throughput and errors per scenario, as the
+median of --repeat runs. --write-baseline saves them with a per-scenario
+tolerance of 1.5x the spread between those runs (clamped to 15-35%); --baseline
+compares against a saved file and exits 1 when any scenario has errors, a p99
+above the baseline by more than its tolerance, or throughput below it by more
+than its tolerance (--tolerance overrides them all). Baselines are only
+comparable on the same machine class, scale and seed:
+benchmarks/baselines/load_test.json was recorded on a 1-CPU container at the
+defaults, so record your own before comparing. Nothing runs this automatically.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --seed-leads 1000000 --concurrency 50 --requests 2000
+    python -m benchmarks.load_test --baseline benchmarks/baselines/load_test.json
+    python -m benchmarks.load_test --write-baseline benchmarks/baselines/load_test.json
+    python -m benchmarks.load_test --base-url http://localhost:8000 --scenarios list_leads,lead_stats
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import statistics
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy import delete, func, select
+
+from app.database import async_session_maker, engine
+from app.lead_options import CURRENCIES, DEGREES, SUBJECTS
+from app.migrations import migrate
+from app.models.lead import Lead
+from app.models.student import Document
+from app.models.user import Admin
+from app.utils.auth import create_access_token, hash_password
+from benchmarks.synthetic import BENCHMARK_PASSWORD, EMAIL_DOMAIN, generate
+
+BASELINE_VERSION = 2
+DEFAULT_TOLERANCE = 0.2
+MIN_TOLERANCE, MAX_TOLERANCE = 0.15, 0.35
+LOAD_TEST_SOURCE = "load-test"
+_POST_SUBJECTS = tuple(subject for subject in SUBJECTS if subject != "Other")
+
+
+class Context:
+    """Tokens and ids shared by the scenarios."""
+
+    def __init__(self, admin_headers: dict, student_headers: dict, document_id: int):
+        self.admin_headers = admin_headers
+        self.student_headers = student_headers
+        self.document_id = document_id
+        self.run_id = uuid.uuid4().hex[:8]
+        self.sequence = itertools.count()  # unique lead emails across warmups and repeats
+
+
+Scenario = Callable[[httpx.AsyncClient, Context, int], Awaitable[httpx.Response]]
+
+
+def _post_lead(client: httpx.AsyncClient, ctx: Context, i: int):
+    return client.post("/api/leads", json={
+        "name": f"Load Test {i}",
+        "email": f"load.{ctx.run_id}.{next(ctx.sequence)}@example.com",
+        "country": "India",
+        "target_country": "UK",
+        "intake": "Fall 2026",
+        "degree": DEGREES[i % len(DEGREES)],
+        "subject": _POST_SUBJECTS[i % len(_POST_SUBJECTS)],
+        "budget_min": 10000 + i % 20000,
+        "budget_currency": CURRENCIES[i % len(CURRENCIES)],
+        "source": LOAD_TEST_SOURCE,
+    })
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "post_lead": _post_lead,
+    "list_leads": lambda client, ctx, i: client.get(
+        "/api/v1/leads", params={"page": 1, "page_size": 50, "sort": "score"}, headers=ctx.admin_headers
+    ),
+    "lead_stats": lambda client, ctx, i: client.get("/api/v1/leads/stats", headers=ctx.admin_headers),
+    "student_dashboard": lambda client, ctx, i: client.get("/api/student/dashboard", headers=ctx.student_headers),
+    "content": lambda client, ctx, i: client.get("/api/content"),
+    "document_download": lambda client, ctx, i: client.get(
+        f"/api/student/documents/{ctx.document_id}/download", headers=ctx.student_headers
+    ),
+}
+
+
+async def seed(leads: int, seed_value: int) -> None:
+    """Migrate, then top the database up to `leads` leads."""
+    await migrate()
+    async with async_session_maker() as session:
+        existing = (await session.execute(
+            select(func.count()).select_from(Lead).where(Lead.source != LOAD_TEST_SOURCE)
+        )).scalar() or 0
+    if existing >= leads:
+        print(f"✓ {existing:,} leads already seeded")
+        return
+    print(f"Seeding {leads - existing:,} synthetic leads...")
+    started = time.perf_counter()
+    totals = await generate(engine, leads - existing, seed=seed_value)
+    print(f"✓ Seeded {', '.join(f'{count:,} {table}' for table, count in totals.items())} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+async def reset_posted_leads() -> None:
+    """Delete leads posted by earlier runs, so every run measures the same dataset."""
+    async with async_session_maker() as session:
+        removed = (await session.execute(delete(Lead).where(Lead.source == LOAD_TEST_SOURCE))).rowcount
+        await session.commit()
+    if removed:
+        print(f"✓ Removed {removed:,} leads posted by earlier runs")
+
+
+async def build_context() -> Context:
+    """Mint tokens for the first admin (created if none) and for a student who has a stored document."""
+    async with async_session_maker() as session:
+        admin_id = (await session.execute(select(Admin.id).order_by(Admin.id).limit(1))).scalar()
+        if admin_id is None:
+            admin = Admin(
+                email=f"benchmark-admin@{EMAIL_DOMAIN}",
+                full_name="Benchmark Admin",
+                password_hash=hash_password(BENCHMARK_PASSWORD),
+            )
+            session.add(admin)
+            await session.commit()
+            admin_id = admin.id
+        document = (await session.execute(
+            select(Document.id, Document.student_id)
+            .where(Document.file_content.is_not(None))
+            .order_by(Document.id)
+            .limit(1)
+        )).first()
+    if document is None:
+        raise SystemExit("No student documents to download; seed with --seed-leads first")
+
+    def headers(sub: int, role: str) -> dict:
+        return {"Authorization": "Bearer " + create_access_token({"sub": str(sub), "role": role})}
+
+    return Context(headers(admin_id, "admin"), headers(document.student_id, "lead"), document.id)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, ctx: Context, scenario: Scenario, requests: int, concurrency: int, warmup: int
+) -> dict:
+    """
+    Send `requests` requests from `concurrency` workers.
+
+    Returns:
+        p50_ms, p95_ms, p99_ms, rps and errors (non-2xx responses and transport failures)
+    """
+    for i in range(warmup):
+        await scenario(client, ctx, -1 - i)
+
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, ctx, i)
+                await response.aread()
+                ok = response.is_success
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "rps": round(requests / elapsed, 1),
+        "errors": errors,
+    }
+
+
+def summarize(runs: list[dict]) -> dict:
+    """
+    Median of each metric over repeated runs of one scenario.
+
+    Returns:
+        The medians, total errors, and spread: the largest (max - min) / median
+        of p99 and throughput across the runs
+    """
+    result = {key: statistics.median(run[key] for run in runs) for key in ("p50_ms", "p95_ms", "p99_ms", "rps")}
+    result["errors"] = sum(run["errors"] for run in runs)
+    result["spread"] = round(max(
+        (max(run[key] for run in runs) - min(run[key] for run in runs)) / result[key] if result[key] else 0.0
+        for key in ("p99_ms", "rps")
+    ), 3)
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: Optional[float] = None) -> list[str]:
+    """
+    Regressions against a baseline's scenarios, as readable lines.
+
+    Each scenario is allowed its own recorded tolerance unless `tolerance` is given.
+    """
+    failures = []
+    for name, result in results.items():
+        if result["errors"]:
+            failures.append(f"{name}: {result['errors']} errors")
+        expected = baseline["scenarios"].get(name)
+        if expected is None:
+            continue
+        allowed = tolerance if tolerance is not None else expected.get("tolerance", DEFAULT_TOLERANCE)
+        if result["p99_ms"] > expected["p99_ms"] * (1 + allowed):
+            failures.append(f"{name}: p99 {result['p99_ms']} ms > baseline {expected['p99_ms']} ms (+{allowed:.0%})")
+        if result["rps"] < expected["rps"] * (1 - allowed):
+            failures.append(f"{name}: {result['rps']} req/s < baseline {expected['rps']} req/s (-{allowed:.0%})")
+    return failures
+
+
+async def run(args) -> dict:
+    if args.seed_leads:
+        await seed(args.seed_leads, args.seed)
+    await reset_posted_leads()
+    ctx = await build_context()
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        startup = shutdown = None
+    else:
+        from app.main import app, shutdown_event, startup_event
+        # Slow-request warnings would interleave with the table; /metrics has the detail
+        logging.getLogger("app").setLevel(logging.ERROR)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=args.timeout
+        )
+        startup, shutdown = startup_event, shutdown_event
+
+    results = {}
+    if startup:
+        await startup()
+    try:
+        async with client:
+            print(f"\n{'scenario':<18} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7} {'spread':>7}")
+            for name in args.scenarios:
+                result = summarize([
+                    await run_scenario(client, ctx, SCENARIOS[name], args.requests, args.concurrency, args.warmup)
+                    for _ in range(args.repeat)
+                ])
+                results[name] = result
+                print(f"{name:<18} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                      f"{result['p99_ms']:>9.2f} {result['rps']:>9.1f} {result['errors']:>7} {result['spread']:>7.0%}")
+    finally:
+        if shutdown:
+            await shutdown()
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load test of the main endpoints")
+    parser.add_argument("--seed-leads", type=int, default=10000, help="Seed up to this many leads first (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the median is reported")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--baseline", help="Fail (exit 1) on regression against this baseline file")
+    parser.add_argument("--tolerance", type=float, help="Allowed p99/throughput drift for every scenario "
+                        "(0.2 = 20%%); default: each scenario's tolerance from the baseline")
+    parser.add_argument("--write-baseline", help="Save the results as a baseline file")
+    args = parser.parse_args()
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown or min(args.requests, args.concurrency, args.repeat) < 1:
+        parser.error(f"unknown scenarios {unknown}" if unknown else "--requests, --concurrency and --repeat must be at least 1")
+
+    params = {
+        "seed_leads": args.seed_leads, "seed": args.seed, "requests": args.requests,
+        "concurrency": args.concurrency, "repeat": args.repeat, "in_process": not args.base_url,
+    }
+    results = asyncio.run(run(args))
+
+    if args.write_baseline:
+        scenarios = {
+            name: dict(result, tolerance=round(min(MAX_TOLERANCE, max(MIN_TOLERANCE, 1.5 * result["spread"])), 2))
+            for name, result in results.items()
+        }
+        with open(args.write_baseline, "w") as f:
+            json.dump({"version": BASELINE_VERSION, "params": params, "scenarios": scenarios}, f, indent=2)
+            f.write("\n")
+        print(f"\n✓ Baseline written to {args.write_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("params") != params:
+            print(f"Note: baseline was recorded with {baseline.get('params')}")
+        failures = compare(results, baseline, args.tolerance)
+        if failures:
+            print("\n✗ Regressions against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print(f"\n✓ Within tolerance of baseline {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
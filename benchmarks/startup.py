@@ -0,0 +1,104 @@
+"""
+Benchmark: worker boot time.
+
+Each sample boots a fresh interpreter the way a new uvicorn worker does:
+import app.main, then run the startup hook. Two cases:
+- current: the schema_version row matches, so startup is one single-row read
+- stale:   the stamp is removed before every boot, so startup runs the full
+           migration (create_all, search index, backfills, seeding), which is
+           what every worker did before schema versioning
+
+Reports median and best in milliseconds for the import, the startup hook and
+the whole boot (process spawn to ready). Uses DATABASE_URL like the app; run it
+against a scratch database, since the stale case rewrites the stamp.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from sqlalchemy import delete
+
+from app.database import engine
+from app.migrations import migrate, schema_version
+
+_BOOT = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+
+async def boot():
+    await main.startup_event()
+    ready = time.perf_counter()
+    await main.shutdown_event()
+    return ready
+
+ready = asyncio.run(boot())
+print(json.dumps({"import": imported - start, "startup": ready - imported}))
+"""
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _prepare(stale: bool) -> None:
+    if stale:
+        async with engine.begin() as conn:
+            await conn.execute(delete(schema_version))
+    else:
+        await migrate()
+    await engine.dispose()
+
+
+def boot_once() -> dict[str, float]:
+    """Boot one worker process and return its timings in seconds."""
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", _BOOT],
+        cwd=_PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    total = time.perf_counter() - start
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings["boot"] = total
+    return timings
+
+
+def run_case(stale: bool, runs: int) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = {"import": [], "startup": [], "boot": []}
+    asyncio.run(_prepare(stale=False))
+    for _ in range(runs):
+        if stale:
+            asyncio.run(_prepare(stale=True))
+        for key, value in boot_once().items():
+            samples[key].append(value)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Worker boot time")
+    parser.add_argument("--runs", type=int, default=5, help="Boots per case")
+    args = parser.parse_args()
+
+    print(f"Booting app.main {args.runs} times per case (median / best, ms):")
+    for label, stale in (("current", False), ("stale", True)):
+        samples = run_case(stale, args.runs)
+        columns = "  ".join(
+            f"{key} {statistics.median(values) * 1000:7.1f} / {min(values) * 1000:7.1f}"
+            for key, values in samples.items()
+        )
+        print(f"  {label:<8} {columns}")
+
+
+if __name__ == "__main__":
+    main()
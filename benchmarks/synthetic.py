@@ -0,0 +1,598 @@
+"""
+Synthetic data for benchmarks and capacity testing: leads and, for a share of
+them, students with applications, visas, payments, messages, documents and
+timeline events.
+
+Rows are sampled column by column per chunk (random.Random.choices with k=n
+rather than one call per field per row; numpy is not a dependency) from
+generators seeded with (seed, table), and timestamps are relative to as_of
+(default: today's midnight UTC), so the same seed, counts and starting database
+produce the same data (bcrypt salts aside). Each chunk is built on a worker
+thread while the previous one is written: one bulk INSERT per table (COPY on
+Postgres) with explicit ids, so child rows reference parents without reading
+them back and memory stays flat from 10k to millions of leads.
+
+When a run at least doubles the leads table, secondary indexes on the generated
+tables and the SQLite search index are dropped for the load and rebuilt once at
+the end, which is several times cheaper than maintaining them row by row.
+
+- leads: name, email, countries, intake, degree/subject from lead_options,
+  budgets, source and status mixes, created_at over the last year, score
+- students: a share of the leads (student_ratio), password BENCHMARK_PASSWORD
+- applications: 3-6 distinct universities per student, status mix and dates
+- visas: at most one per student (visa_ratio), for the lead's target country
+- payments: 0..2*payments_per_student invoices, some paid, pending or overdue
+- messages: 0..2*messages_per_student per student, then conversation summaries
+- documents: 0..2*documents_per_student PDFs of document_kb each
+- timeline events for uploads, applications, visas, payments and student messages
+
+Usage:
+    python -m benchmarks.synthetic --leads 1000000 --seed 42
+    await generate(engine, leads=100_000, seed=42)  # see benchmarks/load_test.py
+"""
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from sqlalchemy import func, select, text
+
+from app.lead_options import CURRENCIES, DEGREES, SUBJECTS
+from app.models.lead import Lead
+from app.models.student import Application, Document, Message, Payment, Student, TimelineEvent, Visa
+from app.services.lead_scoring import score_lead
+from app.utils.auth import hash_password
+
+CHUNK_SIZE = 20000
+BENCHMARK_PASSWORD = "benchmark-password"
+EMAIL_DOMAIN = "example.com"  # reserved domain; never delivers
+
+# Parents before children, in insert order
+MODELS = (Lead, Student, Application, Visa, Payment, Message, Document, TimelineEvent)
+
+FIRST_NAMES = (
+    "Aarav", "Aisha", "Amelia", "Arjun", "Chen", "Diego", "Emma", "Fatima", "Hana", "Ibrahim",
+    "Isabella", "Ivan", "Jin", "Kavya", "Liam", "Lucia", "Mateo", "Mei", "Mohammed", "Nadia",
+    "Noah", "Olivia", "Priya", "Rahul", "Sara", "Sofia", "Tariq", "Wei", "Yusuf", "Zara",
+)
+LAST_NAMES = (
+    "Ahmed", "Ali", "Brown", "Chen", "Das", "Fernandez", "Garcia", "Gupta", "Haddad", "Ivanova",
+    "Khan", "Kim", "Kumar", "Lee", "Lopez", "Martin", "Mehta", "Nguyen", "Okafor", "Patel",
+    "Rossi", "Santos", "Sharma", "Silva", "Singh", "Smith", "Tanaka", "Wang", "Wilson", "Zhang",
+)
+# (value, weight) pairs; weights roughly follow the real inquiry mix
+COUNTRIES = (("India", 40), ("Nigeria", 10), ("Pakistan", 8), ("Bangladesh", 6), ("Nepal", 6),
+             ("UAE", 6), ("Vietnam", 5), ("Kenya", 5), ("Sri Lanka", 4), ("Ghana", 4), ("Egypt", 3), ("Brazil", 3))
+TARGET_COUNTRIES = (("UK", 30), ("USA", 25), ("Canada", 18), ("Australia", 12), ("Germany", 6),
+                    ("Ireland", 4), ("New Zealand", 3), ("Netherlands", 2))
+INTAKES = ("Fall 2025", "Spring 2026", "Fall 2026", "Winter 2026", "Summer 2026", "Fall 2027")
+SOURCES = (("website", 45), ("facebook", 15), ("instagram", 12), ("referral", 10), ("partner", 8),
+           ("google", 7), ("event", 3))
+STATUSES = (("new", 55), ("contacted", 20), ("qualified", 10), ("won", 5), ("lost", 10))
+BUDGET_STEPS = tuple(range(5000, 80001, 2500))
+DOCUMENT_TYPES = ("passport", "transcript", "recommendation", "sop", "cv", "ielts")
+DOCUMENT_STATUSES = (("pending", 50), ("approved", 35), ("rejected", 5), ("needs_revision", 10))
+MESSAGE_TEXTS = (
+    "Hi, I have uploaded my transcript. Could you take a look?",
+    "When is the application deadline for the Fall intake?",
+    "Thanks for the update, I will send the documents tomorrow.",
+    "Please review my statement of purpose when you get a chance.",
+    "Your passport copy has been approved.",
+    "We have shortlisted three universities for you, see the dashboard.",
+    "Your visa interview has been scheduled.",
+)
+# (university, program, country, degree level)
+UNIVERSITIES = (
+    ("Harvard University", "Computer Science", "USA", "Master's"),
+    ("MIT", "Data Science", "USA", "Master's"),
+    ("Stanford University", "Business Administration", "USA", "Master's"),
+    ("University of Toronto", "Engineering", "Canada", "Bachelor's"),
+    ("University of Cambridge", "Economics", "UK", "Master's"),
+    ("Oxford University", "Law", "UK", "Master's"),
+    ("University of Melbourne", "Medicine", "Australia", "PhD"),
+    ("University of British Columbia", "Psychology", "Canada", "Bachelor's"),
+    ("NYU", "Film Studies", "USA", "Master's"),
+    ("UC Berkeley", "Environmental Science", "USA", "Master's"),
+    ("Imperial College London", "Mechanical Engineering", "UK", "Master's"),
+    ("TU Munich", "Informatics", "Germany", "Master's"),
+    ("Trinity College Dublin", "Finance", "Ireland", "Master's"),
+    ("University of Auckland", "Architecture", "New Zealand", "Bachelor's"),
+)
+APPLICATION_STATUSES = (("draft", 15), ("submitted", 25), ("under_review", 25), ("accepted", 15),
+                        ("rejected", 10), ("deferred", 5), ("waitlisted", 5))
+APPLICATION_SUBMITTED = {"submitted", "under_review", "accepted"}
+APPLICATION_DECIDED = {"accepted", "rejected", "deferred", "waitlisted"}
+VISA_STATUSES = (("not_started", 20), ("documents_preparing", 25), ("submitted", 20),
+                 ("interview_scheduled", 15), ("approved", 15), ("rejected", 5))
+VISA_STAGES = {
+    "not_started": "not_started", "documents_preparing": "in_progress", "submitted": "submitted",
+    "interview_scheduled": "submitted", "approved": "approved", "rejected": "rejected",
+}
+PAYMENT_DESCRIPTIONS = ("Application fee", "Counselling service fee", "Visa processing fee", "SOP review")
+PAYMENT_STATUSES = (("paid", 60), ("pending", 25), ("overdue", 10), ("cancelled", 5))
+PAYMENT_AMOUNTS = tuple(range(50, 2001, 50))
+PAYMENT_METHODS = ("card", "bank_transfer", "upi")
+# executemany needs the same keys in every row
+TIMELINE_RELATED = {
+    "related_document_id": None, "related_application_id": None, "related_visa_id": None,
+    "related_payment_id": None, "related_message_id": None,
+}
+
+
+class Sampler:
+    """Column-wise sampling from one seeded generator."""
+
+    def __init__(self, seed: int, table: str):
+        self.rng = random.Random(f"{seed}:{table}")
+
+    def pick(self, values, n: int) -> list:
+        return self.rng.choices(values, k=n)
+
+    def weighted(self, pairs, n: int) -> list:
+        values, weights = zip(*pairs)
+        return self.rng.choices(values, weights=weights, k=n)
+
+    def counts(self, mean: float, n: int) -> list[int]:
+        """Per-row child counts, uniform over 0..2*mean."""
+        return self.rng.choices(range(int(2 * mean) + 1), k=n)
+
+    def chance(self, p: float, n: int) -> list[bool]:
+        random_ = self.rng.random
+        return [random_() < p for _ in range(n)]
+
+    def times(self, start: datetime, span: timedelta, n: int) -> list[datetime]:
+        seconds = span.total_seconds()
+        random_ = self.rng.random
+        return [start + timedelta(seconds=random_() * seconds) for _ in range(n)]
+
+
+async def _next_id(conn, model) -> int:
+    return ((await conn.execute(select(func.max(model.id)))).scalar() or 0) + 1
+
+
+async def _insert_rows(conn, model, rows: list[dict[str, Any]], batch_size: int) -> None:
+    """
+    Insert row dicts (all with the same keys) as positional tuples, skipping
+    SQLAlchemy's per-row parameter handling: COPY on Postgres, otherwise a plain
+    executemany with each column's bind processor applied.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    columns = list(rows[0])
+    if conn.dialect.name == "postgresql":
+        raw = await conn.get_raw_connection()
+        for start in range(0, len(rows), batch_size):
+            records = [tuple(row[name] for name in columns) for row in rows[start:start + batch_size]]
+            await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=columns)
+        return
+
+    quote = conn.dialect.identifier_preparer.quote
+    statement = (
+        f"INSERT INTO {quote(table.name)} ({', '.join(quote(name) for name in columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    processors = [
+        (name, table.c[name].type.dialect_impl(conn.dialect).bind_processor(conn.dialect)) for name in columns
+    ]
+    for start in range(0, len(rows), batch_size):
+        records = [
+            tuple(row[name] if process is None or row[name] is None else process(row[name]) for name, process in processors)
+            for row in rows[start:start + batch_size]
+        ]
+        await conn.exec_driver_sql(statement, records)
+
+
+async def _reset_sequences(conn, *models) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__tablename__
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+@asynccontextmanager
+async def deferred_indexes(engine, *models):
+    """
+    Drop the models' declared secondary indexes for a bulk load and recreate them
+    at the end. Primary keys stay; unique indexes are checked when recreated.
+    """
+    indexes = [index for model in models for index in model.__table__.indexes]
+    async with engine.begin() as conn:
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn, index=index: index.drop(sync_conn, checkfirst=True))
+    try:
+        yield
+    finally:
+        async with engine.begin() as conn:
+            for index in indexes:
+                await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+
+
+def _lead_rows(sampler: Sampler, first_id: int, n: int, now: datetime) -> list[dict[str, Any]]:
+    firsts = sampler.pick(FIRST_NAMES, n)
+    lasts = sampler.pick(LAST_NAMES, n)
+    budget_low = sampler.pick(BUDGET_STEPS, n)
+    budget_extra = sampler.pick((None, 0, 5000, 10000, 20000), n)
+    columns = zip(
+        range(first_id, first_id + n), firsts, lasts,
+        sampler.weighted(COUNTRIES, n), sampler.weighted(TARGET_COUNTRIES, n), sampler.pick(INTAKES, n),
+        sampler.pick(DEGREES, n), sampler.pick(SUBJECTS, n), budget_low, budget_extra,
+        sampler.pick(CURRENCIES, n), sampler.weighted(SOURCES, n), sampler.weighted(STATUSES, n),
+        sampler.times(now - timedelta(days=365), timedelta(days=365), n),
+    )
+    rows = []
+    rates = {"": 7.5}
+    for lead_id, first, last, country, target, intake, degree, subject, low, extra, currency, source, status, created in columns:
+        row = {
+            "id": lead_id,
+            "name": f"{first} {last}",
+            "email": f"{first}.{last}.{lead_id}@{EMAIL_DOMAIN}".lower(),
+            "country": country,
+            "target_country": target,
+            "intake": intake,
+            "degree": degree,
+            "subject": subject,
+            "budget_min": low,
+            "budget_max": None if extra is None else low + extra,
+            "budget_currency": currency,
+            "source": source,
+            "status": status,
+            "version": 0,
+            "created_at": created,
+        }
+        row["score"] = score_lead(row, rates, now)
+        rows.append(row)
+    return rows
+
+
+class ChunkBuilder:
+    """
+    Builds the rows for one chunk of leads and everything hanging off them.
+
+    Samplers and id counters carry over between chunks, so build() calls must
+    run one at a time and in order (they may run on a worker thread).
+    """
+
+    def __init__(self, seed: int, next_ids: dict, now: datetime, options: dict):
+        self.next_ids = next_ids
+        self.now = now
+        self.options = options
+        self.samplers = {model: Sampler(seed, model.__tablename__) for model in MODELS}
+        self.password_hash = hash_password(BENCHMARK_PASSWORD)
+        kb = options["document_kb"]
+        self.pdf = b"%PDF-1.4\n" + bytes(kb * 1024 - 9) if kb else b"%PDF-1.4\n"
+
+    def _take_id(self, model) -> int:
+        value = self.next_ids[model]
+        self.next_ids[model] = value + 1
+        return value
+
+    def build(self, n: int) -> dict:
+        """Rows per model for the next n leads."""
+        rows = {model: [] for model in MODELS}
+        rows[Lead] = _lead_rows(self.samplers[Lead], self.next_ids[Lead], n, self.now)
+        self.next_ids[Lead] += n
+
+        converted = self.samplers[Student].chance(self.options["student_ratio"], n)
+        for lead, is_student in zip(rows[Lead], converted):
+            if is_student:
+                self._student(lead, rows)
+        return rows
+
+    def _event(self, rows: dict, student_id: int, event_type: str, category: str, title: str,
+               description: Optional[str], created_at: datetime, **related) -> None:
+        rows[TimelineEvent].append({
+            "id": self._take_id(TimelineEvent), "student_id": student_id, "event_type": event_type,
+            "category": category, "title": title, "description": description, "created_at": created_at,
+            **TIMELINE_RELATED, **related,
+        })
+
+    def _student(self, lead: dict, rows: dict) -> None:
+        joined = lead["created_at"]
+        span = self.now - joined
+        student = {
+            "id": self._take_id(Student),
+            "lead_id": lead["id"],
+            "email": lead["email"],
+            "password_hash": self.password_hash,
+            "is_active": True,
+            "full_name": lead["name"],
+            "documents_completed": 0,
+            "documents_total": 0,
+            "applications_completed": 0,
+            "applications_total": 0,
+            "visa_stage": None,
+            "created_at": joined,
+        }
+        rows[Student].append(student)
+        self._applications(student, span, rows)
+        self._visa(student, lead["target_country"], span, rows)
+        self._payments(student, span, rows)
+        self._messages(student, span, rows)
+        self._documents(student, rows)
+
+    def _applications(self, student: dict, span: timedelta, rows: dict) -> None:
+        sampler = self.samplers[Application]
+        rng = sampler.rng
+        choices = rng.sample(UNIVERSITIES, rng.randint(3, 6))
+        statuses = sampler.weighted(APPLICATION_STATUSES, len(choices))
+        intakes = sampler.pick(INTAKES, len(choices))
+        scholarships = sampler.chance(0.3, len(choices))
+        created = sampler.times(student["created_at"], span, len(choices))
+        for (university, program, country, degree), status, intake, scholarship, created_at in zip(
+            choices, statuses, intakes, scholarships, created
+        ):
+            application_id = self._take_id(Application)
+            submitted_at = None
+            if status != "draft":
+                submitted_at = min(created_at + timedelta(days=rng.randint(1, 30)), self.now)
+            decided = submitted_at is not None and status in APPLICATION_DECIDED
+            rows[Application].append({
+                "id": application_id,
+                "student_id": student["id"],
+                "university_name": university,
+                "program_name": program,
+                "country": country,
+                "degree_level": degree,
+                "intake": intake,
+                "status": status,
+                "application_deadline": created_at + timedelta(days=rng.randint(30, 240)),
+                "submitted_at": submitted_at,
+                "decision_date": submitted_at + timedelta(days=rng.randint(14, 90)) if decided else None,
+                "scholarship_amount": float(rng.randrange(5000, 50001, 500)) if scholarship else None,
+                "scholarship_currency": rng.choice(CURRENCIES) if scholarship else None,
+                "created_at": created_at,
+            })
+            self._event(rows, student["id"], "application_created", "applications",
+                        f"Created application: {university}", f"Program: {program}", created_at,
+                        related_application_id=application_id)
+            if submitted_at:
+                self._event(rows, student["id"], "application_submit", "applications",
+                            f"Submitted application: {university}", f"Program: {program}", submitted_at,
+                            related_application_id=application_id)
+        student["applications_total"] = len(choices)
+        student["applications_completed"] = sum(status in APPLICATION_SUBMITTED for status in statuses)
+
+    def _visa(self, student: dict, country: str, span: timedelta, rows: dict) -> None:
+        sampler = self.samplers[Visa]
+        rng = sampler.rng
+        if rng.random() >= self.options["visa_ratio"]:
+            return
+        visa_id = self._take_id(Visa)
+        status = sampler.weighted(VISA_STATUSES, 1)[0]
+        created_at = sampler.times(student["created_at"], span, 1)[0]
+        submitted_at = interview_date = decision_date = None
+        if status in ("submitted", "interview_scheduled", "approved", "rejected"):
+            submitted_at = created_at + timedelta(days=rng.randint(7, 45))
+        if status in ("interview_scheduled", "approved", "rejected"):
+            interview_date = submitted_at + timedelta(days=rng.randint(7, 60))
+        if status in ("approved", "rejected"):
+            decision_date = interview_date + timedelta(days=rng.randint(7, 30))
+        rows[Visa].append({
+            "id": visa_id,
+            "student_id": student["id"],
+            "country": country,
+            "visa_type": "student",
+            "status": status,
+            "current_stage": status.replace("_", " ").capitalize(),
+            "application_submitted_at": submitted_at,
+            "interview_date": interview_date,
+            "decision_date": decision_date,
+            "estimated_processing_days": rng.choice((15, 30, 45, 60)),
+            "created_at": created_at,
+        })
+        student["visa_stage"] = VISA_STAGES[status]
+        self._event(rows, student["id"], "visa_created", "visa", f"Started visa application: {country}",
+                    "Visa type: student", created_at, related_visa_id=visa_id)
+
+    def _payments(self, student: dict, span: timedelta, rows: dict) -> None:
+        sampler = self.samplers[Payment]
+        rng = sampler.rng
+        count = sampler.counts(self.options["payments_per_student"], 1)[0]
+        columns = zip(
+            sampler.pick(PAYMENT_DESCRIPTIONS, count), sampler.weighted(PAYMENT_STATUSES, count),
+            sampler.pick(PAYMENT_AMOUNTS, count), sampler.pick(CURRENCIES, count),
+            sampler.times(student["created_at"], span, count),
+        )
+        for number, (description, status, amount, currency, created_at) in enumerate(columns, start=1):
+            payment_id = self._take_id(Payment)
+            due_date = created_at + timedelta(days=rng.randint(7, 60))
+            if status == "pending" and due_date < self.now:
+                status = "overdue"
+            paid_at = None
+            if status == "paid":
+                paid_at = min(created_at + timedelta(days=rng.randint(0, 20)), self.now)
+            rows[Payment].append({
+                "id": payment_id,
+                "student_id": student["id"],
+                "invoice_number": f"SYN-{payment_id:09d}",
+                "description": description,
+                "amount": float(amount),
+                "currency": currency,
+                "status": status,
+                "due_date": due_date,
+                "paid_at": paid_at,
+                "payment_method": rng.choice(PAYMENT_METHODS) if paid_at else None,
+                "is_installment": count > 1,
+                "installment_number": number if count > 1 else None,
+                "total_installments": count if count > 1 else None,
+                "created_at": created_at,
+            })
+            if paid_at:
+                self._event(rows, student["id"], "payment", "payments", f"Paid: {description}",
+                            f"{currency} {amount}", paid_at, related_payment_id=payment_id)
+
+    def _messages(self, student: dict, span: timedelta, rows: dict) -> None:
+        sampler = self.samplers[Message]
+        count = sampler.counts(self.options["messages_per_student"], 1)[0]
+        columns = zip(
+            sampler.pick(("student", "counselor"), count), sampler.pick(MESSAGE_TEXTS, count),
+            sampler.pick((True, True, False), count), sampler.times(student["created_at"], span, count),
+        )
+        for sender, body, is_read, sent in columns:
+            message_id = self._take_id(Message)
+            rows[Message].append({
+                "id": message_id, "student_id": student["id"], "sender_type": sender,
+                "content": body, "is_read": is_read, "created_at": sent,
+            })
+            if sender == "student":
+                self._event(rows, student["id"], "message", "communication", "Sent message", body[:100], sent,
+                            related_message_id=message_id)
+
+    def _documents(self, student: dict, rows: dict) -> None:
+        sampler = self.samplers[Document]
+        count = sampler.counts(self.options["documents_per_student"], 1)[0]
+        statuses = sampler.weighted(DOCUMENT_STATUSES, count)
+        joined = student["created_at"]
+        for document_type, status in zip(sampler.pick(DOCUMENT_TYPES, count), statuses):
+            document_id = self._take_id(Document)
+            rows[Document].append({
+                "id": document_id, "student_id": student["id"], "document_type": document_type,
+                "file_name": f"{document_type}.pdf", "file_content": self.pdf, "file_size": len(self.pdf),
+                "mime_type": "application/pdf", "status": status,
+                "uploaded_at": joined, "created_at": joined,
+            })
+            self._event(rows, student["id"], "document_upload", "documents", f"Uploaded {document_type}",
+                        f"File: {document_type}.pdf", joined, related_document_id=document_id)
+        student["documents_total"] = count
+        student["documents_completed"] = statuses.count("approved")
+
+
+async def generate(
+    engine,
+    leads: int,
+    seed: int = 0,
+    student_ratio: float = 0.02,
+    messages_per_student: float = 5,
+    documents_per_student: float = 2,
+    payments_per_student: float = 2,
+    visa_ratio: float = 0.6,
+    document_kb: int = 64,
+    chunk_size: int = CHUNK_SIZE,
+    as_of: Optional[datetime] = None,
+    progress: Optional[Callable[[str], None]] = print,
+) -> dict[str, int]:
+    """
+    Append synthetic rows to an existing schema.
+
+    Args:
+        engine: Async engine whose tables already exist (run migrations first)
+        leads: Number of leads to add
+        seed: Same seed, arguments and starting database give the same rows
+        student_ratio: Share of the new leads that become students
+        messages_per_student: Mean messages per new student
+        documents_per_student: Mean documents per new student
+        payments_per_student: Mean invoices per new student
+        visa_ratio: Share of new students with a visa application
+        document_kb: Size of each stored document
+        chunk_size: Leads per sampling pass and INSERT
+        as_of: End of the generated history (default: today's midnight UTC)
+
+    Returns:
+        Rows inserted per table
+    """
+    # Imported lazily so importing this module does not pin the app's engine.
+    from app.database import async_session_maker
+    from app.services.lead_search import deferred_search_sync
+    from app.services.messages import rebuild_conversations
+
+    report = progress or (lambda message: None)
+    totals = {model.__tablename__: 0 for model in MODELS}
+    started = time.perf_counter()
+
+    async with engine.begin() as conn:
+        next_ids = {model: await _next_id(conn, model) for model in MODELS}
+    as_of = as_of or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    builder = ChunkBuilder(seed, next_ids, as_of, {
+        "student_ratio": student_ratio,
+        "messages_per_student": messages_per_student,
+        "documents_per_student": documents_per_student,
+        "payments_per_student": payments_per_student,
+        "visa_ratio": visa_ratio,
+        "document_kb": document_kb,
+    })
+    sizes = [min(chunk_size, leads - offset) for offset in range(0, leads, chunk_size)]
+    loop = asyncio.get_running_loop()
+
+    async with AsyncExitStack() as stack:
+        if leads >= next_ids[Lead] - 1:
+            # The leads table at least doubles: rebuild indexes once at the end
+            await stack.enter_async_context(deferred_indexes(engine, *MODELS))
+            await stack.enter_async_context(deferred_search_sync())
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # The next chunk is built on the worker while this one is written
+            pending = loop.run_in_executor(pool, builder.build, sizes[0]) if sizes else None
+            for index in range(len(sizes)):
+                rows = await pending
+                if index + 1 < len(sizes):
+                    pending = loop.run_in_executor(pool, builder.build, sizes[index + 1])
+                async with engine.begin() as conn:
+                    for model in MODELS:
+                        # Large BLOBs: smaller statements keep driver buffers bounded
+                        size = max(1, min(chunk_size, 500)) if model is Document else chunk_size
+                        await _insert_rows(conn, model, rows[model], size)
+                for model in MODELS:
+                    totals[model.__tablename__] += len(rows[model])
+                report(f"  … {totals['leads']:,}/{leads:,} leads ({time.perf_counter() - started:.1f}s)")
+
+    async with engine.begin() as conn:
+        await _reset_sequences(conn, *MODELS)
+    if totals["messages"]:
+        async with async_session_maker() as session:
+            await rebuild_conversations(session)
+    return totals
+
+
+async def _main(args) -> None:
+    from app.database import engine
+    from app.migrations import migrate
+
+    await migrate()
+    print(f"Generating {args.leads:,} leads (seed {args.seed})...")
+    started = time.perf_counter()
+    totals = await generate(
+        engine,
+        args.leads,
+        seed=args.seed,
+        student_ratio=args.student_ratio,
+        messages_per_student=args.messages_per_student,
+        documents_per_student=args.documents_per_student,
+        payments_per_student=args.payments_per_student,
+        visa_ratio=args.visa_ratio,
+        document_kb=args.document_kb,
+        chunk_size=args.chunk_size,
+    )
+    elapsed = time.perf_counter() - started
+    rows = sum(totals.values())
+    print(f"✓ {rows:,} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    for table, count in totals.items():
+        print(f"  {table:<16} {count:>12,}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset into DATABASE_URL")
+    parser.add_argument("--leads", type=int, default=100000, help="Leads to add")
+    parser.add_argument("--seed", type=int, default=0, help="Same seed and arguments give the same rows")
+    parser.add_argument("--student-ratio", type=float, default=0.02, help="Share of leads that become students")
+    parser.add_argument("--messages-per-student", type=float, default=5)
+    parser.add_argument("--documents-per-student", type=float, default=2)
+    parser.add_argument("--payments-per-student", type=float, default=2)
+    parser.add_argument("--visa-ratio", type=float, default=0.6, help="Share of students with a visa application")
+    parser.add_argument("--document-kb", type=int, default=64, help="Size of each stored document")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Leads per chunk")
+    args = parser.parse_args()
+    if args.leads < 1 or args.chunk_size < 1:
+        parser.error("--leads and --chunk-size must be at least 1")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,143 @@ import './AdminDashboard.css'
 
 const API_BASE = '/api'
 
+const ADMIN_PAGE_SIZE = 50
+
+// Admin list endpoints return one page at a time and put the next page's cursor in the
+// X-Next-Cursor header. usePagedList holds the pages loaded so far: refresh() re-reads
+// only the first page (cheap enough to poll), loadMore() fetches the next page when the
+// user asks for it, and search is sent to the server as ?q=. Changing url or search
+// starts again from the first page.
+function usePagedList(url, token, { search = '', enabled = true, itemsOf = (data) => data, keyOf = (item) => item.id } = {}) {
+  const [items, setItems] = useState([])
+  const [hasMore, setHasMore] = useState(false)
+  const [loading, setLoading] = useState(enabled)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [error, setError] = useState('')
+  const latest = useRef({})
+  latest.current = { url, token, search, itemsOf, keyOf }
+  const cursor = useRef(null)
+  const pagesLoaded = useRef(0)
+  const generation = useRef(0)
+  const busyLoadingMore = useRef(false)
+
+  const fetchPage = async (after) => {
+    const { url: pageUrl, token: pageToken, search: pageSearch, itemsOf: pick } = latest.current
+    const params = new URLSearchParams({ limit: String(ADMIN_PAGE_SIZE) })
+    if (pageSearch.trim()) params.set('q', pageSearch.trim())
+    if (after) params.set('cursor', after)
+    const res = await fetch(`${pageUrl}?${params}`, {
+      headers: pageToken ? { Authorization: `Bearer ${pageToken}` } : {},
+    })
+    if (!res.ok) {
+      const data = await res.json().catch(() => ({}))
+      throw new Error(data.detail || 'Failed to load')
+    }
+    return { page: pick(await res.json()), next: res.headers.get('X-Next-Cursor') }
+  }
+
+  const reload = useCallback(async () => {
+    const gen = ++generation.current
+    setLoading(true)
+    setError('')
+    try {
+      const { page, next } = await fetchPage(null)
+      if (gen !== generation.current) return
+      pagesLoaded.current = 1
+      cursor.current = next
+      setItems(page)
+      setHasMore(Boolean(next))
+    } catch (err) {
+      if (gen === generation.current) setError(err.message)
+    } finally {
+      if (gen === generation.current) setLoading(false)
+    }
+  }, [])
+
+  // Only the first page is re-read; rows it returns replace their older copies and the
+  // cursor of any further pages already loaded stays valid (it is a keyset position).
+  const refresh = useCallback(async () => {
+    const gen = generation.current
+    try {
+      const { page, next } = await fetchPage(null)
+      if (gen !== generation.current) return
+      if (pagesLoaded.current <= 1) {
+        pagesLoaded.current = 1
+        cursor.current = next
+        setItems(page)
+        setHasMore(Boolean(next))
+        return
+      }
+      const { keyOf: key } = latest.current
+      const fresh = new Set(page.map(key))
+      setItems((prev) => [...page, ...prev.filter((item) => !fresh.has(key(item)))])
+    } catch (err) {
+      if (gen === generation.current) setError(err.message)
+    }
+  }, [])
+
+  const loadMore = useCallback(async () => {
+    if (!cursor.current || busyLoadingMore.current) return
+    const gen = generation.current
+    busyLoadingMore.current = true
+    setLoadingMore(true)
+    try {
+      const { page, next } = await fetchPage(cursor.current)
+      if (gen !== generation.current) return
+      pagesLoaded.current += 1
+      cursor.current = next
+      const { keyOf: key } = latest.current
+      setItems((prev) => {
+        const seen = new Set(prev.map(key))
+        return [...prev, ...page.filter((item) => !seen.has(key(item)))]
+      })
+      setHasMore(Boolean(next))
+    } catch (err) {
+      if (gen === generation.current) setError(err.message)
+    } finally {
+      busyLoadingMore.current = false
+      setLoadingMore(false)
+    }
+  }, [])
+
+  const shownUrl = useRef(null)
+  useEffect(() => {
+    if (!enabled) return
+    if (shownUrl.current !== url) {
+      // A different list (e.g. another student's documents): do not show the old rows meanwhile
+      shownUrl.current = url
+      setItems([])
+      setHasMore(false)
+      setLoading(true)
+    }
+    const timer = setTimeout(reload, search ? 300 : 0) // debounce typing
+    return () => clearTimeout(timer)
+  }, [url, token, search, enabled, reload])
+
+  return { items, setItems, hasMore, loading, loadingMore, error, setError, reload, refresh, loadMore }
+}
+
+// onScroll handler for side lists: fetch the next page when scrolled near the bottom.
+function loadMoreOnScroll(list) {
+  return (e) => {
+    const el = e.currentTarget
+    if (list.hasMore && el.scrollHeight - el.scrollTop - el.clientHeight < 80) {
+      list.loadMore()
+    }
+  }
+}
+
+function LoadMoreButton({ list }) {
+  if (!list.hasMore) return null
+  return (
+    <div className="pagination">
+      <button disabled={list.loadingMore} onClick={list.loadMore}>
+        {list.loadingMore ? 'Loading…' : 'Load more'}
+      </button>
+    </div>
+  )
+}
+
 // Shared utility function for updating lead status
 async function updateLeadStatus(leadId, newStatus, version, authHeaders, onSuccess) {
   // If version not provided, fetch the lead first to get its version
@@ -1378,30 +1515,12 @@ export function AdminProfilePage() {
 export function AdminApprovalsPage() {
   const { token, role } = useAuth()
   const { decrementCount } = useContext(PendingCountContext)
-  const [pendingUsers, setPendingUsers] = useState([])
-  const [loading, setLoading] = useState(false)
-  const [error, setError] = useState('')
+  const [search, setSearch] = useState('')
+  const pending = usePagedList(`${API_BASE}/admin/pending-users`, token, { search, enabled: role === 'admin' })
+  const { items: pendingUsers, loading, error, setError } = pending
 
   const authHeaders = token ? { Authorization: `Bearer ${token}` } : {}
 
-  const fetchPending = async () => {
-    setLoading(true)
-    setError('')
-    try {
-      const res = await fetch(`${API_BASE}/admin/pending-users`, { headers: { ...authHeaders } })
-      if (!res.ok) {
-        const data = await res.json().catch(() => ({}))
-        throw new Error(data.detail || 'Failed to load pending users')
-      }
-      const data = await res.json()
-      setPendingUsers(data)
-    } catch (err) {
-      setError(err.message)
-    } finally {
-      setLoading(false)
-    }
-  }
-
   const handleDecision = async (id, action) => {
     setError('')
     try {
@@ -1415,7 +1534,7 @@ export function AdminApprovalsPage() {
         const data = await res.json().catch(() => ({}))
         throw new Error(data.detail || 'Action failed')
       }
-      await fetchPending()
+      pending.setItems((prev) => prev.filter((u) => u.id !== id))
       decrementCount()
     } catch (err) {
       setError(err.message)
@@ -1424,11 +1543,10 @@ export function AdminApprovalsPage() {
 
   useEffect(() => {
     if (role === 'admin') {
-      fetchPending()
-      // lightweight polling so the list stays fresh without reloads
+      // lightweight polling of the first page so the list stays fresh without reloads
       const interval = setInterval(() => {
         if (document.visibilityState === 'visible') {
-          fetchPending()
+          pending.refresh()
         }
       }, 15000) // 15s cadence
       return () => clearInterval(interval)
@@ -1455,11 +1573,21 @@ export function AdminApprovalsPage() {
           <span className="panel-subtitle">Review pending signups and approve or reject.</span>
         </div>
 
+        <div className="admin-search-row">
+          <input
+            type="search"
+            className="admin-search-input"
+            placeholder="Search by name or email..."
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+          />
+        </div>
+
         {error && <div className="admin-alert admin-alert-error" style={{ marginBottom: '1rem' }}>{error}</div>}
         {loading && <div className="admin-loading">Loading pending users...</div>}
 
       {!loading && pendingUsers.length === 0 && (
-        <div className="admin-loading">No pending users right now.</div>
+        <div className="admin-loading">{search.trim() ? 'No pending users match your search.' : 'No pending users right now.'}</div>
       )}
 
       {!loading && pendingUsers.length > 0 && (
@@ -1501,6 +1629,7 @@ export function AdminApprovalsPage() {
               ))}
             </tbody>
           </table>
+          <LoadMoreButton list={pending} />
         </div>
       )}
       </div>
@@ -1510,30 +1639,12 @@ export function AdminApprovalsPage() {
 
 export function AdminUsersPage() {
   const { token, role } = useAuth()
-  const [users, setUsers] = useState([])
-  const [loading, setLoading] = useState(false)
-  const [error, setError] = useState('')
+  const [search, setSearch] = useState('')
+  const userList = usePagedList(`${API_BASE}/admin/users`, token, { search, enabled: role === 'admin' })
+  const { items: users, loading, error, setError } = userList
 
   const authHeaders = token ? { Authorization: `Bearer ${token}` } : {}
 
-  const fetchUsers = async () => {
-    setLoading(true)
-    setError('')
-    try {
-      const res = await fetch(`${API_BASE}/admin/users`, { headers: { ...authHeaders } })
-      if (!res.ok) {
-        const data = await res.json().catch(() => ({}))
-        throw new Error(data.detail || 'Failed to load users')
-      }
-      const data = await res.json()
-      setUsers(data)
-    } catch (err) {
-      setError(err.message)
-    } finally {
-      setLoading(false)
-    }
-  }
-
   const handleStatusChange = async (u) => {
     setError('')
     try {
@@ -1546,7 +1657,7 @@ export function AdminUsersPage() {
         const data = await res.json().catch(() => ({}))
         throw new Error(data.detail || 'Action failed')
       }
-      await fetchUsers()
+      userList.setItems((prev) => prev.map((x) => (x.id === u.id ? { ...x, is_active: !u.is_active } : x)))
     } catch (err) {
       setError(err.message)
     }
@@ -1561,17 +1672,12 @@ export function AdminUsersPage() {
         const data = await res.json().catch(() => ({}))
         throw new Error(data.detail || 'Delete failed')
       }
-      await fetchUsers()
+      userList.setItems((prev) => prev.filter((x) => x.id !== u.id))
     } catch (err) {
       setError(err.message)
     }
   }
 
-  useEffect(() => {
-    if (role === 'admin') fetchUsers()
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [role])
-
   if (role !== 'admin') return <Navigate to="/admin/dashboard" replace />
 
   return (
@@ -1593,9 +1699,18 @@ export function AdminUsersPage() {
           <h3>Users</h3>
           <span className="panel-subtitle">Manage approved staff accounts</span>
         </div>
+        <div className="admin-search-row">
+          <input
+            type="search"
+            className="admin-search-input"
+            placeholder="Search by name or email..."
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+          />
+        </div>
         {loading && <div className="admin-loading">Loading users...</div>}
         {!loading && users.length === 0 && (
-          <div className="admin-loading">No approved users.</div>
+          <div className="admin-loading">{search.trim() ? 'No users match your search.' : 'No approved users.'}</div>
         )}
         {!loading && users.length > 0 && (
           <div className="table-wrapper">
@@ -1642,6 +1757,7 @@ export function AdminUsersPage() {
                 ))}
               </tbody>
             </table>
+            <LoadMoreButton list={userList} />
           </div>
         )}
       </div>
@@ -1687,10 +1803,13 @@ function formatMessageTime(dateString) {
 // Admin Messages Page
 export function AdminMessagesPage() {
   const { token } = useAuth()
-  const [conversations, setConversations] = useState([])
+  const conversationList = usePagedList(`${API_BASE}/admin/messages/conversations`, token, {
+    itemsOf: (data) => data.conversations,
+    keyOf: (conv) => conv.student_id,
+  })
+  const { items: conversations, setItems: setConversations, loading } = conversationList
   const [selectedStudent, setSelectedStudent] = useState(null)
   const [messages, setMessages] = useState([])
-  const [loading, setLoading] = useState(true)
   const [messagesLoading, setMessagesLoading] = useState(false)
   const [newMessage, setNewMessage] = useState('')
   const [sending, setSending] = useState(false)
@@ -1699,10 +1818,10 @@ export function AdminMessagesPage() {
   const authHeaders = token ? { Authorization: `Bearer ${token}` } : {}
 
   useEffect(() => {
-    fetchConversations()
     const interval = setInterval(() => {
       if (document.visibilityState === 'visible') {
-        fetchConversations()
+        // Only the newest page is re-read; older conversations load on scroll
+        conversationList.refresh()
         if (selectedStudent) {
           fetchMessages(selectedStudent.student_id)
         }
@@ -1711,29 +1830,15 @@ export function AdminMessagesPage() {
     return () => clearInterval(interval)
   }, [token, selectedStudent])
 
-  const fetchConversations = async () => {
-    try {
-      const res = await fetch(`${API_BASE}/admin/messages/conversations`, {
-        headers: { ...authHeaders },
-      })
-      if (res.ok) {
-        const data = await res.json()
-        const updatedConversations = data.conversations || []
-        setConversations(updatedConversations)
-        // Update selected student if it exists
-        if (selectedStudent) {
-          const updated = updatedConversations.find(c => c.student_id === selectedStudent.student_id)
-          if (updated) {
-            setSelectedStudent(updated)
-          }
-        }
-      }
-    } catch (err) {
-      console.error(err)
-    } finally {
-      setLoading(false)
+  // Keep the selected conversation's counters in step with the refreshed list
+  useEffect(() => {
+    if (!selectedStudent) return
+    const updated = conversations.find(c => c.student_id === selectedStudent.student_id)
+    if (updated && updated !== selectedStudent) {
+      setSelectedStudent(updated)
     }
-  }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [conversations])
 
   const fetchMessages = async (studentId) => {
     if (!studentId) return
@@ -1811,7 +1916,7 @@ export function AdminMessagesPage() {
       }
       setNewMessage('')
       await fetchMessages(selectedStudent.student_id)
-      await fetchConversations()
+      await conversationList.refresh()
     } catch (err) {
       setError(err.message)
     } finally {
@@ -1877,7 +1982,7 @@ export function AdminMessagesPage() {
               Conversations
             </h3>
           </div>
-          <div style={{ flex: 1, overflowY: 'auto' }}>
+          <div style={{ flex: 1, overflowY: 'auto' }} onScroll={loadMoreOnScroll(conversationList)}>
             {loading ? (
               <div style={{ padding: '2rem', textAlign: 'center', color: '#6b7280' }}>Loading...</div>
             ) : conversations.length === 0 ? (
@@ -1956,6 +2061,9 @@ export function AdminMessagesPage() {
                 </div>
               ))
             )}
+            {conversationList.loadingMore && (
+              <div style={{ padding: '1rem', textAlign: 'center', color: '#6b7280' }}>Loading more...</div>
+            )}
           </div>
         </div>
 
@@ -2162,55 +2270,16 @@ export function AdminMessagesPage() {
 export function AdminDocumentsPage() {
   const { token } = useAuth()
   const authHeaders = token ? { Authorization: `Bearer ${token}` } : {}
-  const [students, setStudents] = useState([])
+  const [search, setSearch] = useState('')
   const [selectedStudent, setSelectedStudent] = useState(null)
-  const [documents, setDocuments] = useState([])
-  const [loading, setLoading] = useState(true)
-  const [documentsLoading, setDocumentsLoading] = useState(false)
-
-  useEffect(() => {
-    fetchStudents()
-  }, [token])
-
-  useEffect(() => {
-    if (selectedStudent) {
-      fetchDocuments(selectedStudent.id)
-    }
-  }, [selectedStudent, token])
-
-  const fetchStudents = async () => {
-    try {
-      const res = await fetch(`${API_BASE}/admin/students`, {
-        headers: { ...authHeaders },
-      })
-      if (res.ok) {
-        const data = await res.json()
-        setStudents(data)
-      }
-    } catch (err) {
-      console.error(err)
-    } finally {
-      setLoading(false)
-    }
-  }
-
-  const fetchDocuments = async (studentId) => {
-    if (!studentId) return
-    setDocumentsLoading(true)
-    try {
-      const res = await fetch(`${API_BASE}/admin/students/${studentId}/documents`, {
-        headers: { ...authHeaders },
-      })
-      if (res.ok) {
-        const data = await res.json()
-        setDocuments(data)
-      }
-    } catch (err) {
-      console.error(err)
-    } finally {
-      setDocumentsLoading(false)
-    }
-  }
+  const studentList = usePagedList(`${API_BASE}/admin/students`, token, { search })
+  const documentList = usePagedList(
+    selectedStudent ? `${API_BASE}/admin/students/${selectedStudent.id}/documents` : '',
+    token,
+    { enabled: Boolean(selectedStudent) },
+  )
+  const { items: students, loading } = studentList
+  const { items: documents, loading: documentsLoading } = documentList
 
   const handleDownload = async (studentId, docId) => {
     try {
@@ -2286,8 +2355,16 @@ export function AdminDocumentsPage() {
             }}>
               Students
             </h3>
+            <input
+              type="search"
+              className="admin-search-input"
+              placeholder="Search students..."
+              value={search}
+              onChange={(e) => setSearch(e.target.value)}
+              style={{ marginTop: '0.75rem', width: '100%' }}
+            />
           </div>
-          <div style={{ flex: 1, overflowY: 'auto' }}>
+          <div style={{ flex: 1, overflowY: 'auto' }} onScroll={loadMoreOnScroll(studentList)}>
             {loading ? (
               <div style={{ padding: '2rem', textAlign: 'center', color: '#6b7280' }}>Loading...</div>
             ) : students.length === 0 ? (
@@ -2337,6 +2414,9 @@ export function AdminDocumentsPage() {
                 </div>
               ))
             )}
+            {studentList.loadingMore && (
+              <div style={{ padding: '1rem', textAlign: 'center', color: '#6b7280' }}>Loading more...</div>
+            )}
           </div>
         </div>
 
@@ -2453,6 +2533,7 @@ export function AdminDocumentsPage() {
                           ))}
                         </tbody>
                       </table>
+                      <LoadMoreButton list={documentList} />
                     </div>
                     {documents.some(doc => doc.counselor_comment) && (
                       <div style={{ marginTop: '1.5rem', paddingTop: '1.5rem', borderTop: '1px solid rgba(99, 102, 241, 0.2)' }}>
@@ -0,0 +1,63 @@
+"""
+Bulk-import leads from a partner/campaign file (CSV, JSON array or NDJSON).
+
+Uses the same validation, dedup and chunked insert as POST /v1/leads/bulk.
+Prints progress after every chunk and, with --errors, the rows that were
+rejected.
+
+Usage:
+    python import_leads.py leads.csv
+    python import_leads.py leads.ndjson --errors
+    python import_leads.py export.txt --format json
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database import async_session_maker, init_db
+from app.services.lead_import import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, detect_format, import_leads, parse_rows
+
+
+async def run(path: str, fmt: str, chunk_size: int, show_errors: bool) -> int:
+    await init_db()
+    summary = {"processed": 0, "created": 0, "duplicates": 0, "invalid": 0}
+    rejected = []
+    with open(path, "rb") as f:
+        async with async_session_maker() as session:
+            try:
+                async for step in import_leads(session, parse_rows(f, fmt), chunk_size=chunk_size):
+                    rejected.extend(r for r in step.pop("results") if r["status"] == "invalid")
+                    summary = step
+                    print(
+                        f"  {summary['processed']} rows: {summary['created']} created, "
+                        f"{summary['duplicates']} duplicates, {summary['invalid']} invalid"
+                    )
+            except ValueError as e:
+                print(f"✗ {e}")
+                return 1
+
+    if show_errors:
+        for result in rejected:
+            print(f"  row {result['row']} ({result['email']}): {result['error']}")
+    print(f"✓ Imported {summary['created']} of {summary['processed']} leads")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import leads from CSV, JSON or NDJSON")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Override detection from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per insert batch")
+    parser.add_argument("--errors", action="store_true", help="List rejected rows and why")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(None, args.path)
+    if fmt is None:
+        print("✗ Cannot tell the file format from its extension; pass --format")
+        return 1
+    print(f"Importing {args.path} ({fmt})...")
+    return asyncio.run(run(args.path, fmt, args.chunk_size, args.errors))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,34 @@
 """
 Migration script to add file_content column to documents table
 and optionally migrate existing files from file system to database.
+
+Files are migrated as a pipeline so a large archive neither exhausts memory nor
+blocks the event loop:
+- documents still missing file_content are paged by id, --batch-size at a time
+- files are resolved, read and SHA-256 hashed on a thread pool (--workers reads
+  in flight); the next page is read while the current one is written
+- each page is written with one executemany UPDATE, verified against the
+  database (length and SHA-256 of the stored bytes) and committed; rows that fail
+  verification are committed with file_content NULL
+
+Restartable: only rows whose file_content is still empty are selected and every
+batch is committed, so re-running after an interruption (or after checksum
+mismatches) picks up the rest.
+
+Usage:
+    python migrate_documents_to_db.py
+    python migrate_documents_to_db.py --batch-size 50 --workers 16
+    python migrate_documents_to_db.py --no-verify
 """
+import argparse
 import asyncio
+import hashlib
 import os
 import sys
-from sqlalchemy import text
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.config import settings
 
@@ -20,17 +43,46 @@ elif raw_url.startswith("postgres://"):
 else:
     database_url = raw_url
 
-# Create engine
+# Create engine (no echo: statements carry file contents)
 connect_args = {}
 if database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False, "timeout": 10}
 
-engine = create_async_engine(database_url, echo=True, connect_args=connect_args)
+engine = create_async_engine(database_url, echo=False, connect_args=connect_args)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-async def migrate():
-    """Add file_content column and migrate existing files."""
+
+def resolve_path(file_path: str) -> str:
+    """Resolve a stored (possibly relative) path to a file on disk."""
+    if os.path.isabs(file_path):
+        return file_path
+    # Try to resolve relative to project root
+    resolved = os.path.join(PROJECT_ROOT, file_path)
+    if not os.path.exists(resolved):
+        # Try uploads directory
+        resolved = os.path.join(PROJECT_ROOT, "uploads", "documents", os.path.basename(resolved))
+    return resolved
+
+
+def read_file(file_path: str) -> tuple[str, Optional[bytes], Optional[str]]:
+    """
+    Thread-pool worker: read and hash one file.
+
+    Returns:
+        (resolved path, content or None if missing, SHA-256 hex digest)
+    """
+    resolved = resolve_path(file_path)
+    if not os.path.exists(resolved):
+        return resolved, None, None
+    with open(resolved, "rb") as f:
+        content = f.read()
+    return resolved, content, hashlib.sha256(content).hexdigest()
+
+
+async def add_column():
+    """Add the file_content column if the table predates it."""
     async with engine.begin() as conn:
         # Check if column already exists
         if database_url.startswith("sqlite"):
@@ -38,17 +90,15 @@ async def migrate():
             result = await conn.execute(text("""
                 SELECT COUNT(*) FROM pragma_table_info('documents') WHERE name='file_content'
             """))
-            row = result.fetchone()
-            column_exists = row[0] > 0 if row else False
         else:
             # PostgreSQL
             result = await conn.execute(text("""
-                SELECT COUNT(*) FROM information_schema.columns 
+                SELECT COUNT(*) FROM information_schema.columns
                 WHERE table_name='documents' AND column_name='file_content'
             """))
-            row = result.fetchone()
-            column_exists = row[0] > 0 if row else False
-        
+        row = result.fetchone()
+        column_exists = row[0] > 0 if row else False
+
         if not column_exists:
             print("Adding file_content column to documents table...")
             if database_url.startswith("sqlite"):
@@ -58,63 +108,141 @@ async def migrate():
             print("✓ Column added successfully")
         else:
             print("✓ file_content column already exists")
-    
+
+
+async def fetch_page(session: AsyncSession, after_id: int, limit: int) -> list:
+    """Next page of documents that have a file path but no stored content."""
+    result = await session.execute(text("""
+        SELECT id, file_path, file_name FROM documents
+        WHERE id > :after_id
+        AND file_path IS NOT NULL AND file_path != ''
+        AND (file_content IS NULL OR length(file_content) = 0)
+        ORDER BY id
+        LIMIT :limit
+    """), {"after_id": after_id, "limit": limit})
+    return result.fetchall()
+
+
+async def verify_batch(session: AsyncSession, expected: dict[int, tuple[int, str]], pool) -> list[int]:
+    """
+    Compare stored length and SHA-256 with what was read from disk.
+
+    Returns:
+        Document ids whose stored content does not match
+    """
+    ids = list(expected)
+    if database_url.startswith("postgresql"):
+        # Hash in the database instead of transferring the files back
+        result = await session.execute(
+            text("SELECT id, length(file_content), encode(sha256(file_content), 'hex') "
+                 "FROM documents WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )
+        stored = {doc_id: (size, digest) for doc_id, size, digest in result}
+    else:
+        result = await session.execute(
+            text("SELECT id, file_content FROM documents WHERE id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": ids},
+        )
+        rows = result.fetchall()
+        loop = asyncio.get_running_loop()
+        digests = await asyncio.gather(*(
+            loop.run_in_executor(pool, lambda content=content: hashlib.sha256(content or b"").hexdigest())
+            for _, content in rows
+        ))
+        stored = {row[0]: (len(row[1] or b""), digest) for row, digest in zip(rows, digests)}
+    return [doc_id for doc_id, checksum in expected.items() if stored.get(doc_id) != checksum]
+
+
+async def migrate_files(batch_size: int, workers: int, verify: bool):
+    """Copy files into documents.file_content in verified, committed batches."""
+    loop = asyncio.get_running_loop()
+    update = text("UPDATE documents SET file_content = :content WHERE id = :doc_id")
+    clear = text("UPDATE documents SET file_content = NULL WHERE id IN :ids").bindparams(
+        bindparam("ids", expanding=True)
+    )
+    migrated = failed = mismatched = 0
+    total_bytes = 0
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        async with async_session_maker() as session:
+            def start_reads(page):
+                return [loop.run_in_executor(pool, read_file, file_path) for _, file_path, _ in page]
+
+            page = await fetch_page(session, 0, batch_size)
+            if not page:
+                print("✓ No documents to migrate")
+                return
+            print(f"\nMigrating documents in batches of {batch_size} ({workers} concurrent reads)...")
+            reads = start_reads(page)
+
+            while page:
+                results = await asyncio.gather(*reads)
+                # Start reading the next page while this one is written
+                next_page = await fetch_page(session, page[-1][0], batch_size)
+                next_reads = start_reads(next_page)
+
+                params, expected = [], {}
+                for (doc_id, _, file_name), (resolved, content, digest) in zip(page, results):
+                    if content is None:
+                        print(f"  ✗ File not found: {resolved}")
+                        failed += 1
+                        continue
+                    params.append({"content": content, "doc_id": doc_id})
+                    expected[doc_id] = (len(content), digest)
+
+                if params:
+                    try:
+                        await session.execute(update, params)
+                        # Verify before committing; mismatched rows are committed without
+                        # content so a re-run picks them up again
+                        bad = await verify_batch(session, expected, pool) if verify else []
+                        if bad:
+                            await session.execute(clear, {"ids": bad})
+                        await session.commit()
+                    except Exception as e:
+                        await session.rollback()
+                        print(f"  ✗ Error writing documents {params[0]['doc_id']}-{params[-1]['doc_id']}: {e}")
+                        failed += len(params)
+                    else:
+                        for doc_id in bad:
+                            print(f"  ✗ Checksum mismatch for document {doc_id}")
+                        mismatched += len(bad)
+                        migrated += len(params) - len(bad)
+                        total_bytes += sum(size for doc_id, (size, _) in expected.items() if doc_id not in bad)
+
+                elapsed = max(time.monotonic() - started, 1e-9)
+                print(
+                    f"  … {migrated} migrated, {failed} failed "
+                    f"({total_bytes / 1_048_576:.1f} MB, {total_bytes / 1_048_576 / elapsed:.1f} MB/s)"
+                )
+                page, reads = next_page, next_reads
+
+    print(f"\n✓ Migration complete: {migrated} migrated, {failed} failed, {mismatched} checksum mismatches")
+    if failed or mismatched:
+        print("  Re-run the script to retry documents that are still missing content.")
+
+
+async def migrate(batch_size: int = 25, workers: int = 8, verify: bool = True):
+    """Add file_content column and migrate existing files."""
+    await add_column()
     # Migrate existing files from file system to database
-    async with async_session_maker() as session:
-        # Get all documents with file_path but no file_content
-        result = await session.execute(text("""
-            SELECT id, file_path, file_name FROM documents 
-            WHERE file_path IS NOT NULL AND file_path != '' 
-            AND (file_content IS NULL OR file_content = '')
-        """))
-        documents = result.fetchall()
-        
-        if not documents:
-            print("✓ No documents to migrate")
-            return
-        
-        print(f"\nFound {len(documents)} documents to migrate...")
-        migrated = 0
-        failed = 0
-        
-        for doc_id, file_path, file_name in documents:
-            try:
-                # Convert to absolute path if relative
-                if not os.path.isabs(file_path):
-                    # Try to resolve relative to project root
-                    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                    file_path = os.path.join(project_root, file_path)
-                    if not os.path.exists(file_path):
-                        # Try uploads directory
-                        uploads_dir = os.path.join(project_root, "uploads", "documents")
-                        file_path = os.path.join(uploads_dir, os.path.basename(file_path))
-                
-                if os.path.exists(file_path):
-                    with open(file_path, "rb") as f:
-                        file_content = f.read()
-                    
-                    # Update document with file content
-                    await session.execute(text("""
-                        UPDATE documents 
-                        SET file_content = :content 
-                        WHERE id = :doc_id
-                    """), {"content": file_content, "doc_id": doc_id})
-                    await session.commit()
-                    migrated += 1
-                    print(f"  ✓ Migrated: {file_name} ({len(file_content)} bytes)")
-                else:
-                    print(f"  ✗ File not found: {file_path}")
-                    failed += 1
-            except Exception as e:
-                print(f"  ✗ Error migrating {file_name}: {e}")
-                failed += 1
-                await session.rollback()
-        
-        print(f"\n✓ Migration complete: {migrated} migrated, {failed} failed")
+    await migrate_files(batch_size, workers, verify)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move document files into documents.file_content")
+    parser.add_argument("--batch-size", type=int, default=25, help="Documents per UPDATE batch")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent file reads")
+    parser.add_argument("--no-verify", action="store_true", help="Skip the checksum check after each batch")
+    args = parser.parse_args()
+    if args.batch_size < 1 or args.workers < 1:
+        print("--batch-size and --workers must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
     print("Starting document migration...")
-    asyncio.run(migrate())
+    asyncio.run(migrate(args.batch_size, args.workers, not args.no_verify))
     print("\nDone!")
-
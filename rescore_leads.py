@@ -0,0 +1,29 @@
+"""
+Recompute Lead.score for every lead.
+
+Scores are written when leads are inserted, but two inputs drift over time:
+how close the intake is, and each source's conversion history. Run this
+periodically (e.g. a nightly cron job) to keep ?sort=score meaningful.
+
+Usage:
+    python rescore_leads.py
+    python rescore_leads.py --unscored   # only leads with no score yet
+"""
+import asyncio
+import sys
+
+from app.database import async_session_maker
+from app.services.lead_scoring import recompute_scores
+
+
+async def main():
+    only_unscored = "--unscored" in sys.argv
+    async with async_session_maker() as session:
+        scored = await recompute_scores(session, only_unscored=only_unscored)
+    print(f"✓ Scored {scored} leads")
+
+
+if __name__ == "__main__":
+    print("Recomputing lead scores...")
+    asyncio.run(main())
+    print("\nDone!")
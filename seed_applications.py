@@ -1,8 +1,12 @@
-"""Seed fake application data for testing."""
+"""Seed fake application data for testing.
+
+For large synthetic datasets (leads, students, applications, visas, payments,
+messages, timeline events) use `python -m benchmarks.synthetic` instead.
+"""
 import asyncio
 import random
 from datetime import datetime, timedelta
-from sqlmodel import select
+from sqlmodel import func, select
 
 from app.database import init_db, async_session_maker
 from app.models.student import Application, Student
@@ -31,27 +35,21 @@ async def seed_applications():
     await init_db()
     
     async with async_session_maker() as session:
-        # Get all students
-        result = await session.execute(select(Student))
+        # Students without applications, in one query (no per-student lookup)
+        has_applications = select(Application.id).where(Application.student_id == Student.id).exists()
+        result = await session.execute(select(Student).where(~has_applications).order_by(Student.id))
         students = result.scalars().all()
+        total = (await session.execute(select(func.count()).select_from(Student))).scalar() or 0
         
-        if not students:
+        if not total:
             print("No students found. Please create a student first.")
             return
+        if total > len(students):
+            print(f"Skipping {total - len(students)} students that already have applications.")
         
-        print(f"Found {len(students)} students. Seeding applications...")
+        print(f"Found {len(students)} students without applications. Seeding applications...")
         
         for student in students:
-            # Check if student already has applications
-            app_result = await session.execute(
-                select(Application).where(Application.student_id == student.id)
-            )
-            existing_apps = app_result.scalars().all()
-            
-            if existing_apps:
-                print(f"Student {student.email} already has {len(existing_apps)} applications. Skipping.")
-                continue
-            
             # Create 3-6 random applications per student
             num_apps = random.randint(3, 6)
             selected_universities = random.sample(UNIVERSITIES, min(num_apps, len(UNIVERSITIES)))